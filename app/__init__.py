@@ -4,6 +4,11 @@ from flask_login import LoginManager
 from flask_mail import Mail
 from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect
+from werkzeug.middleware.proxy_fix import ProxyFix
+from app.cache import SharedCache, LocalTTLCache
+from app.ratelimit import RateLimiter
+from app.security import RequestScreen
+from app.instrumentation import SQLInstrumentation
 
 from config import config
 import os
@@ -14,12 +19,22 @@ login_manager = LoginManager()
 mail = Mail()
 migrate = Migrate()
 csrf = CSRFProtect()
+cache = SharedCache()
+limiter = RateLimiter(cache)
+screen = RequestScreen()
+user_cache = LocalTTLCache('user', shared=cache, size_key='USER_CACHE_SIZE', ttl_key='USER_CACHE_TTL')
+sql_instrumentation = SQLInstrumentation()
 
 
 def create_app(config_name='default'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
 
+    # Ters vekil arkasında istemci IP'si X-Forwarded-For'dan okunur (IP kotaları için)
+    if app.config.get('PROXY_FIX_X_FOR', 0) > 0:
+        hops = app.config['PROXY_FIX_X_FOR']
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
     # Security configurations
     app.config['SESSION_COOKIE_SECURE'] = True if not app.debug else False
     app.config['SESSION_COOKIE_HTTPONLY'] = True
@@ -39,35 +54,19 @@ def create_app(config_name='default'):
         response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
         return response
     
-    # Security middleware
-    @app.before_request
-    def security_checks():
-        # Check for suspicious patterns in request
-        if request.method == 'POST':
-            # Check for potential SQL injection patterns
-            suspicious_patterns = [
-                'union', 'select', 'insert', 'update', 'delete', 'drop', 'create',
-                'script', 'javascript', 'onload', 'onerror', 'onclick'
-            ]
-            
-            for pattern in suspicious_patterns:
-                if pattern in request.form.get('csrf_token', '').lower():
-                    abort(403)
-            
-            # Check for potential XSS patterns
-            xss_patterns = ['<script', 'javascript:', 'vbscript:', 'onload=']
-            for key, value in request.form.items():
-                if isinstance(value, str):
-                    for pattern in xss_patterns:
-                        if pattern in value.lower():
-                            abort(403)
-
     # Extensions initialization
     db.init_app(app)
     login_manager.init_app(app)
     mail.init_app(app)
     migrate.init_app(app, db)
     csrf.init_app(app)
+    cache.init_app(app)
+    user_cache.init_app(app)
+    limiter.init_app(app)
+    sql_instrumentation.init_app(app)
+
+    # Security middleware (şüpheli form içeriği taraması)
+    screen.init_app(app)
 
 
     # Login manager configuration
@@ -104,6 +103,14 @@ def create_app(config_name='default'):
     # Error handlers
     register_error_handlers(app)
 
+    # Email outbox göndericisi
+    from app.mailer import OutboxSender
+    OutboxSender(app)
+
+    # CLI komutları
+    from app.commands import register_commands
+    register_commands(app)
+
     # Ana sayfa route'u
     @app.route('/')
     def index():
@@ -116,14 +123,8 @@ def create_app(config_name='default'):
         else:
             return render_template('index.html')
 
-    # Create database tables and default admin user
-    with app.app_context():
-        try:
-            db.create_all()
-            create_default_admin()
-        except Exception as e:
-            print(f"❌ Database initialization error: {e}")
-            # Continue without failing the app startup
+    # Şema, varsayılan admin ve arama indeksi açılışta değil, bir kez
+    # `flask init-db` ile hazırlanır (her worker'ın açılışı DDL beklemesin)
 
     return app
 
@@ -138,6 +139,10 @@ def register_error_handlers(app):
     def forbidden_error(error):
         return render_template('errors/403.html'), 403
 
+    @app.errorhandler(429)
+    def too_many_requests_error(error):
+        return render_template('errors/429.html'), 429
+
     @app.errorhandler(500)
     def internal_error(error):
         db.session.rollback()
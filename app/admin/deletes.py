@@ -0,0 +1,260 @@
+import time
+
+from flask import current_app
+
+from app import db
+from app.models.user import User
+from app.models.student_profile import StudentProfile
+from app.models.payment import Payment
+from app.models.course import (
+    Course, CourseSchedule, CourseEnrollment, CoursePayment,
+    CourseAnnouncement, AnnouncementReaction, AnnouncementReactionCount
+)
+from app.search import remove_documents, search_backend
+
+# Toplu DELETE'ler oturumdaki nesneleri senkronize etmez; çağıran commit
+# sonrası nesneleri zaten yeniden yükler
+_NO_SYNC = {'synchronize_session': False}
+
+
+def _delete_in_chunks(model, condition):
+    """``condition``'a uyan satırları ``DELETE_CHUNK_SIZE``'lık parçalar halinde sil
+
+    Her parça ``DELETE ... WHERE id IN (SELECT id ... LIMIT n)`` ile silinir.
+    Dolu bir parçadan sonra commit edilir ki büyük silmeler kilitleri uzun
+    süre tutmasın. Tablolar alttan üste doğru silindiği için her ara commit
+    referans bütünlüğünü korur; yarıda kalan silme tekrar çalıştırılarak
+    tamamlanabilir. Silinen satır sayısını döndürür.
+    """
+    chunk_size = current_app.config['DELETE_CHUNK_SIZE']
+    total = 0
+    while True:
+        chunk = db.select(model.id).where(condition).limit(chunk_size).scalar_subquery()
+        deleted = db.session.execute(
+            db.delete(model).where(model.id.in_(chunk)), execution_options=_NO_SYNC
+        ).rowcount
+        total += deleted
+        if deleted < chunk_size:
+            return total
+        db.session.commit()
+
+
+def delete_courses(course_ids):
+    """Kursları ders saatleri, kayıtlar, ödemeler, duyurular ve tepkilerle birlikte sil
+
+    ``course_ids`` id listesi veya id döndüren bir select olabilir. Silinen
+    satır sayılarını tablo adına göre döndürür. Commit çağıranın
+    sorumluluğundadır (parçalı silmelerde ara commit'ler yapılır).
+    """
+    enrollments = db.select(CourseEnrollment.id).where(CourseEnrollment.course_id.in_(course_ids))
+    announcements = db.select(CourseAnnouncement.id).where(CourseAnnouncement.course_id.in_(course_ids))
+
+    counts = {}
+    # Kayıtlar da silindiği için bakiye yeniden hesaplanmaz
+    counts['course_payments'] = _delete_in_chunks(CoursePayment, CoursePayment.enrollment_id.in_(enrollments))
+    counts['course_enrollments'] = _delete_in_chunks(CourseEnrollment, CourseEnrollment.course_id.in_(course_ids))
+    counts.update(delete_announcements(announcements))
+    counts['course_schedules'] = _delete_in_chunks(CourseSchedule, CourseSchedule.course_id.in_(course_ids))
+    counts['courses'] = _delete_in_chunks(Course, Course.id.in_(course_ids))
+    return counts
+
+
+def delete_announcements(announcement_ids):
+    """Duyuruları tepkileri ve emoji sayaçlarıyla birlikte sil
+
+    ``announcement_ids`` id listesi veya id döndüren bir select olabilir.
+    """
+    counts = {}
+    counts['announcement_reactions'] = _delete_in_chunks(
+        AnnouncementReaction, AnnouncementReaction.announcement_id.in_(announcement_ids)
+    )
+    db.session.execute(
+        db.delete(AnnouncementReactionCount).where(AnnouncementReactionCount.announcement_id.in_(announcement_ids)),
+        execution_options=_NO_SYNC
+    )
+    counts['course_announcements'] = _delete_in_chunks(
+        CourseAnnouncement, CourseAnnouncement.id.in_(announcement_ids)
+    )
+    return counts
+
+
+def delete_students(student_ids):
+    """Öğrencileri kayıtları, kurs ödemeleri, tepkileri ve profilleriyle birlikte sil
+
+    Öğrenciye bağlanmış genel ödemeler silinmez, bağlantıları kaldırılır.
+    Tepki verilen duyuruların emoji sayaçları yeniden hesaplanır ve arama
+    indeksi temizlenir. ``student_ids`` içindeki öğrenci olmayan kullanıcılar
+    yok sayılır.
+    """
+    students = db.select(User.id).where(User.id.in_(student_ids), User.role == 'student')
+    enrollments = db.select(CourseEnrollment.id).where(CourseEnrollment.student_id.in_(students))
+
+    counts = {}
+    counts['course_payments'] = _delete_in_chunks(CoursePayment, CoursePayment.enrollment_id.in_(enrollments))
+    counts['course_enrollments'] = _delete_in_chunks(CourseEnrollment, CourseEnrollment.student_id.in_(students))
+
+    # Öğrenci başına duyuru başına tek tepki olduğundan tepkiler tek seferde
+    # silinir; sayaçlar aynı transaction içinde yeniden hesaplanır
+    reacted = db.session.scalars(
+        db.select(AnnouncementReaction.announcement_id).where(
+            AnnouncementReaction.student_id.in_(students)
+        ).distinct()
+    ).all()
+    counts['announcement_reactions'] = db.session.execute(
+        db.delete(AnnouncementReaction).where(AnnouncementReaction.student_id.in_(students)),
+        execution_options=_NO_SYNC
+    ).rowcount
+    if reacted:
+        CourseAnnouncement.rebuild_reaction_counts(reacted)
+
+    db.session.execute(
+        db.update(Payment).where(Payment.student_id.in_(students)).values(student_id=None),
+        execution_options=_NO_SYNC
+    )
+    remove_documents(students)
+    counts['student_profiles'] = db.session.execute(
+        db.delete(StudentProfile).where(StudentProfile.user_id.in_(students)),
+        execution_options=_NO_SYNC
+    ).rowcount
+    counts['users'] = db.session.execute(
+        db.delete(User).where(User.id.in_(students)), execution_options=_NO_SYNC
+    ).rowcount
+    return counts
+
+
+def _payment_id_chunks(payment_ids, criteria, chunk_size):
+    """Silinecek ödeme id'lerini ``chunk_size``'lık sıralı parçalar halinde üret
+
+    Id listesi verilirse liste Python'da bölünür (her sorguya yalnızca bir
+    parça gönderilir); verilmezse ``criteria``'ya uyan ödemeler id üzerinden
+    keyset ile taranır.
+    """
+    if payment_ids is not None:
+        payment_ids = sorted({int(payment_id) for payment_id in payment_ids})
+        for start in range(0, len(payment_ids), chunk_size):
+            ids = db.session.scalars(
+                db.select(Payment.id).where(
+                    Payment.id.in_(payment_ids[start:start + chunk_size]), *criteria
+                ).order_by(Payment.id)
+            ).all()
+            if ids:
+                yield ids
+        return
+
+    last_id = 0
+    while True:
+        ids = db.session.scalars(
+            db.select(Payment.id).where(Payment.id > last_id, *criteria).order_by(Payment.id).limit(chunk_size)
+        ).all()
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def delete_payments(payment_ids=None, criteria=()):
+    """Ödemeleri ve bunlara bağlı kurs ödemelerini parça parça sil
+
+    Silinecekler ``payment_ids`` listesi ve/veya ``criteria`` koşullarıyla
+    (ör. ``Payment.import_batch == ...``) seçilir. Her parça için iki toplu
+    DELETE çalışır (önce kurs ödemeleri, sonra ödemeler) ve parça commit
+    edilir. Kurs ödemesi silinen kayıtların bakiyeleri aynı parçada yeniden
+    hesaplanır. Parça başına ilerleme bilgilerinin listesini döndürür.
+    """
+    if payment_ids is None and not criteria:
+        raise ValueError('Silinecek ödemeler için id listesi veya filtre gerekli')
+
+    chunk_size = current_app.config['DELETE_CHUNK_SIZE']
+    returning = db.session.get_bind().dialect.delete_returning
+    progress = []
+
+    for ids in _payment_id_chunks(payment_ids, criteria, chunk_size):
+        started_at = time.perf_counter()
+
+        course_payments = db.delete(CoursePayment).where(CoursePayment.payment_id.in_(ids))
+        if returning:
+            enrollment_ids = db.session.scalars(
+                course_payments.returning(CoursePayment.enrollment_id), execution_options=_NO_SYNC
+            ).all()
+        else:
+            enrollment_ids = db.session.scalars(
+                db.select(CoursePayment.enrollment_id).where(CoursePayment.payment_id.in_(ids))
+            ).all()
+            db.session.execute(course_payments, execution_options=_NO_SYNC)
+
+        deleted = db.session.execute(
+            db.delete(Payment).where(Payment.id.in_(ids)), execution_options=_NO_SYNC
+        ).rowcount
+        # Toplu DELETE CoursePayment olaylarını çalıştırmaz; bakiyeler burada güncellenir
+        if enrollment_ids:
+            CourseEnrollment.rebuild_balances(set(enrollment_ids))
+        db.session.commit()
+
+        progress.append({
+            'chunk': len(progress) + 1,
+            'payments': deleted,
+            'course_payments': len(enrollment_ids),
+            'elapsed_ms': round((time.perf_counter() - started_at) * 1000, 1)
+        })
+    return progress
+
+
+def find_orphans():
+    """Referans bütünlüğünü kontrol et, sorunlu satır sayılarını döndür
+
+    Her yabancı anahtar için üst kaydı olmayan satırlar, arama indeksinde
+    öğrencisi olmayan satırlar ve tepkilerle uyuşmayan emoji sayaçları sayılır.
+    Sonuç ``[(açıklama, satır sayısı), ...]`` şeklindedir ve yalnızca
+    sorunlu kontrolleri içerir. (SQLite yabancı anahtarları varsayılan olarak
+    zorlamadığı için toplu silmelerden sonra bu kontrol önemlidir.)
+    """
+    from app.search import student_search
+
+    problems = []
+    for table in db.metadata.sorted_tables:
+        for fk in table.foreign_keys:
+            parent = fk.column
+            orphans = db.session.scalar(
+                db.select(db.func.count()).select_from(table).where(
+                    fk.parent.isnot(None),
+                    ~db.exists().where(parent == fk.parent)
+                )
+            )
+            if orphans:
+                problems.append((f'{table.name}.{fk.parent.name} -> {parent.table.name}.{parent.name}', orphans))
+
+    if search_backend() is not None:
+        orphans = db.session.scalar(
+            db.select(db.func.count()).select_from(student_search).where(
+                ~db.exists().where(User.id == student_search.c.user_id)
+            )
+        )
+        if orphans:
+            problems.append(('student_search.user_id -> users.id', orphans))
+
+    actual = db.select(
+        AnnouncementReaction.announcement_id,
+        AnnouncementReaction.emoji,
+        db.func.count(AnnouncementReaction.id).label('count')
+    ).group_by(AnnouncementReaction.announcement_id, AnnouncementReaction.emoji).subquery()
+    counters = AnnouncementReactionCount.__table__
+    # İki yönlü karşılaştırma: eksik/fazla sayaçlar ve yanlış değerler
+    mismatched = db.session.scalar(
+        db.select(db.func.count()).select_from(
+            actual.outerjoin(counters, db.and_(
+                counters.c.announcement_id == actual.c.announcement_id,
+                counters.c.emoji == actual.c.emoji
+            ))
+        ).where(db.or_(counters.c.count.is_(None), counters.c.count != actual.c.count))
+    ) + db.session.scalar(
+        db.select(db.func.count()).select_from(counters).where(
+            counters.c.count > 0,
+            ~db.exists().where(
+                AnnouncementReaction.announcement_id == counters.c.announcement_id,
+                AnnouncementReaction.emoji == counters.c.emoji
+            )
+        )
+    )
+    if mismatched:
+        problems.append(('announcement_reaction_counts <> announcement_reactions', mismatched))
+    return problems
@@ -0,0 +1,108 @@
+import csv
+import io
+import tempfile
+
+from flask import current_app
+
+from app import db
+from app.models.user import User
+from app.models.student_profile import StudentProfile
+from app.models.course import Course, CourseEnrollment
+
+ROSTER_HEADER = ['İsim', 'Soyisim', 'Telefon', 'Adres', 'Email']
+
+# Yanıt gövdesine yazılmadan önce biriktirilecek yaklaşık bayt miktarı
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def roster_rows(course_ids=None, with_course=False):
+    """Öğrenci listesi satırlarını tek bir join'li sorgudan parça parça üret
+
+    ``course_ids`` verilirse bu kurslara aktif kayıtlı öğrenciler döner
+    (``with_course`` ile kurs adı da eklenir); ``None`` ise kayıt durumundan
+    bağımsız tüm öğrenciler döner. Satırlar ``EXPORT_BATCH_SIZE`` büyüklüğünde gruplar halinde
+    okunduğu için tüm liste belleğe alınmaz.
+    """
+    columns = [
+        StudentProfile.first_name, StudentProfile.last_name,
+        StudentProfile.phone, StudentProfile.address, User.email
+    ]
+
+    if course_ids is None:
+        query = db.session.query(*columns).select_from(User).outerjoin(
+            StudentProfile, StudentProfile.user_id == User.id
+        ).filter(User.role == 'student').order_by(User.id)
+    else:
+        if with_course:
+            columns.append(Course.name)
+        query = db.session.query(*columns).select_from(CourseEnrollment).join(
+            User, User.id == CourseEnrollment.student_id
+        ).join(
+            Course, Course.id == CourseEnrollment.course_id
+        ).outerjoin(
+            StudentProfile, StudentProfile.user_id == User.id
+        ).filter(
+            CourseEnrollment.course_id.in_(course_ids),
+            CourseEnrollment.is_active == True
+        ).order_by(Course.name, CourseEnrollment.course_id, CourseEnrollment.id)
+
+    for row in query.execution_options(yield_per=current_app.config['EXPORT_BATCH_SIZE']):
+        yield [value or '' for value in row]
+
+
+def roster_header(with_course=False):
+    """``roster_rows`` ile aynı kolon sırasında başlık satırı"""
+    return ROSTER_HEADER + ['Kurs'] if with_course else ROSTER_HEADER
+
+
+def stream_csv(header, rows):
+    """Satırları CSV olarak parça parça üret
+
+    Excel'in Türkçe karakterleri doğru açması için UTF-8 BOM ile başlar.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(header)
+
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= _STREAM_CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def write_xlsx(header, rows, sheet_name):
+    """Satırları openpyxl write-only modunda geçici bir dosyaya yaz
+
+    Write-only çalışma kitabı satırları bellekte tutmaz; dönen dosya
+    ``stream_file`` ile parça parça gönderilebilir.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_name[:31])
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def stream_file(output):
+    """Dosyayı parça parça okuyup gönder, bitince kapat"""
+    try:
+        while True:
+            chunk = output.read(_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        output.close()
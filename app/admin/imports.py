@@ -0,0 +1,89 @@
+from app import db
+from app.models.user import User
+from app.models.student_profile import StudentProfile, normalize_phone
+
+# Başlık satırında aranan kolon adları (küçük harfe çevrilmiş)
+EMAIL_COLUMNS = ('email', 'e-mail', 'eposta', 'e-posta')
+PHONE_COLUMNS = ('telefon', 'tel', 'phone', 'gsm')
+
+
+def read_roster(file):
+    """Yüklenen CSV/xlsx dosyasından satır başına bir email veya telefon oku
+
+    Başlık satırında email/telefon kolonu varsa bunlar kullanılır (email
+    öncelikli; dışa aktarılan öğrenci listeleri de bu şekilde tekrar
+    yüklenebilir). Başlık yoksa ilk kolon okunur. Boş satırlar atlanır.
+    """
+    import pandas as pd
+
+    if file.filename.lower().endswith('.csv'):
+        df = pd.read_csv(file, header=None, dtype=str, keep_default_na=False,
+                         sep=None, engine='python', encoding='utf-8-sig')
+    else:
+        df = pd.read_excel(file, header=None, dtype=str, keep_default_na=False)
+
+    rows = df.values.tolist()
+    if not rows:
+        return []
+
+    header = [str(value).strip().lower() for value in rows[0]]
+    email_index = next((i for i, name in enumerate(header) if name in EMAIL_COLUMNS), None)
+    phone_index = next((i for i, name in enumerate(header) if name in PHONE_COLUMNS), None)
+    if email_index is None and phone_index is None:
+        email_index = 0
+    else:
+        rows = rows[1:]
+
+    values = []
+    for row in rows:
+        value = ''
+        if email_index is not None:
+            value = str(row[email_index]).strip()
+        if not value and phone_index is not None:
+            value = str(row[phone_index]).strip()
+        if value:
+            values.append(value)
+    return values
+
+
+def match_roster(values):
+    """Email/telefon değerlerini öğrencilerle tek sorguda eşleştir
+
+    ``(eşleşme, bilinmeyenler)`` döndürür: eşleşme her değerin öğrenci id'si,
+    bilinmeyenler hiçbir öğrenciyle (veya birden fazla öğrenciyle aynı
+    telefonla) eşleşmeyen değerlerdir.
+    """
+    emails = {value.lower() for value in values if '@' in value}
+    phones = {normalize_phone(value) for value in values if '@' not in value} - {None}
+
+    conditions = []
+    if emails:
+        conditions.append(User.email.in_(emails))
+    if phones:
+        conditions.append(StudentProfile.phone_digits.in_(phones))
+    if not conditions:
+        return {}, list(values)
+
+    rows = db.session.query(User.id, User.email, StudentProfile.phone_digits).outerjoin(
+        StudentProfile, StudentProfile.user_id == User.id
+    ).filter(User.role == 'student', db.or_(*conditions)).all()
+
+    by_email = {}
+    by_phone = {}
+    for user_id, email, phone_digits in rows:
+        by_email[email.lower()] = user_id
+        if phone_digits in phones:
+            by_phone.setdefault(phone_digits, set()).add(user_id)
+
+    matched, unknown = {}, []
+    for value in values:
+        if '@' in value:
+            user_id = by_email.get(value.lower())
+        else:
+            candidates = by_phone.get(normalize_phone(value), ())
+            user_id = next(iter(candidates)) if len(candidates) == 1 else None
+        if user_id is None:
+            unknown.append(value)
+        else:
+            matched[value] = user_id
+    return matched, unknown
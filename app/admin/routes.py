@@ -1,4 +1,4 @@
-from flask import render_template, redirect, url_for, flash, request, abort, jsonify, send_file
+from flask import render_template, redirect, url_for, flash, request, abort, jsonify, current_app, Response, stream_with_context
 from flask_login import login_required, current_user
 from app.admin import admin
 from app.models.user import User
@@ -7,41 +7,47 @@ from app.models.admin_profile import AdminProfile
 from app.models.course import Course, CourseSchedule, CourseEnrollment, CoursePayment, CourseAnnouncement, AnnouncementReaction
 from app.models.payment import Payment
 from app.admin.forms import CourseForm, AdminPasswordChangeForm, AdminProfileForm
-from app import db
+from app.admin.stats import get_dashboard_stats
+from app.admin.exports import roster_header, roster_rows, stream_csv, write_xlsx, stream_file
+from app.admin.imports import read_roster, match_roster
+from app.admin.deletes import delete_courses, delete_announcements, delete_students, delete_payments
+from app.pagination import keyset_paginate, nullable
+from app.search import match_subquery, plain_filter, search_backend
+from app.ratelimit import limit_request
+from app.conditional import conditional_get, watermark
+from app import db, screen
 from functools import wraps
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime, timedelta
-import pandas as pd
+from decimal import Decimal
 import os
 from werkzeug.utils import secure_filename
 from flask_wtf.csrf import validate_csrf
-from werkzeug.security import generate_password_hash
 import re
 from markupsafe import escape
-from flask import session
 import time
-from bs4 import BeautifulSoup
+import uuid
+
+def admin_required(f=None, rate_scope='admin'):
+    """Admin yetkisi ve istek sınırı
+
+    Sınır ``rate_scope`` kotasından düşülür; kotanın büyüklüğü
+    ``<RATE_SCOPE>_RATE_LIMIT`` ayarıdır. Her tuş vuruşunda çağrılan arama
+    (typeahead) endpoint'leri ``@admin_required(rate_scope='admin_search')``
+    ile ayrı ve daha geniş bir kota kullanır; admin işlemlerinin kotasını
+    tüketmez.
+    """
+    if f is None:
+        return lambda f: admin_required(f, rate_scope)
 
-def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if not current_user.is_authenticated or current_user.role != 'admin':
             abort(403)
         
-        # Rate limiting for admin actions
-        current_time = time.time()
-        admin_actions = session.get('admin_actions', [])
-        
-        # Remove actions older than 1 minute
-        admin_actions = [action for action in admin_actions if current_time - action < 60]
-        
-        # Limit to 30 actions per minute
-        if len(admin_actions) >= 30:
-            flash('Çok fazla işlem yapıyorsunuz. Lütfen bekleyin.', 'error')
-            return redirect(url_for('admin.dashboard'))
-        
-        admin_actions.append(current_time)
-        session['admin_actions'] = admin_actions
+        # Rate limiting for admin actions (kullanıcı ve IP başına, tüm worker'larda ortak)
+        limit_request(rate_scope, current_app.config[f'{rate_scope.upper()}_RATE_LIMIT'],
+                      current_app.config['RATELIMIT_PERIOD'])
         
         return f(*args, **kwargs)
     return decorated_function
@@ -51,86 +57,126 @@ def admin_required(f):
 @admin_required
 def dashboard():
     """Admin dashboard"""
-    # Son 30 günlük istatistikler
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    
-    # Öğrenci istatistikleri
-    total_students = User.query.filter_by(role='student').count()
-    active_students = User.query.filter_by(role='student', is_active=True).count()
-    inactive_students = User.query.filter_by(role='student', is_active=False).count()
-    new_students_this_month = User.query.filter(
-        User.role == 'student',
-        User.created_at >= thirty_days_ago
-    ).count()
-    
-    # Kurs istatistikleri
-    total_courses = Course.query.count()
-    active_courses = Course.query.filter_by(is_active=True).count()
-    
-    # Ödeme istatistikleri
-    total_payments = Payment.query.filter(Payment.is_active == True).count()
-    total_amount = db.session.query(db.func.sum(Payment.amount)).filter(
-        Payment.is_active == True
-    ).scalar() or 0
-    
-    # Son aktiviteler
-    recent_students = User.query.filter_by(role='student').order_by(User.created_at.desc()).limit(5).all()
-    recent_courses = Course.query.order_by(Course.created_at.desc()).limit(5).all()
-    recent_payments = Payment.query.filter(Payment.is_active == True).order_by(Payment.transaction_date.desc()).limit(5).all()
-    
-    return render_template('admin/dashboard.html',
-                         total_students=total_students,
-                         active_students=active_students,
-                         inactive_students=inactive_students,
-                         new_students_this_month=new_students_this_month,
-                         total_courses=total_courses,
-                         active_courses=active_courses,
-                         total_payments=total_payments,
-                         total_amount=total_amount,
-                         recent_students=recent_students,
-                         recent_courses=recent_courses,
-                         recent_payments=recent_payments)
+    # Tüm sayaçlar tek sorguda hesaplanır ve worker'lar arasında paylaşılan
+    # snapshot'tan okunur (bkz. app/admin/stats.py)
+    stats = get_dashboard_stats()
+    
+    return render_template('admin/dashboard.html', **stats)
 
 @admin.route('/students')
 @login_required
 @admin_required
 def students():
     """Öğrenci yönetimi"""
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor')
     search = request.args.get('search', '')
     status_filter = request.args.get('status', '')
     
     # Filtreleme
-    query = User.query.filter_by(role='student')
+    query = User.query.options(joinedload(User.student_profile)).filter(User.role == 'student')
+    
+    # Sıralama anahtarı: (created_at, id) - aramada önce eşleşme sırası
+    columns = [User.created_at, User.id]
+    directions = [True, True]
+    matches = None
     
     if search:
-        # Input sanitization
-        sanitized_search = re.sub(r'[^\w\s@.-]', '', search.strip())
-        if sanitized_search:
-            query = query.filter(
-                db.or_(
-                    User.email.contains(sanitized_search),
-                    User.student_profile.has(db.or_(
-                        StudentProfile.first_name.contains(sanitized_search),
-                        StudentProfile.last_name.contains(sanitized_search),
-                        StudentProfile.phone.contains(sanitized_search)
-                    ))
-                )
-            )
+        # İndekslenmiş arama: Türkçe duyarlı, önek eşleşmeli ve sıralı
+        matches = match_subquery(search.strip())
+        if matches is not None:
+            query = query.join(matches, matches.c.user_id == User.id).add_columns(matches.c.rank)
+            columns.insert(0, matches.c.rank)
+            directions.insert(0, False)
+        elif search_backend() is None:
+            # İndeks oluşturulmamış (flask init-db): basit filtre
+            query = query.filter(plain_filter(search.strip()))
     
     if status_filter:
         if status_filter == 'active':
-            query = query.filter_by(is_active=True)
+            query = query.filter(User.is_active == True)
         elif status_filter == 'inactive':
-            query = query.filter_by(is_active=False)
+            query = query.filter(User.is_active == False)
     
-    # Sayfalama
-    students = query.order_by(User.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    if matches is not None:
+        key = lambda row: (row[1], row[0].created_at, row[0].id)
+        parse = lambda values: [float(values[0]), nullable(datetime.fromisoformat)(values[1]), int(values[2])]
+    else:
+        key = lambda user: (user.created_at, user.id)
+        parse = lambda values: [nullable(datetime.fromisoformat)(values[0]), int(values[1])]
+    
+    # Sayfalama (keyset): OFFSET taraması yok, toplam sayı yalnızca istenirse
+    try:
+        students = keyset_paginate(
+            query, columns, key,
+            per_page=current_app.config['STUDENTS_PER_PAGE'],
+            cursor=cursor,
+            descending=directions,
+            parse=parse,
+            with_total=request.args.get('with_total') == '1'
+        )
+    except (ValueError, TypeError):
+        abort(400)
+    
+    if matches is not None:
+        students.items = [row[0] for row in students.items]
+    
+    if request.args.get('format') == 'json':
+        return jsonify({
+            'success': True,
+            'students': [{
+                'id': student.id,
+                'name': f"{student.student_profile.first_name} {student.student_profile.last_name}" if student.student_profile else None,
+                'email': student.email,
+                'phone': student.student_profile.phone if student.student_profile else None,
+                'created_at': student.created_at.isoformat() if student.created_at else None,
+                'is_active': student.is_active
+            } for student in students.items],
+            'next_cursor': students.next_cursor,
+            'prev_cursor': students.prev_cursor,
+            'total': students.total
+        })
     
     return render_template('admin/students.html', students=students, search=search, status_filter=status_filter)
 
+@admin.route('/students/search')
+@login_required
+@admin_required(rate_scope='admin_search')
+def search_students():
+    """Öğrenci arama (typeahead JSON API)"""
+    term = request.args.get('q', '').strip()
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    
+    matches = match_subquery(term) if term else None
+    # İndeks oluşturulmamışsa (flask init-db) basit filtreyle aranır
+    fallback = matches is None and bool(term) and search_backend() is None
+    if matches is None and not fallback:
+        return jsonify({'success': True, 'students': []})
+    
+    query = db.session.query(
+        User.id, User.email, User.is_active,
+        StudentProfile.first_name, StudentProfile.last_name, StudentProfile.phone
+    ).outerjoin(
+        StudentProfile, StudentProfile.user_id == User.id
+    ).filter(
+        User.role == 'student'
+    )
+    if fallback:
+        query = query.filter(plain_filter(term)).order_by(User.created_at.desc())
+    else:
+        query = query.join(matches, matches.c.user_id == User.id).order_by(matches.c.rank, User.created_at.desc())
+    results = query.limit(limit).all()
+    
+    return jsonify({
+        'success': True,
+        'students': [{
+            'id': row.id,
+            'name': f"{row.first_name or ''} {row.last_name or ''}".strip(),
+            'email': row.email,
+            'phone': row.phone,
+            'is_active': row.is_active
+        } for row in results]
+    })
+
 @admin.route('/students/<int:id>')
 @login_required
 @admin_required
@@ -188,7 +234,8 @@ def delete_student(id):
         abort(404)
     
     try:
-        db.session.delete(student)
+        # Kayıtlar, kurs ödemeleri, tepkiler ve profil toplu DELETE'lerle silinir
+        delete_students([student.id])
         db.session.commit()
         flash('Öğrenci başarıyla silindi.', 'success')
     except Exception as e:
@@ -202,8 +249,20 @@ def delete_student(id):
 @admin_required
 def courses():
     """Kurs yönetimi"""
-    courses = Course.query.order_by(Course.created_at.desc()).all()
-    return render_template('admin/courses.html', courses=courses)
+    page = request.args.get('page', 1, type=int)
+    per_page = current_app.config['COURSES_PER_PAGE']
+
+    # Sayfalama
+    courses = Course.query.options(
+        selectinload(Course.schedules)
+    ).order_by(Course.created_at.desc()).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+
+    # Finansal özetler (sayfadaki tüm kurslar için tek sorgu)
+    summaries = Course.financial_summaries(course.id for course in courses.items)
+
+    return render_template('admin/courses.html', courses=courses, summaries=summaries)
 
 @admin.route('/courses/new', methods=['POST'])
 @login_required
@@ -316,19 +375,9 @@ def delete_course(id):
     course = Course.query.get_or_404(id)
     
     try:
-        # Önce kursa ait ödemeleri sil (CoursePayment)
-        enrollments = CourseEnrollment.query.filter_by(course_id=id).all()
-        for enrollment in enrollments:
-            CoursePayment.query.filter_by(enrollment_id=enrollment.id).delete()
-        
-        # Kursa ait ders saatlerini sil
-        CourseSchedule.query.filter_by(course_id=id).delete()
-        
-        # Kursa ait kayıtları sil
-        CourseEnrollment.query.filter_by(course_id=id).delete()
-        
-        # Kursu sil
-        db.session.delete(course)
+        # Kurs ödemeleri, kayıtlar, duyurular, tepkiler ve ders saatleri
+        # toplu DELETE'lerle silinir
+        delete_courses([course.id])
         db.session.commit()
         flash('Kurs başarıyla silindi.', 'success')
         
@@ -338,92 +387,160 @@ def delete_course(id):
     
     return redirect(url_for('admin.courses'))
 
+def _manage_course_watermarks(id):
+    """Kurs yönetimi sayfasının bağlı olduğu kurs, kayıt, ödeme ve duyuru satırları"""
+    enrollment_ids = db.select(CourseEnrollment.id).where(CourseEnrollment.course_id == id)
+    return [
+        watermark(Course, Course.id == id),
+        watermark(CourseEnrollment, CourseEnrollment.course_id == id),
+        watermark(CoursePayment, CoursePayment.enrollment_id.in_(enrollment_ids)),
+        watermark(CourseAnnouncement, CourseAnnouncement.course_id == id),
+    ]
+
 @admin.route('/courses/<int:id>/manage')
 @login_required
 @admin_required
+@conditional_get('courses', 'course_schedules', 'course_enrollments', 'course_payments', 'payments',
+                 'users', 'student_profiles', 'admin_profiles', 'course_announcements',
+                 'announcement_reaction_counts', watermarks=_manage_course_watermarks)
 def manage_course(id):
     """Kurs yönetimi sayfası"""
     course = Course.query.get_or_404(id)
     
-    # Kursa kayıtlı öğrenciler
-    enrollments = CourseEnrollment.query.filter_by(course_id=id, is_active=True).all()
+    # Kursa kayıtlı öğrenciler; şablonun kullandığı öğrenci/profil ve ödemeler
+    # önceden yüklenir (kayıt başına sorgu çalışmasın)
+    enrollments = CourseEnrollment.query.options(
+        joinedload(CourseEnrollment.student).joinedload(User.student_profile),
+        selectinload(CourseEnrollment.payments)
+    ).filter_by(course_id=id, is_active=True).all()
     
-    # Kursa kayıtlı olmayan öğrenciler
-    enrolled_student_ids = [e.student_id for e in enrollments]
-    available_students = User.query.filter(
-        User.role == 'student',
-        User.is_active == True,
-        ~User.id.in_(enrolled_student_ids)
-    ).all()
+    # Eklenebilecek öğrenciler sayfaya gömülmez; modal enrollable_students
+    # API'sini arama yapıldıkça sorgular
     
     # Kurs duyuruları
     announcements = CourseAnnouncement.query.options(joinedload(CourseAnnouncement.creator)).filter_by(course_id=id).order_by(CourseAnnouncement.created_at.desc()).all()
+    reaction_counts = CourseAnnouncement.reaction_counts(announcement.id for announcement in announcements)
     
     return render_template('admin/manage_course.html', 
                          course=course, 
                          enrollments=enrollments,
-                         available_students=available_students,
-                         announcements=announcements)
+                         announcements=announcements,
+                         reaction_counts=reaction_counts)
+
+@admin.route('/courses/<int:id>/enrollable-students')
+@login_required
+@admin_required(rate_scope='admin_search')
+def enrollable_students(id):
+    """Kursa eklenebilecek öğrenciler (typeahead JSON API)
+
+    Aktif olup bu kursa aktif kaydı bulunmayan öğrenciler, kayıt tablosuna
+    anti-join ile bulunur. ``q`` verilirse arama indeksinde eşleşenlerle
+    sınırlanır. Sonuçlar (email, id) üzerinden keyset ile sayfalanır; bir
+    sonraki sayfa için dönen ``next_cursor`` değeri ``cursor`` parametresi
+    ile gönderilir.
+    """
+    course = Course.query.get_or_404(id)
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 50)
+    
+    query = db.session.query(
+        User.id, User.email, StudentProfile.first_name, StudentProfile.last_name
+    ).outerjoin(
+        StudentProfile, StudentProfile.user_id == User.id
+    ).outerjoin(
+        CourseEnrollment, db.and_(
+            CourseEnrollment.student_id == User.id,
+            CourseEnrollment.course_id == course.id,
+            CourseEnrollment.is_active == True
+        )
+    ).filter(
+        User.role == 'student',
+        User.is_active == True,
+        CourseEnrollment.id.is_(None)
+    )
+    
+    term = request.args.get('q', '').strip()
+    if term:
+        matches = match_subquery(term)
+        if matches is not None:
+            query = query.join(matches, matches.c.user_id == User.id)
+        elif search_backend() is None:
+            # İndeks oluşturulmamış (flask init-db): basit filtre
+            query = query.filter(plain_filter(term))
+        else:
+            return jsonify({'success': True, 'students': [], 'next_cursor': None})
+    
+    try:
+        page = keyset_paginate(
+            query, [User.email, User.id],
+            key=lambda row: (row.email, row.id),
+            per_page=limit,
+            cursor=request.args.get('cursor'),
+            descending=False
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': f'Geçersiz parametre: {str(e)}'}), 400
+    
+    return jsonify({
+        'success': True,
+        'students': [{
+            'id': row.id,
+            'name': f"{row.first_name or ''} {row.last_name or ''}".strip() or row.email,
+            'email': row.email
+        } for row in page.items],
+        'next_cursor': page.next_cursor
+    })
+
+def _roster_response(course_ids, file_stem, sheet_name, with_course=False):
+    """Öğrenci listesini istenen formatta (xlsx/csv) akış olarak döndür"""
+    file_format = request.args.get('format', 'xlsx')
+    if file_format not in ('xlsx', 'csv'):
+        abort(400)
+    
+    header = roster_header(with_course)
+    rows = roster_rows(course_ids, with_course)
+    filename = secure_filename(f"{file_stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_format}")
+    
+    if file_format == 'csv':
+        body = stream_with_context(stream_csv(header, rows))
+        mimetype = 'text/csv; charset=utf-8'
+    else:
+        body = stream_file(write_xlsx(header, rows, sheet_name))
+        mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    
+    return Response(body, mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="{filename}"'
+    })
 
 @admin.route('/courses/<int:id>/export-students')
 @login_required
 @admin_required
 def export_course_students(id):
-    """Kursa kayıtlı öğrencilerin adres bilgilerini Excel formatında indir"""
+    """Kursa kayıtlı öğrencilerin adres bilgilerini Excel (veya CSV) formatında indir"""
     course = Course.query.get_or_404(id)
     
-    # Kursa kayıtlı öğrencileri al
-    enrollments = CourseEnrollment.query.filter_by(course_id=id, is_active=True).all()
+    # Kursa kayıtlı öğrenci var mı
+    has_students = db.session.query(
+        CourseEnrollment.query.filter_by(course_id=id, is_active=True).exists()
+    ).scalar()
     
-    if not enrollments:
+    if not has_students:
         flash('Bu kursa kayıtlı öğrenci bulunamadı.', 'warning')
         return redirect(url_for('admin.manage_course', id=id))
     
-    # Excel için veri hazırla
-    data = []
-    for enrollment in enrollments:
-        student = enrollment.student
-        profile = student.student_profile
-        
-        # Ad soyad bilgilerini al
-        first_name = profile.first_name if profile and profile.first_name else ''
-        last_name = profile.last_name if profile and profile.last_name else ''
-        # Telefon bilgisini al
-        phone = profile.phone if profile and profile.phone else ''
-        
-        # Adres bilgisini al (StudentProfile'da address alanı varsa)
-        address = profile.address if profile and hasattr(profile, 'address') and profile.address else ''
-        
-        data.append({
-            'İsim': first_name,
-            'Soyisim': last_name,
-            'Telefon': phone,
-            'Adres': address,
-            'Email': student.email
-        })
-    
-    # DataFrame oluştur
-    df = pd.DataFrame(data)
-    
-    # Excel dosyası oluştur
-    from io import BytesIO
-    output = BytesIO()
-    
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Öğrenci Adresleri', index=False)
-    
-    output.seek(0)
-    
-    # Dosya adını hazırla
-    filename = f"{course.name}_ogrenci_adresleri_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    filename = secure_filename(filename)
-    
-    return send_file(
-        output,
-        as_attachment=True,
-        download_name=filename,
-        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
+    return _roster_response([id], f"{course.name}_ogrenci_adresleri", 'Öğrenci Adresleri')
+
+@admin.route('/students/export')
+@login_required
+@admin_required
+def export_students():
+    """Öğrenci listesini indir
+
+    ``course_id`` parametreleri verilirse bu kurslara kayıtlı öğrenciler kurs
+    adıyla birlikte, verilmezse tüm öğrenciler dışa aktarılır.
+    """
+    course_ids = request.args.getlist('course_id', type=int) or None
+    file_stem = 'kurs_ogrenci_listesi' if course_ids else 'ogrenci_listesi'
+    return _roster_response(course_ids, file_stem, 'Öğrenciler', with_course=bool(course_ids))
 
 @admin.route('/courses/<int:id>/enroll-students', methods=['POST'])
 @login_required
@@ -444,26 +561,10 @@ def enroll_students(id):
         return redirect(url_for('admin.manage_course', id=id))
     
     try:
-        enrolled_count = 0
-        for student_id in student_ids:
-            # Öğrencinin zaten kayıtlı olup olmadığını kontrol et
-            existing_enrollment = CourseEnrollment.query.filter_by(
-                course_id=id, 
-                student_id=student_id,
-                is_active=True
-            ).first()
-            
-            if not existing_enrollment:
-                enrollment = CourseEnrollment(
-                    course_id=id,
-                    student_id=student_id,
-                    enrolled_by=current_user.id
-                )
-                db.session.add(enrollment)
-                enrolled_count += 1
-        
+        student_ids = [int(student_id) for student_id in student_ids]
+        enrolled = CourseEnrollment.bulk_enroll(course, student_ids, current_user.id)
         db.session.commit()
-        flash(f'{enrolled_count} öğrenci kursa başarıyla eklendi.', 'success')
+        flash(f'{len(enrolled)} öğrenci kursa başarıyla eklendi.', 'success')
         
     except Exception as e:
         db.session.rollback()
@@ -471,6 +572,56 @@ def enroll_students(id):
     
     return redirect(url_for('admin.manage_course', id=id))
 
+@admin.route('/courses/<int:id>/import-students', methods=['POST'])
+@login_required
+@admin_required
+def import_students(id):
+    """Email veya telefon listesinden (CSV/xlsx) kursa toplu öğrenci ekleme
+
+    Tüm satırlar tek sorguda öğrencilerle eşleştirilir ve eşleşenler tek
+    transaction içinde kaydedilir. Zaten kayıtlı, pasif veya dosyada tekrar
+    eden öğrenciler atlanır; eşleşmeyen satırlar raporlanır.
+    """
+    try:
+        validate_csrf(request.form.get('csrf_token'))
+    except:
+        flash('Güvenlik hatası. Lütfen tekrar deneyin.', 'error')
+        return redirect(url_for('admin.manage_course', id=id))
+    
+    course = Course.query.get_or_404(id)
+    file = request.files.get('file')
+    if not file or file.filename == '':
+        flash('Dosya seçilmedi.', 'error')
+        return redirect(url_for('admin.manage_course', id=id))
+    
+    if not file.filename.lower().endswith(('.csv', '.xlsx', '.xls')):
+        flash('Sadece CSV veya Excel dosyaları kabul edilir.', 'error')
+        return redirect(url_for('admin.manage_course', id=id))
+    
+    try:
+        values = read_roster(file)
+        matched, unknown = match_roster(values)
+        enrolled = CourseEnrollment.bulk_enroll(course, matched.values(), current_user.id)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Roster import error: {e}")
+        flash('Liste içe aktarılırken hata oluştu.', 'error')
+        return redirect(url_for('admin.manage_course', id=id))
+    
+    matched_rows = len(values) - len(unknown)
+    flash(
+        f'{len(values)} satır işlendi: {matched_rows} eşleşti, {len(enrolled)} öğrenci eklendi, '
+        f'{matched_rows - len(enrolled)} atlandı (zaten kayıtlı, pasif veya tekrar eden), '
+        f'{len(unknown)} eşleşmedi.',
+        'success' if not unknown else 'warning'
+    )
+    if unknown:
+        sample = ', '.join(unknown[:10]) + (' ...' if len(unknown) > 10 else '')
+        flash(f'Eşleşmeyen satırlar: {sample}', 'warning')
+    
+    return redirect(url_for('admin.manage_course', id=id))
+
 @admin.route('/courses/<int:id>/announcements/add', methods=['POST'])
 @login_required
 @admin_required
@@ -490,6 +641,9 @@ def add_announcement(id):
     
     def sanitize_html(text):
         """HTML içeriğini güvenli hale getir"""
+        # bs4 yalnızca duyuru eklenirken yüklenir (worker açılışını yavaşlatmasın)
+        from bs4 import BeautifulSoup
+        
         # Sadece izin verilen HTML etiketlerini kabul et
         allowed_tags = ['strong', 'em', 'u', 'p', 'ul', 'li', 'br']
         allowed_attrs = {}
@@ -554,8 +708,8 @@ def delete_announcement(id, announcement_id):
     ).first_or_404()
     
     try:
-        # Duyuruyu veritabanından tamamen sil
-        db.session.delete(announcement)
+        # Duyuruyu tepkileri ve emoji sayaçlarıyla birlikte tamamen sil
+        delete_announcements([announcement.id])
         db.session.commit()
         flash('Duyuru başarıyla silindi.', 'success')
         
@@ -585,6 +739,7 @@ def unenroll_student(id, student_id):
     try:
         # Önce bu öğrencinin ödeme kayıtlarını sil
         CoursePayment.query.filter_by(enrollment_id=enrollment.id).delete()
+        CourseEnrollment.rebuild_balances([enrollment.id])
         
         # Sonra öğrenciyi kurstan çıkar
         enrollment.is_active = False
@@ -603,35 +758,70 @@ def unenroll_student(id, student_id):
 @login_required
 @admin_required
 def get_pending_payments(id, student_id):
-    """Bekleyen ödemeleri getir (API)"""
+    """Bekleyen ödemeleri getir (API)
+
+    Sonuçlar (transaction_date, id) üzerinden keyset ile sayfalanır; bir sonraki
+    sayfa için dönen ``next_cursor`` değeri ``cursor`` parametresi ile gönderilir.
+    Desteklenen filtreler: ``search``, ``min_amount``, ``max_amount``,
+    ``date_from`` ve ``date_to`` (YYYY-MM-DD).
+    """
     try:
-        # Önce atanmış ödeme ID'lerini al
-        assigned_payment_ids = db.session.query(CoursePayment.payment_id).filter(
-            CoursePayment.payment_id.isnot(None)
-        ).distinct().all()
-        assigned_payment_ids = [row[0] for row in assigned_payment_ids]
+        limit = min(max(request.args.get('limit', current_app.config['PAYMENTS_PER_PAGE'], type=int), 1), 100)
         
         # Bekleyen ödemeler (hiçbir kurs ödemesine bağlı olmayan)
-        pending_payments = Payment.query.filter(
-            Payment.is_active == True,
-            ~Payment.id.in_(assigned_payment_ids) if assigned_payment_ids else True
-        ).order_by(Payment.transaction_date.desc()).all()
+        query = Payment.unassigned()
+        
+        search = request.args.get('search', '').strip()
+        if search:
+            query = query.filter(Payment.description.contains(search))
+        
+        min_amount = request.args.get('min_amount', type=float)
+        if min_amount is not None:
+            query = query.filter(Payment.amount >= min_amount)
+        
+        max_amount = request.args.get('max_amount', type=float)
+        if max_amount is not None:
+            query = query.filter(Payment.amount <= max_amount)
+        
+        date_from = request.args.get('date_from')
+        if date_from:
+            query = query.filter(Payment.transaction_date >= datetime.strptime(date_from, '%Y-%m-%d').date())
+        
+        date_to = request.args.get('date_to')
+        if date_to:
+            query = query.filter(Payment.transaction_date <= datetime.strptime(date_to, '%Y-%m-%d').date())
+        
+        page = keyset_paginate(
+            query, [Payment.transaction_date, Payment.id],
+            key=lambda payment: (payment.transaction_date, payment.id),
+            per_page=limit,
+            cursor=request.args.get('cursor'),
+            parse=lambda values: [datetime.strptime(values[0], '%Y-%m-%d').date(), int(values[1])]
+        )
+        pending_payments = page.items
         
         # JSON formatına çevir
         payments_data = []
         for payment in pending_payments:
-                         payments_data.append({
-                 'id': payment.id,
-                 'formatted_date': payment.formatted_date,
-                 'description': payment.description,
-                 'amount': str(payment.amount)
-             })
+            payments_data.append({
+                'id': payment.id,
+                'formatted_date': payment.formatted_date,
+                'description': payment.description,
+                'amount': str(payment.amount)
+            })
         
         return jsonify({
             'success': True,
-            'payments': payments_data
+            'payments': payments_data,
+            'next_cursor': page.next_cursor,
+            'prev_cursor': page.prev_cursor
         })
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': f'Geçersiz parametre: {str(e)}'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -665,25 +855,24 @@ def assign_payments_to_student_post(id, student_id):
         ).first_or_404()
         
         try:
+            # Seçilenler arasından henüz hiçbir kurs ödemesine bağlı olmayanlar (tek sorgu)
+            payment_ids = [int(payment_id) for payment_id in payment_ids]
+            payments = Payment.unassigned().filter(Payment.id.in_(payment_ids)).all()
+            
             assigned_count = 0
-            for payment_id in payment_ids:
-                payment = Payment.query.get(payment_id)
-                if payment and payment.is_active:
-                    # Bu ödeme zaten başka bir kurs ödemesine bağlı mı kontrol et
-                    existing_course_payment = CoursePayment.query.filter_by(payment_id=payment_id).first()
-                    if not existing_course_payment:
-                        # Kurs ödemesi oluştur
-                        course_payment = CoursePayment(
-                            enrollment_id=enrollment.id,
-                            payment_id=payment_id,
-                            amount=payment.amount,
-                            payment_date=payment.transaction_date,
-                                                     payment_method='otomatik_atama',
-                         notes=f'Ödeme ataması - {payment.description}',
-                            created_by=current_user.id
-                        )
-                        db.session.add(course_payment)
-                        assigned_count += 1
+            for payment in payments:
+                # Kurs ödemesi oluştur
+                course_payment = CoursePayment(
+                    enrollment_id=enrollment.id,
+                    payment_id=payment.id,
+                    amount=payment.amount,
+                    payment_date=payment.transaction_date,
+                    payment_method='otomatik_atama',
+                    notes=f'Ödeme ataması - {payment.description}',
+                    created_by=current_user.id
+                )
+                db.session.add(course_payment)
+                assigned_count += 1
             
             db.session.commit()
             return jsonify({
@@ -698,13 +887,21 @@ def assign_payments_to_student_post(id, student_id):
     except Exception as e:
         return jsonify({'success': False, 'error': f'Veri işleme hatası: {str(e)}'})
 
+def _payments_watermarks():
+    """Ödeme sayfasının bağlı olduğu aktif ödemeler ve kurs ödemesi atamaları"""
+    return [
+        watermark(Payment, Payment.is_active == True),
+        watermark(CoursePayment),
+    ]
+
 @admin.route('/payments')
 @login_required
 @admin_required
+@conditional_get('payments', 'course_payments', 'users', 'student_profiles', watermarks=_payments_watermarks)
 def payments():
     """Ödeme yönetimi ana sayfası"""
     # Tüm ödemeler (sayfalama ile)
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor')
     search = request.args.get('search', '')
     date_filter = request.args.get('date_filter', '')
     
@@ -739,34 +936,46 @@ def payments():
             month_ago = datetime.now().date() - timedelta(days=30)
             query = query.filter(Payment.transaction_date >= month_ago)
     
-    # Sayfalama
-    payments = query.order_by(Payment.transaction_date.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
+    # Sayfalama (keyset): (transaction_date, id) üzerinden, OFFSET ve COUNT yok
+    try:
+        payments = keyset_paginate(
+            query, [Payment.transaction_date, Payment.id],
+            key=lambda payment: (payment.transaction_date, payment.id),
+            per_page=current_app.config['PAYMENTS_PER_PAGE'],
+            cursor=cursor,
+            parse=lambda values: [datetime.strptime(values[0], '%Y-%m-%d').date(), int(values[1])],
+            with_total=request.args.get('with_total') == '1'
+        )
+    except (ValueError, TypeError):
+        abort(400)
+    
+    if request.args.get('format') == 'json':
+        return jsonify({
+            'success': True,
+            'payments': [{
+                'id': payment.id,
+                'formatted_date': payment.formatted_date,
+                'description': payment.description,
+                'amount': str(payment.amount)
+            } for payment in payments.items],
+            'next_cursor': payments.next_cursor,
+            'prev_cursor': payments.prev_cursor,
+            'total': payments.total
+        })
     
     # Bekleyen ödemeler (hiçbir kurs ödemesine bağlı olmayan)
-    # Önce atanmış ödeme ID'lerini al
-    assigned_payment_ids = db.session.query(CoursePayment.payment_id).filter(
-        CoursePayment.payment_id.isnot(None)
-    ).distinct().all()
-    assigned_payment_ids = [row[0] for row in assigned_payment_ids]
-    
-    pending_payments = Payment.query.filter(
-        Payment.is_active == True,
-        ~Payment.id.in_(assigned_payment_ids) if assigned_payment_ids else True
-    ).order_by(Payment.transaction_date.desc()).limit(10).all()
-    
-    # Toplam istatistikler
-    total_payments = Payment.query.filter(Payment.is_active == True).count()
-    total_amount = db.session.query(db.func.sum(Payment.amount)).filter(
-        Payment.is_active == True
-    ).scalar() or 0
+    pending_payments = Payment.unassigned().order_by(
+        Payment.transaction_date.desc(), Payment.id.desc()
+    ).limit(10).all()
+    
+    # Toplam istatistikler (paylaşılan dashboard snapshot'ından)
+    stats = get_dashboard_stats()
     
     return render_template('admin/payments.html',
                          payments=payments,
                          pending_payments=pending_payments,
-                         total_payments=total_payments,
-                         total_amount=total_amount,
+                         total_payments=stats['total_payments'],
+                         total_amount=stats['total_amount'],
                          search=search,
                          date_filter=date_filter)
 
@@ -784,14 +993,8 @@ def delete_payment(id):
     payment = Payment.query.get_or_404(id)
     
     try:
-        # 1. Önce bu payment'a ait CoursePayment kayıtlarını sil
-        from app.models.course import CoursePayment
-        course_payments = CoursePayment.query.filter_by(payment_id=id).all()
-        for course_payment in course_payments:
-            db.session.delete(course_payment)
-        
-        # 2. Sonra Payment kaydını sil
-        db.session.delete(payment)
+        # Bağlı kurs ödemeleri silinir, kayıt bakiyeleri yeniden hesaplanır
+        delete_payments([payment.id])
         db.session.commit()
         flash('Ödeme başarıyla silindi.', 'success')
     except Exception as e:
@@ -805,7 +1008,14 @@ def delete_payment(id):
 @login_required
 @admin_required
 def bulk_delete_payments():
-    """Toplu ödeme silme"""
+    """Toplu ödeme silme (JSON API)
+
+    Silinecek aktif ödemeler ``payment_ids`` listesi ve/veya ``filter``
+    nesnesi ile seçilir. Filtre alanları: ``date_from``, ``date_to``
+    (YYYY-MM-DD), ``import_batch`` ve ``search`` (açıklamada arama). Silme
+    ``DELETE_CHUNK_SIZE``'lık parçalar halinde yapılır; yanıtta parça başına
+    silinen ödeme ve kurs ödemesi sayıları ile süreler döner.
+    """
     try:
         # CSRF token kontrolü
         csrf_token = request.headers.get('X-CSRFToken')
@@ -822,39 +1032,51 @@ def bulk_delete_payments():
         if not data:
             return jsonify({'success': False, 'error': 'Geçersiz veri formatı'})
         
-        payment_ids = data.get('payment_ids', [])
+        payment_ids = data.get('payment_ids') or None
+        filters = data.get('filter') or {}
         
-        if not payment_ids:
+        # Yalnızca aktif ödemeler silinir
+        criteria = [Payment.is_active == True]
+        try:
+            if payment_ids is not None:
+                payment_ids = [int(payment_id) for payment_id in payment_ids]
+            if filters.get('date_from'):
+                criteria.append(Payment.transaction_date >= datetime.strptime(filters['date_from'], '%Y-%m-%d').date())
+            if filters.get('date_to'):
+                criteria.append(Payment.transaction_date <= datetime.strptime(filters['date_to'], '%Y-%m-%d').date())
+            if filters.get('import_batch'):
+                criteria.append(Payment.import_batch == str(filters['import_batch']))
+            if filters.get('search'):
+                criteria.append(Payment.description.contains(str(filters['search']).strip(), autoescape=True))
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': f'Geçersiz parametre: {str(e)}'}), 400
+        
+        # Filtresiz istek tüm ödemeleri silmesin
+        if payment_ids is None and len(criteria) == 1:
             return jsonify({'success': False, 'error': 'Silinecek ödeme seçilmedi'})
         
         try:
-            deleted_count = 0
-            for payment_id in payment_ids:
-                payment = Payment.query.get(payment_id)
-                if payment and payment.is_active:
-                    # 1. Önce bu payment'a ait CoursePayment kayıtlarını sil
-                    course_payments = CoursePayment.query.filter_by(payment_id=payment_id).all()
-                    for course_payment in course_payments:
-                        db.session.delete(course_payment)
-                    
-                    # 2. Sonra Payment kaydını sil
-                    db.session.delete(payment)
-                    deleted_count += 1
-            
-            db.session.commit()
-            return jsonify({
-                'success': True,
-                'message': f'{deleted_count} ödeme başarıyla silindi'
-            })
-            
+            progress = delete_payments(payment_ids, criteria)
         except Exception as e:
+            # Yalnızca yarıda kalan parça geri alınır; tamamlananlar commit edilmiştir
             db.session.rollback()
+            print(f"Bulk payment deletion error: {e}")
             return jsonify({'success': False, 'error': f'Toplu silme işlemi sırasında hata oluştu: {str(e)}'})
-            
+        
+        deleted_count = sum(chunk['payments'] for chunk in progress)
+        return jsonify({
+            'success': True,
+            'message': f'{deleted_count} ödeme başarıyla silindi',
+            'deleted': deleted_count,
+            'course_payments_deleted': sum(chunk['course_payments'] for chunk in progress),
+            'chunks': progress
+        })
+        
     except Exception as e:
         return jsonify({'success': False, 'error': f'Veri işleme hatası: {str(e)}'})
 
 @admin.route('/payments/upload', methods=['POST'])
+@screen.exempt
 @login_required
 @admin_required
 def upload_statement():
@@ -875,8 +1097,14 @@ def upload_statement():
         return jsonify({'success': False, 'error': 'Sadece Excel dosyaları kabul edilir'})
     
     try:
+        # pandas yalnızca ekstre yüklenirken yüklenir (worker açılışını yavaşlatmasın)
+        import pandas as pd
+        
+        started_at = time.perf_counter()
+        
         # Dosyayı oku
         df = pd.read_excel(file)
+        total_rows = len(df)
         
         # Sütun isimlerini temizle
         df.columns = df.columns.str.strip()
@@ -946,44 +1174,69 @@ def upload_statement():
         if positive_payments.empty:
             return jsonify({'success': False, 'error': 'Filtre kriterlerine uygun ödeme bulunamadı'})
         
-        # Mevcut kayıtları kontrol et
-        processed_data = []
-
-        for index, row in positive_payments.iterrows():
-            try:
-                # Tarihi parse et
-                transaction_date = pd.to_datetime(row[date_column]).date()
-                
-                # Mevcut kayıt kontrolü (tarih + açıklama + tutar kombinasyonu)
-                existing_payment = Payment.query.filter_by(
-                    transaction_date=transaction_date,
-                    description=str(row[description_column]),
-                    amount=float(row[amount_column])
-                ).first()
-                
-                processed_data.append({
-                    'index': index,
-                    'date': transaction_date.strftime('%d.%m.%Y'),
-                    'description': str(row[description_column]),
-                    'amount': float(row[amount_column]),
-                    'exists': existing_payment is not None
-                })
-            except Exception as e:
-                # Hatalı satırları atla
-                continue
+        # Tarihleri tüm sütun üzerinde tek seferde parse et; ortak formata uymayan
+        # değerler satır satır (mixed) yorumlanır, yine de okunamayanlar atlanır
+        dates = pd.to_datetime(positive_payments[date_column], errors='coerce')
+        unparsed = dates.isna()
+        if unparsed.any():
+            dates[unparsed] = pd.to_datetime(
+                positive_payments.loc[unparsed, date_column], errors='coerce', format='mixed'
+            )
+        dates = dates.dt.normalize()
+        
+        candidates = pd.DataFrame({
+            'date': dates,
+            'description': positive_payments[description_column].astype(str),
+            'amount': positive_payments[amount_column].astype(float).round(2)
+        }).dropna(subset=['date'])
+        
+        # Mevcut kayıt kontrolü (tarih + açıklama + tutar): ekstrenin tarih aralığındaki
+        # anahtarlar tek sorguda alınır ve pandas'ta birleştirilir
+        existing = pd.DataFrame(
+            db.session.query(
+                Payment.transaction_date, Payment.description, Payment.amount
+            ).filter(
+                Payment.transaction_date.between(
+                    candidates['date'].min().date(), candidates['date'].max().date()
+                )
+            ).all() if not candidates.empty else [],
+            columns=['date', 'description', 'amount']
+        )
+        existing['date'] = pd.to_datetime(existing['date'])
+        existing['amount'] = existing['amount'].astype(float).round(2)
+        
+        merged = candidates.merge(
+            existing.drop_duplicates(), on=['date', 'description', 'amount'], how='left', indicator=True
+        )
+        
+        processed_data = pd.DataFrame({
+            'index': candidates.index,
+            'date': candidates['date'].dt.strftime('%d.%m.%Y'),
+            'description': candidates['description'],
+            'amount': candidates['amount'],
+            'exists': (merged['_merge'] == 'both').to_numpy()
+        }).to_dict('records')
         
         if not processed_data:
             return jsonify({'success': False, 'error': 'Geçerli veri bulunamadı'})
         
+        elapsed = time.perf_counter() - started_at
+        
         return jsonify({
             'success': True,
-            'data': processed_data
+            'data': processed_data,
+            'stats': {
+                'rows': total_rows,
+                'elapsed_ms': round(elapsed * 1000, 1),
+                'rows_per_second': round(total_rows / elapsed) if elapsed > 0 else None
+            }
         })
         
     except Exception as e:
         return jsonify({'success': False, 'error': f'Dosya okuma hatası: {str(e)}'})
 
 @admin.route('/payments/save', methods=['POST'])
+@screen.exempt
 @login_required
 @admin_required
 def save_payments():
@@ -1009,41 +1262,46 @@ def save_payments():
     try:
         # JSON verilerini al
         data = request.get_json()
-        print(f"Received data: {data}")  # Debug print
         if not data:
             return jsonify({'success': False, 'error': 'Geçersiz veri formatı'})
         
         selected_payments = data.get('payments', [])
-        print(f"Selected payments: {selected_payments}")  # Debug print
+        print(f"Selected payments: {len(selected_payments)}")  # Debug print
         
         if not selected_payments:
             return jsonify({'success': False, 'error': 'Kaydedilecek ödeme seçilmedi'})
         
         try:
-            saved_count = 0
+            # Tarih ve tutarları bir kez parse et, aynı satırı iki kez gönderme
+            # Aynı kayıtta eklenen ödemeler birlikte geri alınabilsin diye işaretlenir
+            import_batch = uuid.uuid4().hex
+            rows = {}
             for payment_data in selected_payments:
-                # Mevcut kayıt kontrolü
-                existing_payment = Payment.query.filter_by(
-                    transaction_date=datetime.strptime(payment_data['date'], '%d.%m.%Y').date(),
-                    description=payment_data['description'],
-                    amount=payment_data['amount']
-                ).first()
-                
-                if not existing_payment:
-                    payment = Payment(
-                        transaction_date=datetime.strptime(payment_data['date'], '%d.%m.%Y').date(),
-                        description=payment_data['description'],
-                        amount=payment_data['amount'],
-                        created_by=current_user.id
-                    )
-                    db.session.add(payment)
-                    saved_count += 1
+                transaction_date = datetime.strptime(payment_data['date'], '%d.%m.%Y').date()
+                amount = Decimal(str(payment_data['amount'])).quantize(Decimal('0.01'))
+                key = (transaction_date, payment_data['description'], amount)
+                rows[key] = {
+                    'transaction_date': transaction_date,
+                    'description': payment_data['description'],
+                    'amount': amount,
+                    'created_by': current_user.id,
+                    'is_active': True,
+                    'import_batch': import_batch
+                }
+            rows = list(rows.values())
+            
+            # Parça parça toplu ekle; her parça kendi transaction'ında kaydedilir
+            chunk_size = current_app.config['PAYMENT_IMPORT_CHUNK_SIZE']
+            saved_count = 0
+            for start in range(0, len(rows), chunk_size):
+                saved_count += Payment.bulk_insert(rows[start:start + chunk_size])
+                db.session.commit()
             
-            db.session.commit()
             print(f"Saved {saved_count} payments")  # Debug print
             return jsonify({
                 'success': True,
-                'message': f'{saved_count} ödeme başarıyla kaydedildi'
+                'message': f'{saved_count} ödeme başarıyla kaydedildi',
+                'import_batch': import_batch
             })
             
         except Exception as e:
@@ -1100,7 +1358,7 @@ def change_password():
     """Admin şifre değiştirme sayfası"""
     form = AdminPasswordChangeForm()
     if form.validate_on_submit():
-        current_user.password_hash = generate_password_hash(form.new_password.data)
+        current_user.set_password(form.new_password.data)
         db.session.commit()
         flash('Şifre başarıyla değiştirildi.', 'success')
         return redirect(url_for('admin.dashboard'))
@@ -0,0 +1,90 @@
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+
+from app import db, cache
+from app.models.user import User
+from app.models.course import Course
+from app.models.payment import Payment
+
+DASHBOARD_STATS_KEY = 'admin:dashboard_stats'
+
+# Bu modellerden birine dokunan her commit dashboard snapshot'ını geçersiz kılar
+_TRACKED_MODELS = (User, Course, Payment)
+
+
+def compute_dashboard_stats():
+    """Dashboard sayaçlarını tek bir koşullu aggregate sorgusu ile hesapla"""
+    thirty_days_ago = datetime.now() - timedelta(days=30)
+
+    student_stats = db.select(
+        db.func.count(User.id).label('total_students'),
+        db.func.count(db.case((User.is_active == True, 1))).label('active_students'),
+        db.func.count(db.case((User.is_active == False, 1))).label('inactive_students'),
+        db.func.count(db.case((User.created_at >= thirty_days_ago, 1))).label('new_students_this_month')
+    ).where(User.role == 'student').subquery()
+
+    course_stats = db.select(
+        db.func.count(Course.id).label('total_courses'),
+        db.func.count(db.case((Course.is_active == True, 1))).label('active_courses')
+    ).subquery()
+
+    payment_stats = db.select(
+        db.func.count(Payment.id).label('total_payments'),
+        db.func.coalesce(db.func.sum(Payment.amount), 0).label('total_amount')
+    ).where(Payment.is_active == True).subquery()
+
+    # Her alt sorgu tek satır döndürür; birleşim tek satırlık bir sonuç verir
+    row = db.session.execute(
+        db.select(student_stats, course_stats, payment_stats).select_from(
+            student_stats.join(course_stats, db.true()).join(payment_stats, db.true())
+        )
+    ).one()
+
+    stats = dict(row._mapping)
+    stats['total_amount'] = float(stats['total_amount'])
+    return stats
+
+
+def get_dashboard_stats():
+    """Dashboard sayaçlarını paylaşılan snapshot'tan, yoksa veritabanından getir"""
+    stats = cache.get(DASHBOARD_STATS_KEY)
+    if stats is None:
+        stats = compute_dashboard_stats()
+        cache.set(DASHBOARD_STATS_KEY, stats, current_app.config['DASHBOARD_CACHE_TTL'])
+    return stats
+
+
+def invalidate_dashboard_stats():
+    """Dashboard snapshot'ını tüm worker'lar için sil"""
+    cache.delete(DASHBOARD_STATS_KEY)
+
+
+@event.listens_for(Session, 'before_flush')
+def _track_flushed_models(session, flush_context, instances):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _TRACKED_MODELS):
+            session.info['dashboard_stats_stale'] = True
+            return
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_statements(orm_execute_state):
+    # Query.update()/delete() gibi toplu ifadeler flush'tan geçmez
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _TRACKED_MODELS):
+        orm_execute_state.session.info['dashboard_stats_stale'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    if session.info.pop('dashboard_stats_stale', False):
+        invalidate_dashboard_stats()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _reset_after_rollback(session):
+    session.info.pop('dashboard_stats_stale', None)
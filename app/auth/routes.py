@@ -1,14 +1,14 @@
-from flask import render_template, redirect, url_for, flash, request, session
+from flask import render_template, redirect, url_for, flash, request, current_app, g
 from flask_login import login_user, logout_user, login_required, current_user
 from app.auth import auth
 from app.auth.forms import LoginForm, RegisterForm, ForgotPasswordForm, ResetPasswordForm
 from app.models.user import User
 from app.models.student_profile import StudentProfile
-from app import db, mail
+from app import db, limiter
+from app.mailer import queue_email
 from datetime import datetime, timedelta
 import re
 import secrets
-from flask_mail import Message
 
 @auth.route('/login', methods=['GET', 'POST'])
 def login():
@@ -24,6 +24,18 @@ def login():
         # Input sanitization
         email = re.sub(r'[^\w@.-]', '', form.email.data.strip().lower())
         
+        # Başarısız giriş sınırı: hem IP hem email için, tüm worker'larda ortak
+        limit = current_app.config['LOGIN_FAILURE_LIMIT']
+        period = current_app.config['LOGIN_FAILURE_PERIOD']
+        failure_keys = (f'login:ip:{request.remote_addr}', f'login:email:{email}')
+        for key in failure_keys:
+            status = limiter.peek(key, limit, period)
+            if not status.allowed:
+                g.rate_limit = status
+                minutes = max(status.reset_after // 60, 1)
+                flash(f'Çok fazla başarısız giriş denemesi. Lütfen {minutes} dakika bekleyin.', 'error')
+                return render_template('auth/login.html', form=form), 429
+        
         user = User.query.filter_by(email=email).first()
         if user and user.check_password(form.password.data):
             if not user.is_active:
@@ -31,7 +43,16 @@ def login():
                 return render_template('auth/login.html', form=form)
             
             # Clear failed login attempts
-            session.pop('failed_login_attempts', None)
+            limiter.reset(failure_keys[1])
+            
+            # Hash eski yöntem/maliyetle üretilmişse şifre elimizdeyken yenile
+            if user.password_needs_rehash():
+                try:
+                    user.set_password(form.password.data)
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Password rehash error: {e}")
             
             login_user(user, remember=form.remember_me.data)
             
@@ -44,13 +65,9 @@ def login():
             return redirect(next_page)
         else:
             # Track failed login attempts
-            failed_attempts = session.get('failed_login_attempts', 0) + 1
-            session['failed_login_attempts'] = failed_attempts
-            
-            if failed_attempts >= 3:
-                flash('Çok fazla başarısız giriş denemesi. Lütfen 5 dakika bekleyin.', 'error')
-            else:
-                flash('Geçersiz email veya şifre', 'error')
+            results = [limiter.hit(key, limit, period) for key in failure_keys]
+            g.rate_limit = min(results, key=lambda result: result.remaining)
+            flash('Geçersiz email veya şifre', 'error')
     
     return render_template('auth/login.html', form=form)
 
@@ -123,12 +140,7 @@ def forgot_password():
             # Email gönder
             try:
                 reset_url = url_for('auth.reset_password', token=token, _external=True)
-                msg = Message(
-                    subject='Şifre Sıfırlama - Öğrenci Kayıt Sistemi',
-                    recipients=[user.email]
-                )
-                
-                msg.html = f"""
+                html = f"""
                 <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
                     <h2 style="color: #333;">Şifre Sıfırlama</h2>
                     <p>Merhaba,</p>
@@ -148,12 +160,14 @@ def forgot_password():
                 </div>
                 """
                 
-                # Gerçek email gönder
-                mail.send(msg)
+                # Email kuyruğa alınır, arka plan göndericisi iletir
+                queue_email('Şifre Sıfırlama - Öğrenci Kayıt Sistemi', [user.email], html=html)
+                db.session.commit()
                 
                 flash('Şifre sıfırlama linki email adresinize gönderildi. Lütfen email kutunuzu kontrol edin.', 'success')
                 
             except Exception as e:
+                db.session.rollback()
                 # Token'ı temizle
                 user.reset_token = None
                 user.reset_token_expires = None
@@ -0,0 +1,117 @@
+import json
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from flask import current_app
+from sqlalchemy import event
+
+from app import db
+from app.query_plans import logged_in_requests
+
+# Bu kadar ms'lik artışlar ölçüm gürültüsü sayılır (çok hızlı route'larda
+# küçük mutlak farklar büyük oranlara denk gelir)
+LATENCY_NOISE_MS = 5
+
+
+def route_name(url):
+    """Url'yi veritabanındaki id'lerden bağımsız bir ada çevir (endpoint + sorgu)"""
+    parts = urlsplit(url)
+    endpoint, _ = current_app.url_map.bind('localhost').match(parts.path, method='GET')
+    return f'{endpoint}?{parts.query}' if parts.query else endpoint
+
+
+def percentile(values, fraction):
+    """En yakın sıra yöntemiyle yüzdelik (``fraction`` 0-1 arası)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def table_counts():
+    """Tablo başına satır sayıları (ölçümün hangi veri hacminde yapıldığını kaydetmek için)"""
+    return {
+        table.name: db.session.scalar(db.select(db.func.count()).select_from(table))
+        for table in db.metadata.sorted_tables
+    }
+
+
+def benchmark_routes(requests, iterations, progress=None):
+    """Her route'u ``iterations`` kez çağır; gecikme yüzdeliklerini ve sorgu sayısını ölç
+
+    Her route önce bir kez ısınma için çağrılır (önbellekler ve derlenmiş
+    sorgular dolsun). Sonuç route adına göre ``{url, status, p50_ms, p95_ms,
+    max_ms, queries}`` sözlükleridir; ``queries`` bir istekte çalışan en
+    fazla SQL ifadesi sayısıdır.
+    """
+    counter = {'queries': 0}
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        counter['queries'] += 1
+
+    results = {}
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        with logged_in_requests() as get:
+            for role, url in requests:
+                status = get(role, url).status_code
+                timings, queries = [], 0
+                for _ in range(iterations):
+                    counter['queries'] = 0
+                    started_at = time.perf_counter()
+                    response = get(role, url)
+                    timings.append((time.perf_counter() - started_at) * 1000)
+                    queries = max(queries, counter['queries'])
+                    status = max(status, response.status_code)
+                    # Route'lar arasında kimlik haritası büyümesin
+                    db.session.remove()
+
+                name = route_name(url)
+                results[name] = {
+                    'url': url,
+                    'status': status,
+                    'p50_ms': round(percentile(timings, 0.5), 2),
+                    'p95_ms': round(percentile(timings, 0.95), 2),
+                    'max_ms': round(max(timings), 2),
+                    'queries': queries,
+                }
+                if progress:
+                    progress(name, results[name])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Sonuçları kaydedilmiş baseline ile karşılaştır, gerilemelerin listesini döndür
+
+    Sorgu sayısı artışı her zaman gerilemedir. p50 gecikmesi baseline'ın
+    ``1 + tolerance`` katını ve ``LATENCY_NOISE_MS``'lik gürültü payını
+    aşarsa gerileme sayılır. Baseline'da olmayan route'lar karşılaştırılmaz.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline['routes'].get(name)
+        if previous is None:
+            continue
+        if result['queries'] > previous['queries']:
+            regressions.append(f"{name}: sorgu sayısı {previous['queries']} -> {result['queries']}")
+        limit = max(previous['p50_ms'] * (1 + tolerance), previous['p50_ms'] + LATENCY_NOISE_MS)
+        if result['p50_ms'] > limit:
+            regressions.append(f"{name}: p50 {previous['p50_ms']}ms -> {result['p50_ms']}ms")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, counts, iterations):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'database': db.engine.dialect.name,
+            'iterations': iterations,
+            'counts': counts,
+            'routes': results,
+        }, f, ensure_ascii=False, indent=2)
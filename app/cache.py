@@ -0,0 +1,207 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class SharedCache:
+    """Tüm gunicorn worker'ları arasında paylaşılan basit TTL cache
+
+    Değerler JSON olarak ``SHARED_CACHE_PATH`` ile belirtilen SQLite dosyasında
+    tutulur (varsayılan: instance klasörü). Aynı makinedeki tüm worker'lar aynı
+    dosyayı okuduğu için bir worker'ın yazdığı veya sildiği anahtar diğerleri
+    tarafından da hemen görülür.
+    """
+
+    def __init__(self, app=None):
+        self.path = None
+        self._local = threading.local()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        path = app.config.get('SHARED_CACHE_PATH')
+        if not path:
+            os.makedirs(app.instance_path, exist_ok=True)
+            path = os.path.join(app.instance_path, 'shared_cache.sqlite3')
+        self.path = path
+        app.extensions['shared_cache'] = self
+
+    def connection(self):
+        """Thread (ve process) başına tek bağlantı döndür"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """Anahtarın değerini döndür, yoksa veya süresi dolduysa None"""
+        if self.path is None:
+            return None
+        try:
+            row = self.connection().execute(
+                'SELECT value, expires_at FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Shared cache read error: {e}")
+            return None
+
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        """Değeri ``ttl`` saniye geçerli olacak şekilde kaydet"""
+        if self.path is None or ttl <= 0:
+            return
+        try:
+            self.connection().execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), time.time() + ttl)
+            )
+        except sqlite3.Error as e:
+            print(f"Shared cache write error: {e}")
+
+    def update(self, key, func, ttl):
+        """Değeri ``func(eski_değer)`` sonucuyla atomik olarak değiştir, yeni değeri döndür
+
+        Okuma ve yazma ``BEGIN IMMEDIATE`` ile tek transaction içinde yapılır;
+        aynı anahtarı güncelleyen worker'lar birbirinin yazdığını ezmez.
+        Anahtar yoksa veya süresi dolduysa ``func`` None alır.
+        """
+        if self.path is None or ttl <= 0:
+            return None
+        conn = self.connection()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT value, expires_at FROM cache WHERE key = ?', (key,)
+                ).fetchone()
+                current = json.loads(row[0]) if row is not None and row[1] >= time.time() else None
+                value = func(current)
+                conn.execute(
+                    'INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(value), time.time() + ttl)
+                )
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        except sqlite3.Error as e:
+            print(f"Shared cache write error: {e}")
+            return None
+        return value
+
+    def get_many(self, *keys):
+        """Birden fazla anahtarı tek sorguda oku, ``{anahtar: değer}`` döndür"""
+        if self.path is None or not keys:
+            return {}
+        try:
+            rows = self.connection().execute(
+                'SELECT key, value FROM cache WHERE key IN (%s) AND expires_at >= ?'
+                % ', '.join('?' * len(keys)),
+                (*keys, time.time())
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Shared cache read error: {e}")
+            return {}
+        return {key: json.loads(value) for key, value in rows}
+
+    def delete(self, *keys):
+        """Anahtarları tüm worker'lar için geçersiz kıl"""
+        if self.path is None or not keys:
+            return
+        try:
+            self.connection().executemany(
+                'DELETE FROM cache WHERE key = ?', [(key,) for key in keys]
+            )
+        except sqlite3.Error as e:
+            print(f"Shared cache delete error: {e}")
+
+
+class LocalTTLCache:
+    """Process içi LRU + TTL cache
+
+    Değerler her worker'ın kendi belleğinde tutulur. ``invalidate`` ve
+    ``clear`` çağrıları paylaşılan cache'e bir zaman damgası yazar; diğer
+    worker'lar bu damgadan önce yüklenmiş kayıtlarını kullanmaz. Böylece
+    okuma veritabanına gitmeden yapılırken geçersiz kılma tüm worker'lara
+    yayılır.
+    """
+
+    def __init__(self, namespace, shared=None, size_key=None, ttl_key=None):
+        self.namespace = namespace
+        self.shared = shared
+        self.size_key = size_key
+        self.ttl_key = ttl_key
+        self.maxsize = 0
+        self.ttl = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.maxsize = app.config.get(self.size_key, 1024)
+        self.ttl = app.config.get(self.ttl_key, 60)
+        app.extensions[f'{self.namespace}_cache'] = self
+
+    def _marker_keys(self, key):
+        return f'{self.namespace}:invalidated:{key}', f'{self.namespace}:cleared'
+
+    def get(self, key):
+        """Kayıtlı değeri döndür; yoksa, süresi dolduysa veya geçersiz kılındıysa None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, loaded_at = entry
+            if loaded_at + self.ttl < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+        if self.shared is not None:
+            markers = self.shared.get_many(*self._marker_keys(key))
+            if any(marker >= loaded_at for marker in markers.values()):
+                with self._lock:
+                    self._entries.pop(key, None)
+                return None
+        return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys):
+        """Anahtarları bu worker'da sil ve diğer worker'lar için işaretle"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        if self.shared is not None:
+            now = time.time()
+            for key in keys:
+                self.shared.set(self._marker_keys(key)[0], now, self.ttl)
+
+    def clear(self):
+        """Tüm kayıtları bu worker'da sil ve diğer worker'lar için işaretle"""
+        with self._lock:
+            self._entries.clear()
+        if self.shared is not None:
+            self.shared.set(f'{self.namespace}:cleared', time.time(), self.ttl)
@@ -0,0 +1,365 @@
+import click
+
+from app import db
+
+
+def register_commands(app):
+    """Register Flask CLI commands for the application"""
+
+    @app.cli.command('init-db')
+    def init_db():
+        """Şemayı migration'larla oluştur/güncelle, varsayılan admin'i ve arama indeksini hazırla
+
+        Deploy sırasında worker'lar başlamadan önce bir kez çalıştırılır;
+        tekrar çalıştırmak güvenlidir. Uygulama açılışta şemaya dokunmaz.
+        """
+        from flask_migrate import upgrade
+        from app import create_default_admin
+        from app.search import create_search_index
+
+        upgrade()
+        create_default_admin()
+        backend = create_search_index(app)
+        click.echo(f"✅ Veritabanı hazır (öğrenci arama yöntemi: {backend}).")
+
+    @app.cli.command('rebuild-balances')
+    def rebuild_balances():
+        """Kurs kayıtlarının bakiye kolonlarını ödemelerden yeniden hesapla"""
+        from app.models.course import CourseEnrollment
+
+        updated = CourseEnrollment.rebuild_balances()
+        db.session.commit()
+        click.echo(f"✅ {updated} kayıt bakiyesi yeniden hesaplandı.")
+
+    @app.cli.command('check-balances')
+    def check_balances():
+        """Saklanan bakiyeleri ödemelerle karşılaştır, uyuşmazlık varsa hata ile çık"""
+        from app.models.course import CourseEnrollment
+
+        mismatches = CourseEnrollment.find_balance_mismatches()
+        if not mismatches:
+            click.echo("✅ Tüm bakiyeler tutarlı.")
+            return
+
+        for enrollment_id, paid_total, expected_paid, remaining, expected_remaining in mismatches:
+            click.echo(
+                f"❌ Kayıt {enrollment_id}: ödenen {paid_total} (beklenen {expected_paid}), "
+                f"kalan {remaining} (beklenen {expected_remaining})"
+            )
+        click.echo(f"{len(mismatches)} tutarsız kayıt bulundu. Düzeltmek için: flask rebuild-balances")
+        raise SystemExit(1)
+
+    @app.cli.command('check-integrity')
+    def check_integrity():
+        """Yabancı anahtarları, arama indeksini ve emoji sayaçlarını kontrol et"""
+        from app.admin.deletes import find_orphans
+
+        problems = find_orphans()
+        if not problems:
+            click.echo("✅ Referans bütünlüğü sağlanıyor.")
+            return
+
+        for description, count in problems:
+            click.echo(f"❌ {description}: {count} satır")
+        raise SystemExit(1)
+
+    @app.cli.command('check-query-plans')
+    @click.option('--verbose', is_flag=True, help='Tam tarama yapan sorguların SQL ve planlarını yazdır')
+    def check_query_plans(verbose):
+        """Sık kullanılan sayfaların sorgu planlarında tam tablo taraması ara
+
+        Sayfalar test istemcisiyle çağrılır, çalışan SELECT'ler EXPLAIN ile
+        incelenir; index kullanmayan bir sorgu varsa hata ile çıkılır. Anlamlı
+        sonuç için veritabanında kurs, kayıt ve öğrenci bulunmalıdır.
+        """
+        from app.query_plans import capture_queries, find_full_scans, hot_requests
+
+        captured = capture_queries(hot_requests())
+        problems = find_full_scans(captured)
+        click.echo(f"{len(captured)} sorgu, {len({statement for _, statement, _ in captured})} farklı plan incelendi.")
+        if not problems:
+            click.echo("✅ Tam tablo taraması yapan sorgu yok.")
+            return
+
+        for url, statement, scans, plan in problems:
+            click.echo(f"❌ {url}: {', '.join(scans)} tablosu taranıyor")
+            if verbose:
+                click.echo(f"   {statement}")
+                for line in plan:
+                    click.echo(f"   {line}")
+        raise SystemExit(1)
+
+    @app.cli.command('rebuild-reaction-counts')
+    def rebuild_reaction_counts():
+        """Duyuru emoji sayaçlarını tepkilerden yeniden oluştur"""
+        from app.models.course import CourseAnnouncement
+
+        rows = CourseAnnouncement.rebuild_reaction_counts()
+        db.session.commit()
+        click.echo(f"✅ {rows} emoji sayacı yeniden oluşturuldu.")
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index():
+        """Öğrenci arama indeksini tüm öğrencilerden yeniden oluştur"""
+        from app.search import rebuild_search_index as rebuild
+
+        indexed = rebuild()
+        click.echo(f"✅ {indexed} öğrenci arama indeksine eklendi.")
+
+    @app.cli.command('seed-data')
+    @click.option('--students', default=1000, show_default=True, help='Öğrenci sayısı')
+    @click.option('--courses', default=50, show_default=True, help='Kurs sayısı')
+    @click.option('--payments', default=10000, show_default=True, help='Ödeme (ekstre satırı) sayısı')
+    @click.option('--enrollments-per-student', default=3, show_default=True, help='Öğrenci başına ortalama kayıt')
+    @click.option('--announcements-per-course', default=3, show_default=True, help='Kurs başına ortalama duyuru')
+    @click.option('--assigned-ratio', default=0.7, show_default=True, help='Kurs kaydına atanan ödeme oranı')
+    @click.option('--seed', type=int, default=None, help='Tekrarlanabilir veri için rastgele tohum')
+    @click.option('--batch-size', default=10000, show_default=True, help='INSERT başına satır sayısı')
+    def seed_data(students, courses, payments, enrollments_per_student, announcements_per_course,
+                  assigned_ratio, seed, batch_size):
+        """Performans ölçümleri için sentetik öğrenci, kurs, ödeme ve duyuru verisi üret
+
+        Örnek: flask seed-data --students 50000 --courses 1000 --payments 1000000
+        Öğrenci şifreleri "ogrenci123"tür. Mevcut veriler silinmez.
+        """
+        import time
+        from app.seeding import DataSeeder
+
+        started_at = time.perf_counter()
+        seeder = DataSeeder(seed=seed, batch_size=batch_size, progress=lambda message: click.echo(
+            f"[{time.perf_counter() - started_at:7.1f}s] {message}"
+        ))
+        seeder.run(students, courses, payments, enrollments_per_student, announcements_per_course, assigned_ratio)
+        click.echo(f"✅ Veri üretildi ({time.perf_counter() - started_at:.1f}s).")
+
+    @app.cli.command('benchmark-routes')
+    @click.option('--iterations', default=20, show_default=True, help='Route başına istek sayısı')
+    @click.option('--route', 'routes', multiple=True, help='Yalnızca adı bu metni içeren route\'lar')
+    @click.option('--baseline', 'baseline_path', type=click.Path(dir_okay=False), default=None,
+                  help='Baseline dosyası (varsayılan: instance/route-benchmark.json)')
+    @click.option('--save-baseline', is_flag=True, help='Sonuçları baseline olarak kaydet')
+    @click.option('--tolerance', default=0.5, show_default=True, help='p50 gecikmesinde izin verilen artış oranı')
+    def benchmark_routes(iterations, routes, baseline_path, save_baseline, tolerance):
+        """Sık kullanılan sayfaların gecikme yüzdeliklerini ve SQL sorgu sayılarını ölç
+
+        Sayfalar test istemcisiyle çağrılır. Baseline varsa sonuçlar onunla
+        karşılaştırılır; sorgu sayısı artan veya p50'si tolerans dışında
+        yavaşlayan route varsa hata ile çıkılır. Veri için: flask seed-data
+        """
+        import os
+        from app.benchmarks import (
+            benchmark_routes as run, compare_to_baseline, load_baseline, route_name,
+            save_baseline as save, table_counts
+        )
+        from app.query_plans import hot_requests
+
+        baseline_path = baseline_path or os.path.join(app.instance_path, 'route-benchmark.json')
+        requests = [
+            (role, url) for role, url in hot_requests()
+            if not routes or any(route in route_name(url) for route in routes)
+        ]
+        counts = table_counts()
+        click.echo(', '.join(f"{table}: {count}" for table, count in counts.items() if count))
+        click.echo(f"{'route':<48} {'p50':>8} {'p95':>8} {'max':>8} {'sorgu':>6}")
+
+        def report(name, result):
+            status = '' if result['status'] == 200 else f"  ⚠️  HTTP {result['status']}"
+            click.echo(
+                f"{name:<48} {result['p50_ms']:7.1f}ms {result['p95_ms']:7.1f}ms "
+                f"{result['max_ms']:7.1f}ms {result['queries']:6}{status}"
+            )
+
+        results = run(requests, iterations, progress=report)
+        failed = [name for name, result in results.items() if result['status'] != 200]
+
+        if save_baseline:
+            os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+            save(baseline_path, results, counts, iterations)
+            click.echo(f"💾 Baseline kaydedildi: {baseline_path}")
+        elif os.path.exists(baseline_path):
+            baseline = load_baseline(baseline_path)
+            if baseline.get('counts') != counts:
+                click.echo("⚠️  Baseline farklı bir veri hacminde ölçülmüş; karşılaştırma yanıltıcı olabilir.")
+            regressions = compare_to_baseline(results, baseline, tolerance)
+            for regression in regressions:
+                click.echo(f"❌ {regression}")
+            if not regressions:
+                click.echo(f"✅ Baseline'a göre gerileme yok ({baseline_path}).")
+            failed += regressions
+        else:
+            click.echo(f"ℹ️  Baseline yok; kaydetmek için --save-baseline ({baseline_path}).")
+
+        if failed:
+            raise SystemExit(1)
+
+    @app.cli.command('benchmark-screening')
+    @click.option('--fields', default=200, show_default=True, help='Form alanı sayısı')
+    @click.option('--size', default=4096, show_default=True, help='Alan başına karakter')
+    @click.option('--iterations', default=50, show_default=True, help='Tekrar sayısı')
+    @click.option('--markup', is_flag=True, help='Değerlere ön filtreyi geçen karakterler ekle (en kötü durum)')
+    def benchmark_screening(fields, size, iterations, markup):
+        """Form taramasının büyük gövdelerdeki hızını eski döngü ile karşılaştır"""
+        import time
+        from werkzeug.datastructures import MultiDict
+        from app.security import RequestScreen, SQL_PATTERNS, XSS_PATTERNS
+
+        filler = 'Lorem ipsum dolor sit amet, Çağrı Öztürk ödeme açıklaması 12345 '
+        if markup:
+            filler += '<b>a=b</b> saat: 10:30 '
+        value = (filler * (size // len(filler) + 1))[:size]
+        form = MultiDict([('csrf_token', 'IjY2ZDk0ZjE1YzQ4'), *((f'field{i}', value) for i in range(fields))])
+        total_bytes = sum(len(v.encode()) for v in form.values()) * iterations
+
+        def legacy(form):
+            # security_checks'in önceki hali
+            for pattern in list(SQL_PATTERNS):
+                if pattern in form.get('csrf_token', '').lower():
+                    return True
+            for key, value in form.items():
+                if isinstance(value, str):
+                    for pattern in list(XSS_PATTERNS):
+                        if pattern in value.lower():
+                            return True
+            return False
+
+        screen = RequestScreen()
+        for name, check in (('eski döngü', legacy), ('derlenmiş eşleştirici', screen.screen)):
+            started_at = time.perf_counter()
+            for _ in range(iterations):
+                check(form)
+            elapsed = time.perf_counter() - started_at
+            click.echo(
+                f"{name:>22}: {elapsed / iterations * 1000:8.2f} ms/istek, "
+                f"{total_bytes / elapsed / 1024 / 1024:8.1f} MB/s"
+            )
+
+    @app.cli.command('benchmark-boot')
+    @click.option('--runs', default=5, show_default=True, help='Ölçülecek yeni process sayısı')
+    def benchmark_boot(runs):
+        """Worker açılış süresini yeni Python process'lerinde ölç
+
+        Her çalıştırmada import + create_app süresi, ilk isteğin süresi ve
+        açılışta yüklenen ağır kütüphaneler raporlanır. Son kolon pandas,
+        openpyxl ve bs4'ün yükleme maliyetidir; bu maliyet artık yalnızca ilgili
+        içe/dışa aktarma endpoint'i ilk kullanıldığında ödenir.
+        """
+        import json
+        import os
+        import statistics
+        import subprocess
+        import sys
+
+        script = (
+            "import json, sys, time\n"
+            "started = time.perf_counter()\n"
+            "from app import create_app\n"
+            "app = create_app()\n"
+            "booted = time.perf_counter()\n"
+            "app.test_client().get('/auth/login')\n"
+            "served = time.perf_counter()\n"
+            "heavy = [name for name in ('pandas', 'openpyxl', 'bs4') if name in sys.modules]\n"
+            "import pandas, openpyxl, bs4\n"
+            "print(json.dumps({'boot': booted - started, 'first_request': served - booted, "
+            "'heavy': heavy, 'deferred': time.perf_counter() - served}))\n"
+        )
+        project_root = os.path.dirname(app.root_path)
+        results = []
+        for run in range(runs):
+            output = subprocess.run(
+                [sys.executable, '-c', script], cwd=project_root,
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results.append(result)
+            click.echo(
+                f"#{run + 1}: açılış {result['boot'] * 1000:7.1f}ms, ilk istek "
+                f"{result['first_request'] * 1000:6.1f}ms, açılışta yüklenen: "
+                f"{', '.join(result['heavy']) or '-'}, ertelenen yükleme {result['deferred'] * 1000:6.1f}ms"
+            )
+
+        click.echo(
+            f"medyan: açılış {statistics.median(r['boot'] for r in results) * 1000:.1f}ms, "
+            f"ilk istek {statistics.median(r['first_request'] for r in results) * 1000:.1f}ms, "
+            f"ertelenen {statistics.median(r['deferred'] for r in results) * 1000:.1f}ms"
+        )
+
+    @app.cli.command('benchmark-passwords')
+    @click.option('--method', 'methods', multiple=True,
+                  help='Denenecek hash yöntemi (birden fazla verilebilir)')
+    @click.option('--iterations', default=20, show_default=True, help='Yöntem başına doğrulama sayısı')
+    @click.option('--workers', default=3, show_default=True, help='Kapasite tahmini için worker sayısı')
+    def benchmark_passwords(methods, iterations, workers):
+        """Hash yöntemlerinin çekirdek başına saniyedeki giriş kapasitesini ölç
+
+        Girişin CPU maliyetinin neredeyse tamamı şifre doğrulamasıdır; her
+        yöntem tek thread'de ölçülür, yani sonuç bir çekirdeğin kapasitesidir.
+        """
+        import time
+        from app.passwords import hash_method, hash_password, normalize_method, verify_password
+
+        configured = hash_method()
+        methods = methods or (
+            'scrypt:32768:8:1', 'scrypt:16384:8:1', 'scrypt:8192:8:1',
+            'pbkdf2:sha256:600000', 'pbkdf2:sha256:260000'
+        )
+        candidates = list(dict.fromkeys([configured, *(normalize_method(method) for method in methods)]))
+
+        click.echo(f"{'yöntem':>22}  {'hash':>9}  {'doğrulama':>9}  {'giriş/s/çekirdek':>16}  {workers} worker")
+        for method in candidates:
+            started_at = time.perf_counter()
+            pwhash = hash_password('benchmark-sifre', method)
+            hash_time = time.perf_counter() - started_at
+
+            started_at = time.perf_counter()
+            for _ in range(iterations):
+                verify_password(pwhash, 'benchmark-sifre')
+            verify_time = (time.perf_counter() - started_at) / iterations
+
+            marker = ' (yapılandırılmış)' if method == configured else ''
+            click.echo(
+                f"{method:>22}  {hash_time * 1000:7.1f}ms  {verify_time * 1000:7.1f}ms  "
+                f"{1 / verify_time:16.1f}  {workers / verify_time:8.1f}/s{marker}"
+            )
+
+    @app.cli.command('send-outbox')
+    @click.option('--loop', is_flag=True, help='Kuyruğu sürekli izle (daemon)')
+    @click.option('--batch-size', type=int, default=None, help='Bir SMTP bağlantısında gönderilecek email sayısı')
+    def send_outbox(loop, batch_size):
+        """Email kuyruğundaki sırası gelmiş email'leri gönder"""
+        import time
+        from app.mailer import deliver_pending
+
+        while True:
+            totals = deliver_pending(batch_size)
+            if totals['claimed'] or not loop:
+                click.echo(
+                    f"✉️  {totals['sent']} gönderildi, {totals['retried']} tekrar denenecek, "
+                    f"{totals['failed']} başarısız ({totals['per_second']:.1f} email/s)"
+                )
+            if not loop:
+                break
+            time.sleep(app.config['MAIL_OUTBOX_INTERVAL'])
+            db.session.remove()
+
+    @app.cli.command('outbox-stats')
+    def outbox_stats():
+        """Email göndericisinin birikmiş gönderim istatistiklerini göster"""
+        from app.mailer import delivery_stats
+
+        stats = delivery_stats()
+        if stats is None:
+            click.echo('ℹ️  Henüz gönderim istatistiği yok.')
+            return
+
+        last = stats['last_batch']
+        click.echo(
+            f"✉️  {stats['batches']} grup: {stats['sent']} gönderildi, {stats['retried']} tekrar denenecek, "
+            f"{stats['failed']} başarısız"
+        )
+        click.echo(
+            f"⏱️  {stats['per_second']:.1f} email/s, kuyrukta ortalama bekleme {stats['avg_latency']:.2f}s"
+        )
+        click.echo(
+            f"🕒 Son grup ({last['finished_at']} UTC): {last['sent']}/{last['claimed']} gönderildi, "
+            f"{last['elapsed']:.2f}s"
+        )
@@ -0,0 +1,141 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, request, session
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from werkzeug.http import is_resource_modified
+
+from app import db, cache
+
+# Tablo sürüm damgaları bu süre sonra düşer; damganın yok olması da sürümü
+# değiştirdiği için yalnızca bir kez fazladan sayfa üretimine yol açar
+_VERSION_TTL = 7 * 86400
+
+
+def _version_key(table):
+    return f'table_version:{table}'
+
+
+def table_versions(*tables):
+    """Tabloların son yazma zamanları (commit edilen değişikliklerden)"""
+    stamps = cache.get_many(*(_version_key(table) for table in tables))
+    return [stamps.get(_version_key(table)) for table in tables]
+
+
+def bump_table_versions(*tables):
+    """Tabloların sürümünü tüm worker'lar için ilerlet"""
+    now = time.time()
+    for table in tables:
+        cache.set(_version_key(table), now, _VERSION_TTL)
+
+
+def mark_tables_written(session, *tables):
+    """Tabloları commit sonrası sürümü ilerletilecekler arasına ekle
+
+    ORM'den geçmeyen yazmalar (ör. mapper olaylarında ``connection.execute``)
+    aşağıdaki dinleyicilere görünmez; bu yazmaları yapan kod tabloları
+    kendisi bildirir.
+    """
+    if session is not None:
+        session.info.setdefault('written_tables', set()).update(tables)
+
+
+def watermark(model, *criteria):
+    """Satır kümesinin su seviyesi: satır sayısı, en büyük id ve (varsa) en son ``updated_at``
+
+    Yeni ve silinen satırları ucuz bir aggregate ile yakalar; ``updated_at``
+    kolonu olmayan tablolardaki yerinde güncellemeler tablo sürümleriyle
+    yakalanır.
+    """
+    columns = [db.func.count(model.id), db.func.max(model.id)]
+    if hasattr(model, 'updated_at'):
+        columns.append(db.func.max(model.updated_at))
+    return db.select(*columns).where(*criteria).subquery()
+
+
+def conditional_get(*tables, watermarks=None):
+    """Değişmemiş sayfa için sorgu çalıştırmadan ``304 Not Modified`` döndür
+
+    Sayfanın sürümü; bağlı olduğu tabloların yazma damgaları, ``watermarks``
+    fonksiyonunun (view argümanlarıyla çağrılır) döndürdüğü alt sorguların tek
+    satırlık birleşimi, url, kullanıcı ve oturumun CSRF anahtarından oluşan
+    zayıf bir ETag'dir. Sayfa en fazla ``CONDITIONAL_GET_MAX_AGE`` saniye
+    doğrulanır; sonra CSRF token'ı ve zamana bağlı içerik tazelensin diye
+    yeniden üretilir. Bekleyen flash mesajı varsa doğrulama yapılmaz.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if (request.method not in ('GET', 'HEAD') or '_flashes' in session
+                    or not current_app.config.get('CONDITIONAL_GET_ENABLED', True)):
+                return view(*args, **kwargs)
+
+            stamps = table_versions(*tables)
+            marks = []
+            if watermarks is not None:
+                # Her alt sorgu tek satır döndürür; birleşim tek satırlık tek sorgudur
+                subqueries = watermarks(*args, **kwargs)
+                joined = subqueries[0]
+                for subquery in subqueries[1:]:
+                    joined = joined.join(subquery, db.true())
+                marks = list(db.session.execute(db.select(*subqueries).select_from(joined)).one())
+
+            max_age = current_app.config.get('CONDITIONAL_GET_MAX_AGE', 300)
+            parts = (request.full_path, current_user.get_id(), session.get('csrf_token'),
+                     int(time.time() // max_age), stamps, marks)
+            etag = hashlib.sha1(repr(parts).encode()).hexdigest()
+
+            # Damgalar epoch saniyesi, updated_at değerleri naive UTC
+            times = [datetime.fromtimestamp(stamp, timezone.utc) for stamp in stamps if stamp]
+            times += [mark.replace(tzinfo=timezone.utc) for mark in marks if isinstance(mark, datetime)]
+            last_modified = max(times).replace(microsecond=0) if times else None
+
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            # Tarayıcı her seferinde doğrulasın; sayfa kullanıcıya özel
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Cookie')
+            return response
+        return wrapper
+    return decorator
+
+
+@event.listens_for(Session, 'before_flush')
+def _track_flushed_tables(session, flush_context, instances):
+    tables = {type(obj).__table__.name for obj in (*session.new, *session.dirty, *session.deleted)
+              if getattr(type(obj), '__table__', None) is not None}
+    mark_tables_written(session, *tables)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_tables(orm_execute_state):
+    # Toplu INSERT/UPDATE/DELETE ifadeleri flush'tan geçmez
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if table is not None and getattr(table, 'name', None):
+        mark_tables_written(orm_execute_state.session, table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_after_commit(session):
+    tables = session.info.pop('written_tables', None)
+    if tables:
+        bump_table_versions(*tables)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _reset_after_rollback(session):
+    session.info.pop('written_tables', None)
@@ -0,0 +1,158 @@
+import heapq
+import re
+import sys
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Aynı sorgunun farklı parametrelerle tekrarları aynı "şekil" sayılır;
+# genişletilmiş IN listeleri (?, ?, ...) tek yer tutucuya indirgenir
+_PLACEHOLDER_LIST_RE = re.compile(r'\(\s*(?:\?|%\(\w+\)s|%s)(?:\s*,\s*(?:\?|%\(\w+\)s|%s))*\s*\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def statement_shape(statement):
+    """SQL ifadesini parametrelerden bağımsız karşılaştırma anahtarına çevir"""
+    return _WHITESPACE_RE.sub(' ', _PLACEHOLDER_LIST_RE.sub('(?)', statement)).strip()
+
+
+def query_origin():
+    """Sorguyu tetikleyen şablon satırını (yoksa uygulama kodu satırını) bul
+
+    Jinja derlenmiş şablon kodunu ``__jinja_template__`` global'i ile işaretler;
+    şablon satırı buradan çözülür. Şablon dışından gelen sorgularda bu modül
+    dışındaki ilk ``app`` paketi çerçevesi kullanılır.
+    """
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        template = frame.f_globals.get('__jinja_template__')
+        if template is not None:
+            return f'{template.name}:{template.get_corresponding_lineno(frame.f_lineno)}'
+        module = frame.f_globals.get('__name__', '')
+        if fallback is None and module.startswith('app.') and module != __name__:
+            fallback = f'{frame.f_code.co_filename}:{frame.f_lineno} ({frame.f_code.co_name})'
+        frame = frame.f_back
+    return fallback or 'bilinmiyor'
+
+
+class RequestQueryStats:
+    """Bir isteğin SQL istatistikleri"""
+
+    def __init__(self, slowest_limit, detect_repeats):
+        self.started_at = time.perf_counter()
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []  # (süre, ifade) min-heap, en yavaş ``slowest_limit`` tanesi
+        self.slow = []
+        self.slowest_limit = slowest_limit
+        self.shapes = {} if detect_repeats else None
+        self.repeats = {}  # şekil -> tetikleyen satır
+
+    def record(self, statement, duration, slow_threshold, repeat_threshold):
+        self.count += 1
+        self.duration += duration
+        item = (duration, statement)
+        if len(self.slowest) < self.slowest_limit:
+            heapq.heappush(self.slowest, item)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, item)
+        if duration >= slow_threshold:
+            self.slow.append(item)
+
+        if self.shapes is not None:
+            shape = statement_shape(statement)
+            seen = self.shapes.get(shape, 0) + 1
+            self.shapes[shape] = seen
+            # Yığın yalnızca eşik aşıldığı anda incelenir
+            if seen == repeat_threshold:
+                self.repeats[shape] = query_origin()
+
+
+class SQLInstrumentation:
+    """İstek başına SQL sorgu sayısı, toplam veritabanı süresi ve en yavaş sorgular
+
+    ``before/after_cursor_execute`` olaylarıyla her ifadenin süresi ölçülür ve
+    isteğin ``g`` nesnesinde toplanır. Sonuç ``Server-Timing`` başlığı olarak
+    döner (tarayıcı geliştirici araçlarında görünür); ``SQL_SLOW_QUERY_MS``'i
+    aşan ifadeler loglanır. ``SQL_NPLUS1_DETECTION`` açıksa aynı ifade
+    şeklinin bir istekte ``SQL_NPLUS1_THRESHOLD`` kez tekrarlanması N+1
+    şüphesi olarak, tetikleyen şablon satırıyla birlikte loglanır.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['sql_instrumentation'] = self
+        if not app.config.get('SQL_INSTRUMENTATION', True):
+            return
+
+        # Olaylar tüm engine'lere bir kez bağlanır; istek dışındaki sorgular
+        # (CLI, arka plan thread'leri) yok sayılır
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(Engine, 'handle_error', _handle_error)
+
+        @app.before_request
+        def start_query_stats():
+            g.sql_stats = RequestQueryStats(
+                app.config['SQL_SLOWEST_STATEMENTS'], app.config['SQL_NPLUS1_DETECTION']
+            )
+            g.sql_thresholds = (app.config['SQL_SLOW_QUERY_MS'] / 1000, app.config['SQL_NPLUS1_THRESHOLD'])
+
+        @app.after_request
+        def add_server_timing(response):
+            stats = g.get('sql_stats')
+            # Akış yanıtlarında başlıklar sorgular bitmeden gönderilir
+            if stats is not None and not response.is_streamed:
+                elapsed = (time.perf_counter() - stats.started_at) * 1000
+                timings = [
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} sorgu"',
+                    f'app;dur={elapsed:.1f}',
+                ]
+                if stats.slowest:
+                    timings.append(f'db-slowest;dur={max(stats.slowest)[0] * 1000:.1f}')
+                response.headers.add('Server-Timing', ', '.join(timings))
+            return response
+
+        # Akış yanıtlarında (CSV dışa aktarma) sorgular gövde gönderilirken de
+        # çalışır; loglar istek tamamen bittiğinde yazılır
+        @app.teardown_request
+        def log_query_stats(exc):
+            stats = g.pop('sql_stats', None)
+            if stats is None:
+                return
+            for duration, statement in stats.slow:
+                print(f"🐢 Yavaş sorgu ({duration * 1000:.1f}ms) {request.method} {request.path}: "
+                      f"{statement_shape(statement)[:500]}")
+            for shape, origin in stats.repeats.items():
+                print(f"⚠️  N+1 şüphesi {request.method} {request.path}: {stats.shapes[shape]} kez "
+                      f"aynı sorgu, {origin}: {shape[:300]}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'sql_stats' in g:
+        conn.info.setdefault('query_started_at', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started_at')
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    if has_request_context() and 'sql_stats' in g:
+        slow_threshold, repeat_threshold = g.sql_thresholds
+        g.sql_stats.record(statement, duration, slow_threshold, repeat_threshold)
+
+
+def _handle_error(exception_context):
+    # Hata veren ifade için after_cursor_execute çalışmaz; başlangıç zamanı
+    # sonraki ifadeye karışmasın
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_started_at'):
+        connection.info['query_started_at'].pop()
@@ -0,0 +1,275 @@
+import os
+import smtplib
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+from flask_mail import BadHeaderError, Connection, Message
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db, cache
+from app.models.outbox import OutboxEmail
+
+# Bu süreden uzun 'sending' durumunda kalan email'ler (ör. çöken gönderici)
+# tekrar sıraya alınır
+_STALE_CLAIM = timedelta(minutes=10)
+_MAX_RETRY_DELAY = 3600
+
+# Gönderim istatistikleri tüm worker'lar ve ``flask send-outbox`` için
+# ortak cache'te birikir
+_STATS_KEY = 'outbox:stats'
+_STATS_TTL = 30 * 86400
+_STATS_COUNTERS = ('batches', 'claimed', 'sent', 'retried', 'failed', 'elapsed', 'latency_total')
+
+
+def queue_email(subject, recipients, body=None, html=None):
+    """Email'i outbox'a ekle
+
+    Email istek içinde gönderilmez; commit edildikten sonra arka plan
+    göndericisi tarafından iletilir. Commit çağıranın sorumluluğundadır.
+    """
+    email = OutboxEmail(
+        subject=subject,
+        recipients=','.join(recipients),
+        body=body,
+        html=html
+    )
+    db.session.add(email)
+    db.session.info['outbox_queued'] = True
+    return email
+
+
+class OutboxConnection(Connection):
+    """Zaman aşımı tanımlı Flask-Mail SMTP bağlantısı
+
+    Flask-Mail'in bağlantısı zaman aşımı olmadan açılır; erişilemeyen bir
+    sunucu göndericiyi süresiz bekletmesin diye ``MAIL_TIMEOUT`` kullanılır.
+    """
+
+    def __init__(self, mail, timeout):
+        super().__init__(mail)
+        self.timeout = timeout
+
+    def configure_host(self):
+        smtp_class = smtplib.SMTP_SSL if self.mail.use_ssl else smtplib.SMTP
+        host = smtp_class(self.mail.server, self.mail.port, timeout=self.timeout)
+        host.set_debuglevel(int(self.mail.debug))
+
+        if self.mail.use_tls:
+            host.starttls()
+        if self.mail.username and self.mail.password:
+            host.login(self.mail.username, self.mail.password)
+        return host
+
+
+def claim_batch(batch_size):
+    """Gönderilecek email'leri bu gönderici için işaretle ve döndür
+
+    Seçim ve işaretleme tek bir UPDATE ile yapılır; PostgreSQL'de kilitli
+    satırlar atlandığı için birden fazla gönderici aynı email'i almaz.
+    """
+    token = uuid.uuid4().hex
+    now = datetime.utcnow()
+
+    candidates = db.select(OutboxEmail.id).where(db.or_(
+        db.and_(OutboxEmail.status == 'pending', OutboxEmail.next_attempt_at <= now),
+        db.and_(OutboxEmail.status == 'sending', OutboxEmail.claimed_at < now - _STALE_CLAIM)
+    )).order_by(OutboxEmail.next_attempt_at, OutboxEmail.id).limit(batch_size)
+    if db.session.get_bind().dialect.name == 'postgresql':
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    db.session.execute(
+        db.update(OutboxEmail).where(
+            OutboxEmail.id.in_(candidates.scalar_subquery())
+        ).values(status='sending', claim_token=token, claimed_at=now),
+        execution_options={'synchronize_session': False}
+    )
+    db.session.commit()
+    return OutboxEmail.query.filter_by(claim_token=token).order_by(OutboxEmail.id).all()
+
+
+def _schedule_retry(email, error, config):
+    """Başarısız gönderimi geri çekilme (backoff) ile tekrar sıraya al"""
+    email.attempts += 1
+    email.last_error = str(error)[:1000]
+    email.claim_token = None
+    if email.attempts >= config['MAIL_OUTBOX_MAX_ATTEMPTS']:
+        email.status = 'failed'
+        return
+
+    delay = min(config['MAIL_OUTBOX_RETRY_DELAY'] * 2 ** (email.attempts - 1), _MAX_RETRY_DELAY)
+    email.status = 'pending'
+    email.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+
+
+def deliver_batch(batch_size=None):
+    """Bir grup email'i tek bir SMTP bağlantısı üzerinden gönder
+
+    Sonuç olarak gönderim istatistiklerini döndürür: alınan, gönderilen,
+    tekrar denenecek ve kalıcı olarak başarısız olan email sayısı, geçen süre,
+    saniyedeki gönderim ve kuyrukta bekleme süresi ortalaması (saniye).
+    Boş olmayan grupların istatistikleri ortak cache'teki toplamlara da
+    eklenir (bkz. ``delivery_stats``).
+    """
+    config = current_app.config
+    emails = claim_batch(batch_size or config['MAIL_OUTBOX_BATCH_SIZE'])
+    stats = {'claimed': len(emails), 'sent': 0, 'retried': 0, 'failed': 0,
+             'elapsed': 0.0, 'per_second': 0.0, 'avg_latency': 0.0}
+    if not emails:
+        return stats
+
+    started_at = time.perf_counter()
+    try:
+        with OutboxConnection(current_app.extensions['mail'], config['MAIL_TIMEOUT']) as connection:
+            for email in emails:
+                message = Message(
+                    subject=email.subject,
+                    recipients=email.recipient_list,
+                    body=email.body,
+                    html=email.html
+                )
+                try:
+                    connection.send(message)
+                except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException,
+                        BadHeaderError, AssertionError) as e:
+                    # Bu email'e özgü hata; diğerleri aynı bağlantıyla devam eder.
+                    # Bağlantı hataları ise dışarıda tüm grubu tekrar sıraya alır.
+                    _schedule_retry(email, e, config)
+                    continue
+
+                email.status = 'sent'
+                email.sent_at = datetime.utcnow()
+                email.claim_token = None
+                email.last_error = None
+    except Exception as e:
+        print(f"Outbox SMTP error: {e}")
+        for email in emails:
+            if email.status == 'sending':
+                _schedule_retry(email, e, config)
+
+    db.session.commit()
+
+    sent = [email for email in emails if email.status == 'sent']
+    stats['sent'] = len(sent)
+    stats['failed'] = sum(1 for email in emails if email.status == 'failed')
+    stats['retried'] = stats['claimed'] - stats['sent'] - stats['failed']
+    stats['elapsed'] = time.perf_counter() - started_at
+    stats['per_second'] = stats['sent'] / stats['elapsed'] if stats['elapsed'] else 0.0
+    if sent:
+        stats['avg_latency'] = sum((email.sent_at - email.created_at).total_seconds() for email in sent) / len(sent)
+
+    record_delivery_stats(stats)
+    print(
+        f"Outbox: {stats['sent']} sent, {stats['retried']} retried, {stats['failed']} failed "
+        f"in {stats['elapsed']:.2f}s ({stats['per_second']:.1f}/s, avg queue latency {stats['avg_latency']:.2f}s)"
+    )
+    return stats
+
+
+def record_delivery_stats(stats):
+    """Bir grubun istatistiklerini ortak cache'teki toplamlara ekle"""
+    def merge(totals):
+        totals = totals or dict.fromkeys(_STATS_COUNTERS, 0)
+        totals['batches'] += 1
+        for key in ('claimed', 'sent', 'retried', 'failed', 'elapsed'):
+            totals[key] += stats[key]
+        totals['latency_total'] += stats['avg_latency'] * stats['sent']
+        totals['last_batch'] = dict(stats, finished_at=datetime.utcnow().isoformat())
+        return totals
+
+    return cache.update(_STATS_KEY, merge, _STATS_TTL)
+
+
+def delivery_stats():
+    """Birikmiş gönderim istatistiklerini döndür, kayıt yoksa None
+
+    Toplamlara ek olarak saniyedeki gönderim (``per_second``), kuyrukta
+    bekleme süresi ortalaması (``avg_latency``) ve son grubun istatistikleri
+    (``last_batch``) döner.
+    """
+    totals = cache.get(_STATS_KEY)
+    if totals is None:
+        return None
+    totals['per_second'] = totals['sent'] / totals['elapsed'] if totals['elapsed'] else 0.0
+    totals['avg_latency'] = totals['latency_total'] / totals['sent'] if totals['sent'] else 0.0
+    return totals
+
+
+def deliver_pending(batch_size=None):
+    """Sırası gelmiş tüm email'leri gruplar halinde gönder, toplam istatistikleri döndür"""
+    totals = {'claimed': 0, 'sent': 0, 'retried': 0, 'failed': 0, 'elapsed': 0.0}
+    batch_size = batch_size or current_app.config['MAIL_OUTBOX_BATCH_SIZE']
+    while True:
+        stats = deliver_batch(batch_size)
+        for key in totals:
+            totals[key] += stats[key]
+        # Kuyruk boşaldıysa veya SMTP sunucusuna ulaşılamıyorsa bekle
+        if stats['claimed'] < batch_size or not stats['sent']:
+            break
+    totals['per_second'] = totals['sent'] / totals['elapsed'] if totals['elapsed'] else 0.0
+    return totals
+
+
+class OutboxSender:
+    """Her worker process'inde çalışan arka plan email göndericisi
+
+    Thread ilk email kuyruğa eklendiğinde başlatılır, commit sonrası
+    uyandırılır ve ``MAIL_OUTBOX_INTERVAL`` saniyede bir tekrar denenecekleri
+    kontrol eder. ``MAIL_OUTBOX_THREAD`` kapatılırsa gönderim yalnızca
+    ``flask send-outbox --loop`` ile yapılır.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = None
+        self._pid = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['outbox_sender'] = self
+
+    def notify(self):
+        """Göndericiyi uyandır, gerekirse başlat"""
+        if self.app is None or not self.app.config.get('MAIL_OUTBOX_THREAD'):
+            return
+        with self._lock:
+            # fork sonrası thread yeni process'e taşınmaz
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='outbox-sender', daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        interval = self.app.config['MAIL_OUTBOX_INTERVAL']
+        while True:
+            with self.app.app_context():
+                try:
+                    deliver_pending()
+                except Exception as e:
+                    print(f"Outbox sender error: {e}")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            self._wake.wait(interval)
+            self._wake.clear()
+
+
+@event.listens_for(Session, 'after_commit')
+def _notify_sender(session):
+    if session.info.pop('outbox_queued', False) and has_app_context():
+        sender = current_app.extensions.get('outbox_sender')
+        if sender is not None:
+            sender.notify()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _reset_queued(session):
+    session.info.pop('outbox_queued', None)
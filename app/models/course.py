@@ -1,8 +1,19 @@
 from app import db
+from app.conditional import mark_tables_written
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from datetime import datetime
+from decimal import Decimal
 
 class Course(db.Model):
     __tablename__ = 'courses'
+    __table_args__ = (
+        # Kurs listesi created_at'e göre sıralanır; dashboard aktif kurs sayısı
+        db.Index('ix_courses_created_at', 'created_at'),
+        db.Index('ix_courses_is_active', 'is_active'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -31,22 +42,54 @@ class Course(db.Model):
     @property
     def total_completed_payment(self):
         """Tamamlanmış ödeme toplamı (sadece aktif kayıtlardan)"""
-        total = 0
-        for enrollment in self.enrollments:
-            if enrollment.is_active and enrollment.payments:
-                total += sum(float(payment.amount) for payment in enrollment.payments)
-        return total
+        return sum(enrollment.total_paid for enrollment in self.enrollments if enrollment.is_active)
     
     @property
     def pending_payment(self):
         """Bekleyen ödeme (toplam beklenen - tamamlanmış)"""
         return self.total_expected_payment - self.total_completed_payment
 
+    @classmethod
+    def financial_summaries(cls, course_ids):
+        """Verilen kursların finansal özetlerini tek bir gruplu sorgu ile döndür
+
+        Sonuç ``{course_id: {'expected', 'completed', 'pending', 'student_count'}}``
+        şeklindedir ve ``total_expected_payment``, ``total_completed_payment`` ile
+        ``pending_payment`` property'leri ile aynı değerleri üretir.
+        """
+        course_ids = list(course_ids)
+        if not course_ids:
+            return {}
+
+        rows = db.session.query(
+            cls.id,
+            cls.price,
+            db.func.count(CourseEnrollment.id),
+            db.func.coalesce(db.func.sum(CourseEnrollment.paid_total), 0)
+        ).outerjoin(
+            CourseEnrollment,
+            db.and_(CourseEnrollment.course_id == cls.id, CourseEnrollment.is_active == True)
+        ).filter(
+            cls.id.in_(course_ids)
+        ).group_by(cls.id, cls.price).all()
+
+        summaries = {}
+        for course_id, price, student_count, completed in rows:
+            expected = student_count * float(price)
+            completed = float(completed)
+            summaries[course_id] = {
+                'expected': expected,
+                'completed': completed,
+                'pending': expected - completed,
+                'student_count': student_count
+            }
+        return summaries
+
 class CourseSchedule(db.Model):
     __tablename__ = 'course_schedules'
     
     id = db.Column(db.Integer, primary_key=True)
-    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False, index=True)
     day_of_week = db.Column(db.String(20), nullable=False)  # Monday, Tuesday, etc.
     start_time = db.Column(db.Time, nullable=False)
     end_time = db.Column(db.Time, nullable=False)
@@ -58,6 +101,12 @@ class CourseSchedule(db.Model):
 class CourseEnrollment(db.Model):
     """Kursa kayıtlı öğrenciler"""
     __tablename__ = 'course_enrollments'
+    __table_args__ = (
+        # Kursun aktif öğrencileri ve anti-join'ler (course_id, is_active, student_id)
+        db.Index('ix_course_enrollments_course_active_student', 'course_id', 'is_active', 'student_id'),
+        # Öğrencinin aktif kursları ve öğrenci silme
+        db.Index('ix_course_enrollments_student_active_course', 'student_id', 'is_active', 'course_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
@@ -65,6 +114,9 @@ class CourseEnrollment(db.Model):
     enrolled_at = db.Column(db.DateTime, default=datetime.utcnow)
     enrolled_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # Admin who enrolled
     is_active = db.Column(db.Boolean, default=True)
+    # Bakiye defteri: CoursePayment ve Course.price olayları ile güncel tutulur
+    paid_total = db.Column(db.Numeric(10, 2), nullable=False, default=0, server_default='0')
+    remaining = db.Column(db.Numeric(10, 2), nullable=False, default=0, server_default='0')
     
     # Relationships
     student = db.relationship('User', foreign_keys=[student_id])
@@ -77,20 +129,110 @@ class CourseEnrollment(db.Model):
     @property
     def total_paid(self):
         """Bu öğrencinin bu kurs için ödediği toplam tutar"""
-        return sum(float(payment.amount) for payment in self.payments)
+        return float(self.paid_total or 0)
     
     @property
     def remaining_payment(self):
         """Bu öğrencinin bu kurs için kalan ödeme tutarı"""
-        return float(self.course.price) - self.total_paid
+        return float(self.remaining or 0)
+    
+    @classmethod
+    def balance_update_statement(cls):
+        """paid_total/remaining kolonlarını ödemelerden yeniden hesaplayan UPDATE"""
+        paid = db.select(
+            db.func.coalesce(db.func.sum(CoursePayment.amount), 0)
+        ).where(CoursePayment.enrollment_id == cls.id).scalar_subquery()
+        price = db.select(Course.price).where(Course.id == cls.course_id).scalar_subquery()
+        return db.update(cls.__table__).values(paid_total=paid, remaining=price - paid)
+    
+    @classmethod
+    def rebuild_balances(cls, enrollment_ids=None):
+        """Bakiye kolonlarını toplu olarak yeniden hesapla, etkilenen satır sayısını döndür"""
+        stmt = cls.balance_update_statement()
+        if enrollment_ids is not None:
+            enrollment_ids = list(enrollment_ids)
+            if not enrollment_ids:
+                return 0
+            stmt = stmt.where(cls.__table__.c.id.in_(enrollment_ids))
+        return db.session.execute(stmt).rowcount
+    
+    @classmethod
+    def bulk_enroll(cls, course, student_ids, enrolled_by):
+        """Öğrencileri kursa toplu olarak kaydet, kaydedilen öğrenci id'lerini döndür
+
+        Aktif öğrenci olup kursa aktif kaydı bulunmayanlar tek bir anti-join
+        sorgusuyla bulunur, geri kalanlar tek bir toplu INSERT ile eklenir.
+        Toplu INSERT mapper olaylarını çalıştırmadığı için bakiye kolonları
+        burada kurs ücretiyle başlatılır. Commit çağıranın sorumluluğundadır.
+        """
+        from app.models.user import User
+
+        student_ids = {int(student_id) for student_id in student_ids}
+        if not student_ids:
+            return []
+
+        new_ids = db.session.scalars(
+            db.select(User.id).outerjoin(cls, db.and_(
+                cls.student_id == User.id,
+                cls.course_id == course.id,
+                cls.is_active == True
+            )).where(
+                User.id.in_(student_ids),
+                User.role == 'student',
+                User.is_active == True,
+                cls.id.is_(None)
+            ).order_by(User.id)
+        ).all()
+
+        if new_ids:
+            now = datetime.utcnow()
+            db.session.execute(db.insert(cls), [{
+                'course_id': course.id,
+                'student_id': student_id,
+                'enrolled_by': enrolled_by,
+                'enrolled_at': now,
+                'is_active': True,
+                'paid_total': 0,
+                'remaining': course.price or 0
+            } for student_id in new_ids])
+        return new_ids
+
+    @classmethod
+    def find_balance_mismatches(cls):
+        """Saklanan bakiyesi ödemelerle uyuşmayan kayıtları döndür
+
+        Her satır ``(enrollment_id, paid_total, expected_paid, remaining, expected_remaining)``
+        şeklindedir.
+        """
+        paid = db.select(
+            CoursePayment.enrollment_id,
+            db.func.sum(CoursePayment.amount).label('amount')
+        ).group_by(CoursePayment.enrollment_id).subquery()
+        expected_paid = db.func.coalesce(paid.c.amount, 0)
+        expected_remaining = Course.price - expected_paid
+
+        return db.session.query(
+            cls.id,
+            cls.paid_total,
+            expected_paid,
+            cls.remaining,
+            expected_remaining
+        ).join(
+            Course, Course.id == cls.course_id
+        ).outerjoin(
+            paid, paid.c.enrollment_id == cls.id
+        ).filter(db.or_(
+            cls.paid_total != expected_paid,
+            cls.remaining != expected_remaining
+        )).order_by(cls.id).all()
 
 class CoursePayment(db.Model):
     """Kurs ödemeleri"""
     __tablename__ = 'course_payments'
     
     id = db.Column(db.Integer, primary_key=True)
-    enrollment_id = db.Column(db.Integer, db.ForeignKey('course_enrollments.id'), nullable=False)
-    payment_id = db.Column(db.Integer, db.ForeignKey('payments.id'), nullable=True)  # Genel ödeme ile bağlantı
+    enrollment_id = db.Column(db.Integer, db.ForeignKey('course_enrollments.id'), nullable=False, index=True)
+    payment_id = db.Column(db.Integer, db.ForeignKey('payments.id'), nullable=True, index=True)  # Genel ödeme ile bağlantı
     amount = db.Column(db.Numeric(10, 2), nullable=False)
     payment_date = db.Column(db.Date, nullable=False)
     payment_method = db.Column(db.String(50))  # nakit, kart, havale vb.
@@ -108,6 +250,10 @@ class CoursePayment(db.Model):
 class CourseAnnouncement(db.Model):
     """Kurs duyuruları"""
     __tablename__ = 'course_announcements'
+    __table_args__ = (
+        # Kursun duyuruları yeniden eskiye sıralanır
+        db.Index('ix_course_announcements_course_created', 'course_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
@@ -120,17 +266,97 @@ class CourseAnnouncement(db.Model):
     # Relationships
     creator = db.relationship('User', foreign_keys=[created_by])
     reactions = db.relationship('AnnouncementReaction', backref='announcement', cascade='all, delete-orphan')
+    reaction_counters = db.relationship('AnnouncementReactionCount', cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<CourseAnnouncement {self.title} - {self.course.name}>'
 
+    @classmethod
+    def for_courses(cls, course_ids):
+        """Verilen kursların duyurularını yazarlarıyla birlikte tek sorguda getir
+
+        Sonuç ``{course_id: [duyuru, ...]}`` şeklindedir, duyurular yeniden
+        eskiye sıralıdır. ``Course.announcements`` ilişkisine dokunulmaz.
+        """
+        from app.models.user import User
+
+        course_ids = list(course_ids)
+        result = {course_id: [] for course_id in course_ids}
+        if not course_ids:
+            return result
+
+        announcements = cls.query.options(
+            joinedload(cls.creator).joinedload(User.admin_profile),
+            joinedload(cls.creator).joinedload(User.student_profile)
+        ).filter(
+            cls.course_id.in_(course_ids)
+        ).order_by(cls.created_at.desc(), cls.id.desc()).all()
+
+        for announcement in announcements:
+            result[announcement.course_id].append(announcement)
+        return result
+
+    @classmethod
+    def reaction_counts(cls, announcement_ids):
+        """Duyuruların emoji sayılarını sayaç tablosundan tek sorguda döndür
+
+        Sonuç ``{announcement_id: [(emoji, adet), ...]}`` şeklindedir; emojiler
+        çoktan aza sıralıdır. Tepki satırları taranmaz.
+        """
+        announcement_ids = list(announcement_ids)
+        result = {announcement_id: [] for announcement_id in announcement_ids}
+        if not announcement_ids:
+            return result
+
+        rows = db.session.query(
+            AnnouncementReactionCount.announcement_id,
+            AnnouncementReactionCount.emoji,
+            AnnouncementReactionCount.count
+        ).filter(
+            AnnouncementReactionCount.announcement_id.in_(announcement_ids),
+            AnnouncementReactionCount.count > 0
+        ).order_by(
+            AnnouncementReactionCount.count.desc(), AnnouncementReactionCount.emoji
+        ).all()
+
+        for announcement_id, emoji, count in rows:
+            result[announcement_id].append((emoji, count))
+        return result
+
+    @classmethod
+    def rebuild_reaction_counts(cls, announcement_ids=None):
+        """Emoji sayaçlarını tepki tablosundan yeniden oluştur, sayaç satırı sayısını döndür
+
+        ``announcement_ids`` (id listesi veya id döndüren select) verilirse
+        yalnızca bu duyuruların sayaçları yenilenir.
+        """
+        delete = db.delete(AnnouncementReactionCount)
+        counts = db.select(
+            AnnouncementReaction.announcement_id,
+            AnnouncementReaction.emoji,
+            db.func.count(AnnouncementReaction.id)
+        ).group_by(AnnouncementReaction.announcement_id, AnnouncementReaction.emoji)
+        if announcement_ids is not None:
+            delete = delete.where(AnnouncementReactionCount.announcement_id.in_(announcement_ids))
+            counts = counts.where(AnnouncementReaction.announcement_id.in_(announcement_ids))
+
+        db.session.execute(delete)
+        result = db.session.execute(
+            db.insert(AnnouncementReactionCount).from_select(['announcement_id', 'emoji', 'count'], counts)
+        )
+        return result.rowcount
+
 class AnnouncementReaction(db.Model):
     """Duyuru emoji tepkileri"""
     __tablename__ = 'announcement_reactions'
+    __table_args__ = (
+        # Her öğrencinin bir duyuruya tek tepkisi olabilir
+        db.UniqueConstraint('announcement_id', 'student_id', name='uq_announcement_reactions_announcement_student'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     announcement_id = db.Column(db.Integer, db.ForeignKey('course_announcements.id'), nullable=False)
-    student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     emoji = db.Column(db.String(10), nullable=False)  # Emoji karakteri (👍, ❤️, 😊, vb.)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -138,4 +364,152 @@ class AnnouncementReaction(db.Model):
     student = db.relationship('User', foreign_keys=[student_id])
     
     def __repr__(self):
-        return f'<AnnouncementReaction {self.emoji} - {self.student.email}>' 
\ No newline at end of file
+        return f'<AnnouncementReaction {self.emoji} - {self.student.email}>'
+
+    @classmethod
+    def react(cls, announcement_id, student_id, emoji):
+        """Öğrencinin tepkisini ekle veya değiştir ve emoji sayaçlarını güncelle
+
+        Tepki tek bir ``INSERT ... ON CONFLICT DO UPDATE`` ifadesiyle yazılır;
+        sayaçlar aynı transaction içinde artırılıp azaltılır. Eski emoji
+        okunmadan önce duyuru satırına boş bir UPDATE yapılır: bu ilk yazma
+        SQLite'ta veritabanının yazma kilidini, PostgreSQL'de satır kilidini
+        alır; böylece aynı duyuruya eşzamanlı tepkiler sırayla işlenir ve
+        sayaçları kaydırmaz. Commit çağıranın sorumluluğundadır.
+        """
+        # SQLite ``FOR UPDATE`` desteklemez ve SELECT için transaction
+        # başlatmaz; kilit, eski emoji okunmadan önce bir yazmayla alınır
+        db.session.execute(
+            db.update(CourseAnnouncement).where(CourseAnnouncement.id == announcement_id)
+            .values(id=CourseAnnouncement.id),
+            execution_options={'synchronize_session': False}
+        )
+        previous = db.session.execute(
+            db.select(cls.emoji).where(cls.announcement_id == announcement_id, cls.student_id == student_id)
+        ).scalar()
+        if previous == emoji:
+            return
+
+        values = {
+            'announcement_id': announcement_id,
+            'student_id': student_id,
+            'emoji': emoji,
+            'created_at': datetime.utcnow()
+        }
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+            stmt = insert(cls).values(**values)
+            db.session.execute(stmt.on_conflict_do_update(
+                index_elements=['announcement_id', 'student_id'],
+                set_={'emoji': stmt.excluded.emoji, 'created_at': stmt.excluded.created_at}
+            ))
+        elif previous is None:
+            db.session.execute(db.insert(cls).values(**values))
+        else:
+            db.session.execute(db.update(cls).where(
+                cls.announcement_id == announcement_id, cls.student_id == student_id
+            ).values(emoji=emoji, created_at=values['created_at']))
+
+        if previous is not None:
+            AnnouncementReactionCount.adjust(announcement_id, previous, -1)
+        AnnouncementReactionCount.adjust(announcement_id, emoji, 1)
+
+
+class AnnouncementReactionCount(db.Model):
+    """Duyuru başına emoji sayaçları (AnnouncementReaction.react ile güncellenir)"""
+    __tablename__ = 'announcement_reaction_counts'
+
+    announcement_id = db.Column(db.Integer, db.ForeignKey('course_announcements.id'), primary_key=True)
+    emoji = db.Column(db.String(10), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<AnnouncementReactionCount {self.emoji} x{self.count}>'
+
+    @classmethod
+    def adjust(cls, announcement_id, emoji, delta):
+        """Sayacı ``delta`` kadar değiştir; sıfıra düşen sayaç silinir"""
+        dialect = db.session.get_bind().dialect.name
+        if delta > 0 and dialect in ('sqlite', 'postgresql'):
+            insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+            stmt = insert(cls).values(announcement_id=announcement_id, emoji=emoji, count=delta)
+            db.session.execute(stmt.on_conflict_do_update(
+                index_elements=['announcement_id', 'emoji'],
+                set_={'count': cls.count + stmt.excluded.count}
+            ))
+            return
+
+        updated = db.session.execute(db.update(cls).where(
+            cls.announcement_id == announcement_id, cls.emoji == emoji
+        ).values(count=cls.count + delta)).rowcount
+        if not updated and delta > 0:
+            db.session.execute(db.insert(cls).values(announcement_id=announcement_id, emoji=emoji, count=delta))
+        elif delta < 0:
+            db.session.execute(db.delete(cls).where(
+                cls.announcement_id == announcement_id, cls.emoji == emoji, cls.count <= 0
+            ))
+
+
+def _refresh_enrollment_balance(connection, session, enrollment_id):
+    """Tek bir kaydın bakiyesini flush içinde yeniden hesapla"""
+    table = CourseEnrollment.__table__
+    connection.execute(
+        CourseEnrollment.balance_update_statement().where(table.c.id == enrollment_id)
+    )
+    # Bakiye ORM dışında yazılır; kayıtları gösteren sayfaların ETag'i değişsin
+    mark_tables_written(session, table.name)
+
+    # Oturumdaki nesneyi de güncel değerlerle eşitle
+    enrollment = session.identity_map.get(session.identity_key(CourseEnrollment, enrollment_id)) if session else None
+    if enrollment is not None:
+        paid_total, remaining = connection.execute(
+            db.select(table.c.paid_total, table.c.remaining).where(table.c.id == enrollment_id)
+        ).one()
+        set_committed_value(enrollment, 'paid_total', paid_total)
+        set_committed_value(enrollment, 'remaining', remaining)
+
+
+@event.listens_for(CourseEnrollment, 'before_insert')
+def _init_enrollment_balance(mapper, connection, target):
+    if target.paid_total is None:
+        target.paid_total = 0
+    price = connection.scalar(db.select(Course.price).where(Course.id == target.course_id))
+    target.remaining = (price or 0) - target.paid_total
+
+
+@event.listens_for(CoursePayment, 'after_insert')
+@event.listens_for(CoursePayment, 'after_delete')
+def _payment_changed(mapper, connection, target):
+    _refresh_enrollment_balance(connection, inspect(target).session, target.enrollment_id)
+
+
+@event.listens_for(CoursePayment, 'after_update')
+def _payment_updated(mapper, connection, target):
+    state = inspect(target)
+    if not (state.attrs.amount.history.has_changes() or state.attrs.enrollment_id.history.has_changes()):
+        return
+    enrollment_ids = {target.enrollment_id, *state.attrs.enrollment_id.history.deleted}
+    for enrollment_id in enrollment_ids - {None}:
+        _refresh_enrollment_balance(connection, state.session, enrollment_id)
+
+
+@event.listens_for(Course, 'after_update')
+def _course_price_changed(mapper, connection, target):
+    if not inspect(target).attrs.price.history.has_changes():
+        return
+    price = Decimal(str(target.price))
+    table = CourseEnrollment.__table__
+    connection.execute(
+        db.update(table).where(table.c.course_id == target.id).values(
+            remaining=price - table.c.paid_total
+        )
+    )
+
+    # Oturumda yüklü kayıtları da eşitle
+    session = inspect(target).session
+    mark_tables_written(session, table.name)
+    if session is not None:
+        for obj in list(session.identity_map.values()):
+            if isinstance(obj, CourseEnrollment) and obj.course_id == target.id and obj.paid_total is not None:
+                set_committed_value(obj, 'remaining', price - obj.paid_total)
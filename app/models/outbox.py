@@ -0,0 +1,35 @@
+from app import db
+from datetime import datetime
+
+class OutboxEmail(db.Model):
+    """Gönderilmeyi bekleyen email kuyruğu
+
+    Email'ler istek içinde SMTP'ye gönderilmez, bu tabloya yazılır ve arka
+    plandaki gönderici (bkz. ``app.mailer``) tarafından toplu olarak iletilir.
+    """
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        # Gönderici sıradaki gönderilecekleri bu index üzerinden seçer
+        db.Index('ix_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipients = db.Column(db.Text, nullable=False)  # Virgülle ayrılmış adresler
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text)
+    html = db.Column(db.Text)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    claim_token = db.Column(db.String(32))
+    claimed_at = db.Column(db.DateTime)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<OutboxEmail {self.id} {self.status} - {self.subject}>'
+
+    @property
+    def recipient_list(self):
+        return [address for address in self.recipients.split(',') if address]
@@ -1,18 +1,26 @@
 from app import db
+from sqlalchemy.dialects import postgresql, sqlite
 from datetime import datetime
 
 class Payment(db.Model):
     """Ödeme kayıtları modeli"""
     __tablename__ = 'payments'
+    __table_args__ = (
+        # Aynı ekstre satırının iki kez kaydedilmesini veritabanı seviyesinde engelle
+        db.Index('uq_payments_date_description_amount', 'transaction_date', 'description', 'amount', unique=True),
+        # Ödeme listesi ve bekleyen ödemeler: aktifler (transaction_date, id) sırasıyla
+        db.Index('ix_payments_active_date', 'is_active', 'transaction_date', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     transaction_date = db.Column(db.Date, nullable=False)
     description = db.Column(db.String(200), nullable=False)
     amount = db.Column(db.Numeric(10, 2), nullable=False)  # 10 basamak, 2 ondalık
     payment_type = db.Column(db.String(50), nullable=True)  # nakit, kart, havale vb.
-    student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
+    import_batch = db.Column(db.String(32), nullable=True, index=True)  # Aynı ekstre yüklemesinde kaydedilenler
     
     # İlişkiler
     student = db.relationship('User', foreign_keys=[student_id], backref='payments')
@@ -29,4 +37,49 @@ class Payment(db.Model):
     @property
     def formatted_date(self):
         """Tarihi formatlı şekilde döndür"""
-        return self.transaction_date.strftime('%d.%m.%Y') 
\ No newline at end of file
+        return self.transaction_date.strftime('%d.%m.%Y')
+    
+    @classmethod
+    def unassigned(cls):
+        """Hiçbir kurs ödemesine bağlı olmayan aktif ödemeler (anti-join)"""
+        from app.models.course import CoursePayment
+
+        assigned = db.exists().where(CoursePayment.payment_id == cls.id)
+        return cls.query.filter(cls.is_active == True, ~assigned) 
+    
+    @classmethod
+    def bulk_insert(cls, rows):
+        """Ödeme satırlarını toplu olarak ekle, mevcut olanları atla
+
+        ``rows`` Payment kolon adlarını anahtar olarak kullanan sözlüklerdir.
+        SQLite ve PostgreSQL'de (tarih, açıklama, tutar) unique index'i üzerinden
+        ``INSERT ... ON CONFLICT DO NOTHING`` kullanılır; diğer veritabanlarında
+        mevcut anahtarlar tek sorguda bulunup kalanlar eklenir. Eklenen satır
+        sayısını döndürür.
+        """
+        if not rows:
+            return 0
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            insert = sqlite.insert if dialect == 'sqlite' else postgresql.insert
+            stmt = insert(cls).on_conflict_do_nothing(
+                index_elements=['transaction_date', 'description', 'amount']
+            ).returning(cls.id)
+            # executemany: ifade bir kez derlenir, satırlar toplu gönderilir;
+            # RETURNING yalnızca gerçekten eklenen satırları döndürür
+            return len(db.session.execute(stmt, rows).all())
+
+        keys = {(row['transaction_date'], row['description'], row['amount']) for row in rows}
+        existing = set(db.session.query(
+            cls.transaction_date, cls.description, cls.amount
+        ).filter(
+            db.tuple_(cls.transaction_date, cls.description, cls.amount).in_(keys)
+        ).all())
+        new_rows = [
+            row for row in rows
+            if (row['transaction_date'], row['description'], row['amount']) not in existing
+        ]
+        if new_rows:
+            db.session.execute(db.insert(cls), new_rows)
+        return len(new_rows)
@@ -1,19 +1,35 @@
+import re
+
 from app import db
 from datetime import datetime
 
+
+def normalize_phone(value):
+    """Telefonu son 10 hanesine indir (0555..., +90 555... aynı sayılır)"""
+    digits = re.sub(r'\D', '', value or '')
+    return digits[-10:] if len(digits) >= 10 else None
+
+
 class StudentProfile(db.Model):
     __tablename__ = 'student_profiles'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     first_name = db.Column(db.String(64), nullable=False)
     last_name = db.Column(db.String(64), nullable=False)
     birth_date = db.Column(db.Date)
     gender = db.Column(db.String(10))  # male, female, other
     phone = db.Column(db.String(20))
+    # normalize_phone(phone); içe aktarılan listeler bu index üzerinden eşleştirilir
+    phone_digits = db.Column(db.String(10), index=True)
     address = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    @db.validates('phone')
+    def _set_phone_digits(self, key, phone):
+        self.phone_digits = normalize_phone(phone)
+        return phone
+
     def __repr__(self):
         return f'<StudentProfile {self.first_name} {self.last_name}>' 
\ No newline at end of file
@@ -1,14 +1,28 @@
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
-from app import db, login_manager
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, joinedload, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from app import db, login_manager, user_cache
+from app.passwords import hash_password, needs_rehash, verify_password
+from app.models.student_profile import StudentProfile
+from app.models.admin_profile import AdminProfile
 from datetime import datetime
 
+# Bu alanlardan biri değiştiğinde cache'lenmiş kimlik geçersiz olur
+_IDENTITY_FIELDS = ('email', 'role', 'is_active', 'password_hash')
+
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Öğrenci listesi: role filtresi, (created_at, id) keyset sıralaması
+        db.Index('ix_users_role_created_at', 'role', 'created_at', 'id'),
+        # Kursa eklenebilecek öğrenciler: aktif öğrenciler email sırasıyla
+        db.Index('ix_users_role_active_email', 'role', 'is_active', 'email'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128))
+    password_hash = db.Column(db.String(255))  # yöntem:parametreler$salt$hash
     role = db.Column(db.String(20), default='student')  # student, admin
     is_active = db.Column(db.Boolean, default=True)
     reset_token = db.Column(db.String(100), unique=True, nullable=True)
@@ -21,10 +35,14 @@ class User(UserMixin, db.Model):
     admin_profile = db.relationship('AdminProfile', uselist=False, cascade='all, delete-orphan')
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """Şifre hash'i ``PASSWORD_HASH_METHOD`` ile üretilmemişse True"""
+        return needs_rehash(self.password_hash)
     
     def __repr__(self):
         return f'<User {self.email}>'
@@ -32,6 +50,9 @@ class User(UserMixin, db.Model):
     @property
     def display_name(self):
         """Kullanıcının görüntülenecek adını döndür"""
+        cached = self.__dict__.get('_cached_display_name')
+        if cached is not None:
+            return cached
         if self.role == 'admin' and self.admin_profile:
             return self.admin_profile.full_name
         elif self.role == 'student' and self.student_profile:
@@ -43,6 +64,90 @@ class User(UserMixin, db.Model):
                 return self.student_profile.last_name
         return self.email
 
+    def identity(self):
+        """Oturum için cache'lenen hafif kimlik bilgileri"""
+        return {
+            'id': self.id,
+            'email': self.email,
+            'role': self.role,
+            'is_active': self.is_active,
+            'display_name': self.display_name
+        }
+
+    @classmethod
+    def from_identity(cls, identity):
+        """Cache'lenmiş kimlikten sorgu atmadan oturuma bağlı bir kullanıcı oluştur
+
+        Kimlikte olmayan alanlara (ör. ``password_hash``, profiller) ilk
+        erişimde veritabanından yüklenir.
+        """
+        existing = db.session.identity_map.get(identity_key(cls, identity['id']))
+        if existing is not None:
+            return existing
+
+        user = cls(
+            id=identity['id'],
+            email=identity['email'],
+            role=identity['role'],
+            is_active=identity['is_active']
+        )
+        make_transient_to_detached(user)
+        db.session.add(user)
+        user.__dict__['_cached_display_name'] = identity['display_name']
+        return user
+
 @login_manager.user_loader
 def load_user(id):
-    return User.query.get(int(id)) 
\ No newline at end of file
+    identity = user_cache.get(int(id))
+    if identity is not None:
+        return User.from_identity(identity)
+
+    # Kullanıcı ve profilleri tek sorguda
+    user = db.session.get(User, int(id), options=[
+        joinedload(User.student_profile),
+        joinedload(User.admin_profile)
+    ])
+    if user is not None:
+        user_cache.set(user.id, user.identity())
+    return user
+
+
+@event.listens_for(Session, 'before_flush')
+def _track_identity_changes(session, flush_context, instances):
+    stale = session.info.setdefault('stale_user_ids', set())
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            state = inspect(obj)
+            if any(state.attrs[field].history.has_changes() for field in _IDENTITY_FIELDS):
+                stale.add(obj.id)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (StudentProfile, AdminProfile)) and obj.user_id is not None:
+            stale.add(obj.user_id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            stale.add(obj.id)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _track_bulk_identity_changes(orm_execute_state):
+    # Query.update()/delete() hangi kullanıcıları etkilediğini bildirmez
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, (User, StudentProfile, AdminProfile)):
+        orm_execute_state.session.info['user_cache_cleared'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_identities(session):
+    if session.info.pop('user_cache_cleared', False):
+        user_cache.clear()
+    stale = session.info.pop('stale_user_ids', None)
+    if stale:
+        user_cache.invalidate(*stale)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _reset_identity_changes(session):
+    session.info.pop('stale_user_ids', None)
+    session.info.pop('user_cache_cleared', None) 
\ No newline at end of file
@@ -0,0 +1,144 @@
+import base64
+import json
+
+from app import db
+
+
+def encode_cursor(*values):
+    """Sıralama anahtarı değerlerini opak bir sayfa token'ına çevir"""
+    raw = json.dumps(values, default=lambda value: value.isoformat(), separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """``encode_cursor`` ile üretilmiş token'ı değer listesine çevir
+
+    Bozuk token'lar için ``ValueError`` fırlatır.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Geçersiz sayfa token\'ı') from e
+
+    if not isinstance(values, list):
+        raise ValueError('Geçersiz sayfa token\'ı')
+    return values
+
+
+def _directions(columns, descending):
+    if isinstance(descending, bool):
+        return [descending] * len(columns)
+    return list(descending)
+
+
+def nullable(convert):
+    """Token değerini ``convert`` ile çevir; ``None`` (NULL anahtar) olduğu gibi kalır"""
+    return lambda value: None if value is None else convert(value)
+
+
+def _is_nullable(column):
+    return getattr(getattr(column, 'expression', column), 'nullable', True)
+
+
+def _nulls_are_smallest():
+    # SQLite ve MySQL NULL'ları en küçük, PostgreSQL en büyük değer gibi
+    # sıralar; seek koşulu index sırasını bozmamak için veritabanına uyar
+    return db.session.get_bind().dialect.name != 'postgresql'
+
+
+def _after(column, value, desc, nulls_smallest):
+    """Sıralamada ``value``'dan sonra gelen ``column`` değerleri koşulu"""
+    # Arama yönünde NULL'lar sona düşüyorsa NULL olmayan değerler NULL'dan önce gelir
+    nulls_at_end = nulls_smallest == desc
+    if value is None:
+        return db.false() if nulls_at_end else column.isnot(None)
+    comparison = column < value if desc else column > value
+    if nulls_at_end and _is_nullable(column):
+        return db.or_(comparison, column.is_(None))
+    return comparison
+
+
+def keyset_filter(columns, values, descending=True):
+    """``(columns) < (values)`` (veya artan sırada ``>``) seek koşulunu üret
+
+    OFFSET yerine son görülen satırın anahtarından devam etmek için kullanılır;
+    sorgunun ``columns`` ile aynı sırada sıralanmış olması gerekir.
+    ``descending`` tek bir değer veya her kolon için ayrı bir değer olabilir.
+    NULL anahtarlar veritabanının kendi NULL sıralamasına göre konumlanır
+    (ör. eski kayıtlarda boş ``created_at``).
+    """
+    clauses = []
+    directions = _directions(columns, descending)
+    nulls_smallest = _nulls_are_smallest()
+    for i, (column, value) in enumerate(zip(columns, values)):
+        comparison = _after(column, value, directions[i], nulls_smallest)
+        equalities = [c.is_(None) if v is None else c == v for c, v in zip(columns[:i], values[:i])]
+        clauses.append(db.and_(*equalities, comparison))
+    return db.or_(*clauses)
+
+
+class KeysetPage:
+    """Keyset ile sayfalanmış bir sonuç sayfası
+
+    ``next_cursor``/``prev_cursor`` bir sonraki/önceki sayfa için opak
+    token'lardır; ``total`` yalnızca istenirse hesaplanır.
+    """
+
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def keyset_paginate(query, columns, key, per_page, cursor=None, descending=True,
+                    parse=None, with_total=False):
+    """Sorguyu ``columns`` üzerinden keyset (seek) yöntemiyle sayfala
+
+    ``columns`` sorgunun benzersiz sıralama anahtarıdır (son kolon genelde
+    ``id``). ``key`` bir sonuç satırından bu kolonların değerlerini döndürür,
+    ``parse`` ise token'dan okunan JSON değerlerini (ör. tarih metinleri)
+    tekrar Python değerlerine çevirir. OFFSET ve COUNT kullanılmaz; toplam
+    sayı yalnızca ``with_total`` verilirse ayrı bir sorgu ile hesaplanır.
+    Bozuk token'lar için ``ValueError`` fırlatır.
+    """
+    directions = _directions(columns, descending)
+    total = query.order_by(None).count() if with_total else None
+
+    direction = 'next'
+    if cursor:
+        direction, *values = decode_cursor(cursor)
+        if direction not in ('next', 'prev') or len(values) != len(columns):
+            raise ValueError('Geçersiz sayfa token\'ı')
+        if parse is not None:
+            values = parse(values)
+        # Önceki sayfa için sıralama ters çevrilip geriye doğru aranır
+        seek_directions = directions if direction == 'next' else [not d for d in directions]
+        query = query.filter(keyset_filter(columns, values, seek_directions))
+    else:
+        seek_directions = directions
+
+    ordering = [column.desc() if desc else column.asc() for column, desc in zip(columns, seek_directions)]
+    # Bir fazla satır çekerek o yönde başka sayfa olup olmadığını anla
+    items = query.order_by(*ordering).limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    if direction == 'prev':
+        items.reverse()
+
+    has_next = has_more if direction == 'next' else bool(cursor)
+    has_prev = bool(cursor) if direction == 'next' else has_more
+
+    next_cursor = encode_cursor('next', *key(items[-1])) if has_next and items else None
+    prev_cursor = encode_cursor('prev', *key(items[0])) if has_prev and items else None
+    return KeysetPage(items, per_page, next_cursor, prev_cursor, total)
@@ -0,0 +1,51 @@
+from flask import current_app, has_app_context
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+# Werkzeug'un varsayılanı; PASSWORD_HASH_METHOD verilmezse kullanılır
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'
+
+
+def normalize_method(method):
+    """Hash yöntemini tüm parametreleriyle yaz
+
+    Werkzeug hash'in başına yöntemi parametreleriyle birlikte yazar
+    (ör. ``scrypt:32768:8:1$salt$hash``). Eksik parametreler Werkzeug'un
+    varsayılanlarıyla doldurulur ki saklanan hash'lerin öneki ile
+    karşılaştırılabilsin.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        n = int(args[0]) if args else 2 ** 15
+        r = int(args[1]) if len(args) > 1 else 8
+        p = int(args[2]) if len(args) > 2 else 1
+        return f'scrypt:{n}:{r}:{p}'
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    raise ValueError(f"Desteklenmeyen şifre hash yöntemi: {method}")
+
+
+def hash_method():
+    """Yeni hash'ler için yapılandırılmış yöntem"""
+    method = DEFAULT_HASH_METHOD
+    if has_app_context():
+        method = current_app.config.get('PASSWORD_HASH_METHOD') or DEFAULT_HASH_METHOD
+    return normalize_method(method)
+
+
+def hash_password(password, method=None):
+    return generate_password_hash(password, method=method or hash_method())
+
+
+def verify_password(pwhash, password):
+    if not pwhash:
+        return False
+    return check_password_hash(pwhash, password)
+
+
+def needs_rehash(pwhash, method=None):
+    """Hash yapılandırılmış yöntem/maliyetten farklı üretilmişse True"""
+    if not pwhash:
+        return False
+    return pwhash.split('$', 1)[0] != (method or hash_method())
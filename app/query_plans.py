@@ -0,0 +1,190 @@
+import json
+import re
+from contextlib import contextmanager
+
+from flask import current_app, g
+from sqlalchemy import event
+
+from app import db, login_manager
+
+# Tam taramasına izin verilen tablolar: arama indeksi kendi yöntemini
+# (FTS5/trigram) kullanır
+ALLOWED_FULL_SCANS = {'student_search'}
+
+# SQLite: "SCAN tablo" tam tablo taraması, "SCAN tablo USING [COVERING] INDEX"
+# ise sıralı index taramasıdır (LIMIT ile erken biter). Önceden hesaplanmış
+# alt sorguların (MATERIALIZE/CO-ROUTINE) taranması tablo taraması değildir.
+_SQLITE_SCAN_RE = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+_SQLITE_SUBQUERY_RE = re.compile(r'^(?:MATERIALIZE|CO-ROUTINE) (\w+)')
+
+# Şema kataloğu sorguları (ör. arama yönteminin tespiti) uygulama
+# tablolarına dokunmaz; planları kontrol edilmez
+_CATALOG_RE = re.compile(
+    r'\b(?:sqlite_(?:master|schema|temp_master)|pg_catalog|information_schema|to_regclass)\b', re.IGNORECASE
+)
+
+
+def hot_requests():
+    """Planı kontrol edilecek sayfalar: ``(rol, url)`` listesi
+
+    Url'ler veritabanındaki ilk uygun kurs/öğrenci ile doldurulur; veri
+    yoksa ilgili sayfalar atlanır.
+    """
+    from app.models.user import User
+    from app.models.course import CourseEnrollment
+
+    # Pasif kullanıcılar giriş yapamaz; öğrenci sayfası için aktif öğrenci gerekir
+    enrollment = CourseEnrollment.query.join(CourseEnrollment.student).filter(
+        CourseEnrollment.is_active == True, User.is_active == True
+    ).order_by(CourseEnrollment.id).first()
+    student = User.query.filter_by(role='student').order_by(User.id).first()
+
+    requests = [
+        ('admin', '/admin/dashboard'),
+        ('admin', '/admin/students'),
+        ('admin', '/admin/students?status=active'),
+        ('admin', '/admin/students?search=ali'),
+        ('admin', '/admin/students/search?q=ali'),
+        ('admin', '/admin/courses'),
+        ('admin', '/admin/payments'),
+        ('admin', '/admin/payments?date_filter=month'),
+        ('admin', '/admin/students/export?format=csv'),
+    ]
+    if student is not None:
+        requests.append(('admin', f'/admin/students/{student.id}'))
+    if enrollment is not None:
+        course_id, student_id = enrollment.course_id, enrollment.student_id
+        requests += [
+            ('admin', f'/admin/courses/{course_id}/manage'),
+            ('admin', f'/admin/courses/{course_id}/enrollable-students'),
+            ('admin', f'/admin/courses/{course_id}/enrollable-students?q=ali'),
+            ('admin', f'/admin/courses/{course_id}/get-pending-payments/{student_id}'),
+            ('admin', f'/admin/courses/{course_id}/export-students?format=csv'),
+            (student_id, '/student/courses'),
+        ]
+    return requests
+
+
+@contextmanager
+def logged_in_requests():
+    """Verilen kullanıcı adına GET isteği atan bir fonksiyon sağla
+
+    ``get(rol, url)`` yanıtı döndürür; rol ``'admin'`` ise ilk admin, değilse
+    verilen kullanıcı id'si kullanılır. Oturum doğrudan yazılır (şifre
+    gerekmez) ve istek sınırlaması bu süre için kapatılır. ``headers`` isteğe,
+    ``session_data`` oturuma eklenir. Yanıt gövdesi okunmuş olarak döner (akış
+    yanıtlarında sorgular gövde okunurken çalışır).
+    """
+    from app.models.user import User
+
+    app = current_app._get_current_object()
+    limiter = app.extensions['rate_limiter']
+    admin_id = db.session.scalar(db.select(User.id).where(User.role == 'admin').order_by(User.id).limit(1))
+    # session_protection='strong' istemci kimliğini (IP + user agent) de
+    # kontrol eder; test istemcisinin ortamıyla üretilir
+    with app.test_request_context(environ_base=app.test_client().environ_base):
+        identifier = login_manager._session_identifier_generator()
+
+    def get(role, url, headers=None, session_data=None):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(admin_id if role == 'admin' else role)
+            session['_fresh'] = True
+            session['_id'] = identifier
+            session.update(session_data or {})
+        # İstekler CLI'ın app context'ini (ve g'yi) paylaşır; önceki
+        # isteğin kullanıcısı taşınmasın
+        g.pop('_login_user', None)
+        response = client.get(url, headers=headers)
+        response.get_data()
+        return response
+
+    enabled, limiter.enabled = limiter.enabled, False
+    try:
+        yield get
+    finally:
+        limiter.enabled = enabled
+
+
+def capture_queries(requests):
+    """Sayfaları test istemcisiyle çağır, çalışan SELECT'leri topla
+
+    Sonuç ``[(url, sql, parametreler), ...]`` şeklindedir.
+    """
+    captured = []
+    current = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')) and 'url' in current:
+            captured.append((current['url'], statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        with logged_in_requests() as get:
+            for role, url in requests:
+                current['url'] = url
+                response = get(role, url)
+                current.pop('url')
+                if response.status_code != 200:
+                    print(f"⚠️  {url}: HTTP {response.status_code}")
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    return captured
+
+
+def _sqlite_full_scans(connection, statement, parameters):
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    plan = [row[-1] for row in rows]
+    subqueries = {match.group(1) for match in map(_SQLITE_SUBQUERY_RE.match, plan) if match}
+    scans = []
+    for detail in plan:
+        match = _SQLITE_SCAN_RE.match(detail)
+        if match and match.group(1) not in ALLOWED_FULL_SCANS | subqueries:
+            scans.append(match.group(1))
+    return scans, plan
+
+
+def _postgresql_full_scans(connection, statement, parameters):
+    # Küçük tablolarda planlayıcı index'i atlayabilir; seq scan'i yalnızca
+    # başka yol yoksa seçsin ki eksik index'ler görünür olsun
+    connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+    result = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters).scalar()
+    plan = result if isinstance(result, list) else json.loads(result)
+
+    scans = []
+    nodes = [plan[0]['Plan']]
+    while nodes:
+        node = nodes.pop()
+        relation = node.get('Relation Name')
+        if node.get('Node Type') == 'Seq Scan' and relation not in ALLOWED_FULL_SCANS:
+            scans.append(relation)
+        nodes.extend(node.get('Plans', ()))
+    return scans, [json.dumps(plan[0]['Plan'], indent=2)]
+
+
+def find_full_scans(captured):
+    """Toplanan sorguların planlarını çıkar, tam tablo taraması yapanları döndür
+
+    Sonuç ``[(url, sql, taranan tablolar, plan satırları), ...]`` şeklindedir.
+    Şema kataloğunu okuyan sorgular atlanır.
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        explain = _sqlite_full_scans
+    elif dialect == 'postgresql':
+        explain = _postgresql_full_scans
+    else:
+        raise RuntimeError(f"{dialect} için sorgu planı kontrolü desteklenmiyor")
+
+    problems = []
+    seen = set()
+    with db.engine.connect() as connection:
+        for url, statement, parameters in captured:
+            if statement in seen or _CATALOG_RE.search(statement):
+                continue
+            seen.add(statement)
+            with connection.begin():
+                scans, plan = explain(connection, statement, parameters)
+            if scans:
+                problems.append((url, statement, scans, plan))
+    return problems
@@ -0,0 +1,164 @@
+import math
+import sqlite3
+import threading
+import time
+
+from flask import abort, current_app, g, request
+from flask_login import current_user
+
+
+class RateLimitResult:
+    """Bir kotanın son durumu (yanıt başlıkları için)"""
+
+    def __init__(self, allowed, limit, remaining, reset_after):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_after = reset_after
+
+
+class RateLimiter:
+    """Tüm worker'lar arasında paylaşılan kayan pencere (sliding window) sayacı
+
+    Sayaçlar paylaşılan cache'in SQLite dosyasında anahtar başına tek satır
+    olarak tutulur: o anki pencerenin ve bir önceki pencerenin sayısı. Tahmini
+    istek sayısı, önceki pencerenin henüz kaymamış kısmı ile o anki pencerenin
+    toplamıdır. Her ``hit`` tek bir atomik upsert ile yapılır; oturum
+    cookie'sine hiçbir şey yazılmaz.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.enabled = True
+        self._local = threading.local()
+
+    def init_app(self, app):
+        self.enabled = app.config.get('RATELIMIT_ENABLED', True)
+        app.extensions['rate_limiter'] = self
+
+        @app.after_request
+        def add_rate_limit_headers(response):
+            result = g.pop('rate_limit', None)
+            if result is not None:
+                response.headers['X-RateLimit-Limit'] = str(result.limit)
+                response.headers['X-RateLimit-Remaining'] = str(result.remaining)
+                response.headers['X-RateLimit-Reset'] = str(result.reset_after)
+                if not result.allowed:
+                    response.headers['Retry-After'] = str(result.reset_after)
+            return response
+
+    def _connection(self):
+        conn = self.cache.connection()
+        # Tablo bağlantı başına bir kez kontrol edilir
+        if getattr(self._local, 'conn', None) is not conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limits ('
+                'key TEXT PRIMARY KEY, bucket INTEGER NOT NULL, '
+                'count INTEGER NOT NULL, prev_count INTEGER NOT NULL)'
+            )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _result(count, prev_count, limit, period, now):
+        elapsed = now % period
+        estimated = prev_count * (period - elapsed) / period + count
+        remaining = max(int(limit - estimated), 0)
+        return RateLimitResult(estimated <= limit, limit, remaining, math.ceil(period - elapsed))
+
+    def hit(self, key, limit, period):
+        """İsteği ``key`` kotasından düş ve kotanın durumunu döndür
+
+        Reddedilen istekler de sayılır; kotayı zorlamaya devam eden istemci
+        pencere kayana kadar engelli kalır.
+        """
+        now = time.time()
+        if not self.enabled or self.cache is None or self.cache.path is None:
+            return RateLimitResult(True, limit, limit, period)
+
+        bucket = int(now // period)
+        try:
+            count, prev_count = self._connection().execute(
+                'INSERT INTO rate_limits (key, bucket, count, prev_count) VALUES (?, ?, 1, 0) '
+                'ON CONFLICT(key) DO UPDATE SET '
+                'prev_count = CASE WHEN bucket = excluded.bucket THEN prev_count '
+                'WHEN bucket = excluded.bucket - 1 THEN count ELSE 0 END, '
+                'count = CASE WHEN bucket = excluded.bucket THEN count + 1 ELSE 1 END, '
+                'bucket = excluded.bucket '
+                'RETURNING count, prev_count',
+                (key, bucket)
+            ).fetchone()
+        except sqlite3.Error as e:
+            # Sayaç okunamazsa isteği engelleme
+            print(f"Rate limiter error: {e}")
+            return RateLimitResult(True, limit, limit, period)
+
+        return self._result(count, prev_count, limit, period, now)
+
+    def peek(self, key, limit, period):
+        """Kotayı düşmeden durumunu döndür"""
+        now = time.time()
+        if not self.enabled or self.cache is None or self.cache.path is None:
+            return RateLimitResult(True, limit, limit, period)
+
+        bucket = int(now // period)
+        try:
+            row = self._connection().execute(
+                'SELECT bucket, count, prev_count FROM rate_limits WHERE key = ?', (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Rate limiter error: {e}")
+            return RateLimitResult(True, limit, limit, period)
+
+        count = prev_count = 0
+        if row is not None:
+            if row[0] == bucket:
+                count, prev_count = row[1], row[2]
+            elif row[0] == bucket - 1:
+                prev_count = row[1]
+        result = self._result(count, prev_count, limit, period, now)
+        # Bir sonraki istek de sığıyor mu
+        result.allowed = result.remaining >= 1
+        return result
+
+    def reset(self, *keys):
+        """Kotaları sıfırla (ör. başarılı girişten sonra)"""
+        if not self.enabled or self.cache is None or self.cache.path is None or not keys:
+            return
+        try:
+            self._connection().executemany(
+                'DELETE FROM rate_limits WHERE key = ?', [(key,) for key in keys]
+            )
+        except sqlite3.Error as e:
+            print(f"Rate limiter error: {e}")
+
+
+def client_keys(limit):
+    """İsteğin düşüleceği kotalar: ``[(anahtar, sınır), ...]``
+
+    Giriş yapmış kullanıcı hem kendi kotasından hem de IP kotasından
+    (``IP_RATE_LIMIT``) düşülür; aynı IP'den hesap değiştirerek sınır
+    aşılamaz. IP kotası aynı ağı paylaşan kullanıcılar için daha geniştir;
+    ``IP_RATE_LIMIT`` 0 ise giriş yapmış kullanıcıya uygulanmaz. Giriş
+    yapmamış istemci yalnızca IP'si üzerinden ``limit`` ile sınırlanır.
+    Vekil arkasında gerçek istemci IP'si için ``PROXY_FIX_X_FOR`` ayarlanmalıdır.
+    """
+    ip_key = f'ip:{request.remote_addr}'
+    if current_user.is_authenticated:
+        keys = [(f'user:{current_user.id}', limit)]
+        ip_limit = current_app.config['IP_RATE_LIMIT']
+        if ip_limit > 0:
+            keys.append((ip_key, ip_limit))
+        return keys
+    return [(ip_key, limit)]
+
+
+def limit_request(scope, limit, period):
+    """Mevcut isteği ``scope`` kotalarından düş, herhangi biri aşıldıysa 429 döndür"""
+    limiter = current_app.extensions['rate_limiter']
+    results = [limiter.hit(f'{scope}:{key}', quota, period) for key, quota in client_keys(limit)]
+    # Başlıklarda en kısıtlayıcı kota gösterilir
+    result = min(results, key=lambda result: (result.allowed, result.remaining))
+    g.rate_limit = result
+    if not result.allowed:
+        abort(429)
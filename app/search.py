@@ -0,0 +1,294 @@
+import re
+
+from flask import current_app
+from sqlalchemy import event, inspect
+
+from app import db, cache
+from app.models.user import User
+from app.models.student_profile import StudentProfile
+
+# Arama indeksi tablosu; veritabanına göre FTS5 sanal tablosu veya trigram
+# index'li normal tablo olarak oluşturulur, bu yüzden metadata'ya eklenmez
+student_search = db.table(
+    'student_search',
+    db.column('user_id', db.Integer),
+    db.column('document', db.Text)
+)
+
+_TR_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+_ASCII_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+_TOKEN_RE = re.compile(r'\w+')
+# Telefon sonekleri en az bu kadar rakamla indekslenir
+_MIN_PHONE_PART = 3
+# Arama yöntemi init-db sırasında ortak cache'e yazılır; worker'lar katalog
+# sorgusu yapmadan okur
+_BACKEND_TTL = 365 * 86400
+
+
+def fold(text):
+    """Türkçe kurallarına göre küçük harfe çevir ve aksanları kaldır
+
+    ``'ÇELİK'``, ``'Çelik'`` ve ``'celik'`` aynı değere katlanır; ``I`` harfi
+    ``ı`` olarak küçültüldükten sonra ``i``'ye indirgenir.
+    """
+    return (text or '').translate(_TR_LOWER).lower().translate(_ASCII_FOLD)
+
+
+def build_document(email, first_name, last_name, phone):
+    """Bir öğrenci için indekslenecek katlanmış metni üret
+
+    Telefonun rakamları sonekleriyle birlikte eklenir; önek eşleştirmesi
+    böylece numaranın herhangi bir parçasını ("123 45", "4567") bulur.
+    """
+    digits = re.sub(r'\D', '', phone or '')
+    suffixes = ' '.join(digits[start:] for start in range(1, len(digits) - _MIN_PHONE_PART + 1))
+    return ' '.join(part for part in (
+        fold(first_name), fold(last_name), fold(email), digits, suffixes
+    ) if part)
+
+
+def search_tokens(term):
+    """Arama teriminin kelimeleri; rakam grupları tek kelimede birleştirilir
+
+    Telefon numaraları boşluklu yazılabildiği için ("0555 123 45 67") tüm
+    rakam grupları sırasıyla tek bir rakam dizisi olarak aranır.
+    """
+    tokens = _TOKEN_RE.findall(fold(term))
+    digits = ''.join(token for token in tokens if token.isdigit())
+    return [token for token in tokens if not token.isdigit()] + ([digits] if digits else [])
+
+
+def _backend_key():
+    # Aynı cache dosyasını kullanan farklı veritabanları karışmasın
+    return f'search_backend:{db.engine.url.render_as_string(hide_password=True)}'
+
+
+def search_backend():
+    """Kullanılan arama yöntemi: ``'fts5'``, ``'trgm'``, ``'like'`` veya ``None``
+
+    Yöntem ``create_search_index`` (flask init-db) tarafından ortak cache'e
+    kaydedilir ve process başına ilk kullanımda oradan okunur. Kayıt yoksa
+    mevcut indeks tablosu bir kez incelenir (DDL çalıştırılmaz) ve sonuç
+    tekrar kaydedilir. İndeks henüz oluşturulmadıysa ``None`` döner ve
+    indeks güncellenmez; oluşturmak için: flask init-db
+    """
+    extensions = current_app.extensions
+    if 'student_search' not in extensions:
+        backend = cache.get(_backend_key())
+        if backend is None:
+            backend = _detect_backend()
+            if backend is not None:
+                cache.set(_backend_key(), backend, _BACKEND_TTL)
+        extensions['student_search'] = backend
+    return extensions['student_search']
+
+
+def _detect_backend():
+    with db.engine.connect() as conn:
+        dialect = conn.dialect.name
+        if dialect == 'sqlite':
+            sql = conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE name = 'student_search'"
+            ).scalar()
+            if sql is None:
+                return None
+            return 'fts5' if 'fts5' in sql.lower() else 'like'
+        if dialect == 'postgresql':
+            table, index = conn.exec_driver_sql(
+                "SELECT to_regclass('student_search'), to_regclass('ix_student_search_document_trgm')"
+            ).one()
+            if table is None:
+                return None
+            return 'trgm' if index is not None else 'like'
+        return 'like' if inspect(conn).has_table('student_search') else None
+
+
+def create_search_index(app):
+    """Arama indeksi tablosunu oluştur, kullanılacak yöntemi döndür
+
+    SQLite'ta FTS5, PostgreSQL'de pg_trgm GIN index'i kullanılır; ikisi de
+    mevcut değilse indeks tablosu LIKE ile taranır. Tablo yeni oluşturulduysa
+    mevcut öğrencilerle doldurulur.
+    """
+    engine = db.engine
+    dialect = engine.dialect.name
+    created = not inspect(engine).has_table('student_search')
+    backend = 'like'
+
+    with engine.begin() as conn:
+        if dialect == 'sqlite':
+            try:
+                conn.exec_driver_sql(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS student_search USING fts5("
+                    "user_id UNINDEXED, document, prefix='2 3')"
+                )
+                backend = 'fts5'
+            except Exception as e:
+                print(f"FTS5 not available, falling back to LIKE search: {e}")
+        elif dialect == 'postgresql':
+            conn.exec_driver_sql(
+                'CREATE TABLE IF NOT EXISTS student_search ('
+                'user_id INTEGER PRIMARY KEY, document TEXT NOT NULL)'
+            )
+            try:
+                with conn.begin_nested():
+                    conn.exec_driver_sql('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+                    conn.exec_driver_sql(
+                        'CREATE INDEX IF NOT EXISTS ix_student_search_document_trgm '
+                        'ON student_search USING gin (document gin_trgm_ops)'
+                    )
+                backend = 'trgm'
+            except Exception as e:
+                print(f"pg_trgm not available, falling back to LIKE search: {e}")
+
+        if backend == 'like' and dialect != 'postgresql':
+            conn.exec_driver_sql(
+                'CREATE TABLE IF NOT EXISTS student_search ('
+                'user_id INTEGER PRIMARY KEY, document TEXT NOT NULL)'
+            )
+
+    app.extensions['student_search'] = backend
+    cache.set(_backend_key(), backend, _BACKEND_TTL)
+    if created:
+        rebuild_search_index()
+    return backend
+
+
+def rebuild_search_index():
+    """İndeksi tüm öğrencilerden yeniden oluştur, indekslenen kayıt sayısını döndür"""
+    rows = db.session.query(
+        User.id, User.email, StudentProfile.first_name, StudentProfile.last_name, StudentProfile.phone
+    ).outerjoin(
+        StudentProfile, StudentProfile.user_id == User.id
+    ).filter(User.role == 'student').all()
+
+    db.session.execute(db.delete(student_search))
+    if rows:
+        db.session.execute(db.insert(student_search), [
+            {'user_id': user_id, 'document': build_document(email, first_name, last_name, phone)}
+            for user_id, email, first_name, last_name, phone in rows
+        ])
+    db.session.commit()
+    return len(rows)
+
+
+def match_subquery(term):
+    """Arama terimine uyan öğrencileri ``(user_id, rank)`` alt sorgusu olarak döndür
+
+    ``rank`` küçükten büyüğe sıralandığında en iyi eşleşmeler önce gelir. Her
+    kelime önek olarak eşleştirilir ve tüm kelimelerin eşleşmesi gerekir;
+    rakamlar telefonun herhangi bir parçasıyla eşleşir.
+    Terim aranabilir bir kelime içermiyorsa veya indeks oluşturulmamışsa
+    ``None`` döner; ikincisinde çağıran ``plain_filter`` kullanabilir.
+    """
+    tokens = search_tokens(term)
+    backend = search_backend()
+    if not tokens or backend is None:
+        return None
+
+    if backend == 'fts5':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        return db.select(
+            student_search.c.user_id,
+            db.literal_column('rank').label('rank')
+        ).where(db.text('student_search MATCH :match').bindparams(match=match)).subquery()
+
+    conditions = [student_search.c.document.contains(token, autoescape=True) for token in tokens]
+    if backend == 'trgm':
+        rank = -db.func.similarity(student_search.c.document, ' '.join(tokens))
+    else:
+        rank = db.literal(0)
+    return db.select(
+        student_search.c.user_id,
+        rank.label('rank')
+    ).where(*conditions).subquery()
+
+
+def plain_filter(term):
+    """İndeks yokken öğrenci sorgularına uygulanan basit ``LIKE`` koşulu
+
+    Email, ad, soyad ve telefonda terimi arar; Türkçe katlama ve sıralama
+    yapılmaz ve her satır taranır. Yalnızca ``search_backend()`` ``None``
+    iken (flask init-db çalıştırılmamışsa) kullanılır.
+    """
+    return db.or_(
+        User.email.contains(term, autoescape=True),
+        User.student_profile.has(db.or_(
+            StudentProfile.first_name.contains(term, autoescape=True),
+            StudentProfile.last_name.contains(term, autoescape=True),
+            StudentProfile.phone.contains(term, autoescape=True)
+        ))
+    )
+
+
+def remove_documents(user_ids):
+    """Öğrencilerin indeks satırlarını sil (toplu silmelerde kullanılır)
+
+    ``user_ids`` id listesi veya id döndüren bir select olabilir. Toplu
+    DELETE ifadeleri mapper olaylarını çalıştırmadığı için indeks burada
+    temizlenir.
+    """
+    if _index_ready():
+        db.session.execute(db.delete(student_search).where(student_search.c.user_id.in_(user_ids)))
+
+
+def _write_document(connection, user_id):
+    """Flush içinde tek bir öğrencinin indeks satırını yenile"""
+    connection.execute(db.delete(student_search).where(student_search.c.user_id == user_id))
+
+    row = connection.execute(
+        db.select(
+            User.__table__.c.email, User.__table__.c.role,
+            StudentProfile.__table__.c.first_name, StudentProfile.__table__.c.last_name,
+            StudentProfile.__table__.c.phone
+        ).select_from(
+            User.__table__.outerjoin(
+                StudentProfile.__table__, StudentProfile.__table__.c.user_id == User.__table__.c.id
+            )
+        ).where(User.__table__.c.id == user_id)
+    ).first()
+    if row is None or row.role != 'student':
+        return
+
+    connection.execute(db.insert(student_search).values(
+        user_id=user_id,
+        document=build_document(row.email, row.first_name, row.last_name, row.phone)
+    ))
+
+
+def _index_ready():
+    try:
+        return search_backend() is not None
+    except RuntimeError:
+        # Uygulama bağlamı dışında (ör. script) indeks güncellenmez
+        return False
+
+
+@event.listens_for(StudentProfile, 'after_insert')
+@event.listens_for(StudentProfile, 'after_update')
+@event.listens_for(StudentProfile, 'after_delete')
+def _profile_changed(mapper, connection, target):
+    if _index_ready():
+        _write_document(connection, target.user_id)
+
+
+@event.listens_for(User, 'after_insert')
+def _user_created(mapper, connection, target):
+    if _index_ready():
+        _write_document(connection, target.id)
+
+
+@event.listens_for(User, 'after_update')
+def _user_changed(mapper, connection, target):
+    # Yalnızca indekslenen alanlar değiştiyse yeniden yaz
+    state = inspect(target)
+    if not (state.attrs.email.history.has_changes() or state.attrs.role.history.has_changes()):
+        return
+    if _index_ready():
+        _write_document(connection, target.id)
+
+
+@event.listens_for(User, 'after_delete')
+def _user_deleted(mapper, connection, target):
+    if _index_ready():
+        connection.execute(db.delete(student_search).where(student_search.c.user_id == target.id))
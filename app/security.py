@@ -0,0 +1,93 @@
+import re
+
+from flask import abort, current_app, request
+
+# SQL anahtar kelimeleri yalnızca csrf_token alanında aranır
+SQL_PATTERNS = (
+    'union', 'select', 'insert', 'update', 'delete', 'drop', 'create',
+    'script', 'javascript', 'onload', 'onerror', 'onclick'
+)
+
+# XSS kalıpları tüm form alanlarında aranır
+XSS_PATTERNS = ('<script', 'javascript:', 'vbscript:', 'onload=')
+
+
+class PatternMatcher:
+    """Birden fazla sabit kalıbı tek geçişte arayan derlenmiş eşleştirici
+
+    Kalıplar küçük harfe çevrilip tek bir regex'te birleştirilir. Her kalıp
+    harf/rakam olmayan bir karakter (``<``, ``:``, ``=``) içeriyorsa bu
+    karakterler ön filtre olarak kullanılır: hiçbiri geçmeyen değerler
+    küçültülmeden ve regex çalıştırılmadan temiz sayılır. Python'un ``re``
+    modülü IGNORECASE ile alternasyonlarda yavaş olduğundan arama küçültülmüş
+    metin üzerinde yapılır.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(pattern.lower() for pattern in patterns)
+        self.regex = re.compile('|'.join(re.escape(pattern) for pattern in self.patterns))
+
+        anchors = {next((char for char in pattern if not char.isalnum()), None) for pattern in self.patterns}
+        self.anchors = None if None in anchors else tuple(sorted(anchors))
+
+    def search(self, text):
+        if self.anchors is not None and not any(anchor in text for anchor in self.anchors):
+            return None
+        return self.regex.search(text.lower())
+
+
+class RequestScreen:
+    """POST formlarını şüpheli kalıplara karşı tarayan before_request kontrolü
+
+    Kalıplar uygulama oluşturulurken bir kez derlenir ve her değer tek geçişte
+    taranır (bkz. ``PatternMatcher``). ``exempt`` ile işaretlenen endpoint'ler taranmaz;
+    ``SECURITY_SCREEN_MAX_VALUE`` karakterden uzun değerler taranmadan 413
+    ile reddedilir.
+    """
+
+    def __init__(self, app=None):
+        self.sql_matcher = PatternMatcher(SQL_PATTERNS)
+        self.xss_matcher = PatternMatcher(XSS_PATTERNS)
+        self.max_value = None
+        self._exempt = set()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_value = app.config.get('SECURITY_SCREEN_MAX_VALUE')
+        self._exempt.update(app.config.get('SECURITY_SCREEN_EXEMPT', ()))
+        app.extensions['request_screen'] = self
+        app.before_request(self.check_request)
+
+    def exempt(self, view):
+        """View fonksiyonunu taramadan muaf tut (dekoratör olarak kullanılır)"""
+        self._exempt.add(f'{view.__module__}.{view.__name__}')
+        return view
+
+    def is_exempt(self):
+        if request.endpoint is None:
+            return False
+        if request.endpoint in self._exempt:
+            return True
+        view = current_app.view_functions.get(request.endpoint)
+        return view is not None and f'{view.__module__}.{view.__name__}' in self._exempt
+
+    def screen(self, form):
+        """Form değerlerini tara, şüpheli bir değer varsa True döndür"""
+        if self.sql_matcher.search(form.get('csrf_token', '')):
+            return True
+
+        for value in form.values():
+            if not isinstance(value, str):
+                continue
+            if self.max_value is not None and len(value) > self.max_value:
+                abort(413)
+            if self.xss_matcher.search(value):
+                return True
+        return False
+
+    def check_request(self):
+        if request.method != 'POST' or self.is_exempt():
+            return
+        if self.screen(request.form):
+            abort(403)
@@ -0,0 +1,288 @@
+import random
+from datetime import datetime, timedelta, time
+from decimal import Decimal
+
+from app import db
+from app.models.user import User
+from app.models.student_profile import StudentProfile, normalize_phone
+from app.models.payment import Payment
+from app.models.course import (
+    Course, CourseSchedule, CourseEnrollment, CoursePayment,
+    CourseAnnouncement, AnnouncementReaction
+)
+from app.passwords import hash_password
+
+# Üretilen tüm öğrencilerin şifresi (hash bir kez hesaplanır)
+SEED_PASSWORD = 'ogrenci123'
+
+FIRST_NAMES = (
+    'Ahmet', 'Mehmet', 'Mustafa', 'Ali', 'Hüseyin', 'Emre', 'Burak', 'Can', 'Cem', 'Oğuz',
+    'Ayşe', 'Fatma', 'Zeynep', 'Elif', 'Merve', 'Şeyma', 'Gül', 'İrem', 'Çağla', 'Özge',
+)
+LAST_NAMES = (
+    'Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Yıldız', 'Yıldırım', 'Öztürk', 'Aydın', 'Özdemir',
+    'Arslan', 'Doğan', 'Kılıç', 'Aslan', 'Çetin', 'Kara', 'Koç', 'Kurt', 'Özkan', 'Şimşek',
+)
+CITIES = ('İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya', 'Eskişehir', 'Konya', 'Trabzon')
+SUBJECTS = (
+    'Piyano', 'Gitar', 'Keman', 'Bağlama', 'Resim', 'Seramik', 'Satranç', 'Robotik Kodlama',
+    'İngilizce', 'Almanca', 'Matematik', 'Fizik', 'Yüzme', 'Tenis', 'Bale', 'Drama',
+)
+LEVELS = ('Başlangıç', 'Orta', 'İleri')
+DAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+EMOJIS = ('👍', '❤️', '🎉', '👏', '💡', '⭐')
+PAYMENT_TYPES = ('havale', 'eft', 'kart', 'nakit')
+
+# Email adresleri için Türkçe karakterlerin ASCII karşılıkları
+_ASCII = str.maketrans('çğıöşüÇĞİÖŞÜ', 'cgiosuCGIOSU')
+
+
+def _next_id(model):
+    return (db.session.scalar(db.select(db.func.max(model.id))) or 0) + 1
+
+
+def _insert(model, rows):
+    if rows:
+        db.session.execute(db.insert(model), rows)
+
+
+class DataSeeder:
+    """Performans ölçümleri için gerçekçi, ölçeklenebilir sentetik veri üretir
+
+    Satırlar açık id'lerle ``batch_size``'lık toplu INSERT'lerle eklenir ve
+    her parçadan sonra commit edilir; bellek kullanımı ölçekten bağımsız
+    kalır. Toplu INSERT mapper olaylarını çalıştırmadığı için bakiyeler,
+    emoji sayaçları ve arama indeksi sonda toplu olarak yeniden oluşturulur.
+    Mevcut verilere dokunulmaz, yeni satırlar eklenir.
+    """
+
+    def __init__(self, seed=None, batch_size=10000, progress=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.progress = progress or (lambda message: None)
+        self.now = datetime.utcnow()
+        self.admin = User.query.filter_by(role='admin').order_by(User.id).first()
+        if self.admin is None:
+            raise RuntimeError('Veri üretmek için en az bir admin kullanıcı gerekli')
+
+    def _past(self, days):
+        return self.now - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def _batches(self, start_id, count):
+        for offset in range(0, count, self.batch_size):
+            yield range(start_id + offset, start_id + min(offset + self.batch_size, count))
+
+    def seed_students(self, count):
+        """Öğrenci kullanıcıları ve profillerini üret, öğrenci id'lerini döndür"""
+        rng = self.rng
+        password_hash = hash_password(SEED_PASSWORD)
+        start_id = _next_id(User)
+        profile_id = _next_id(StudentProfile)
+
+        for ids in self._batches(start_id, count):
+            users, profiles = [], []
+            for user_id in ids:
+                first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                created_at = self._past(730)
+                users.append({
+                    'id': user_id,
+                    'email': f'{first_name}.{last_name}{user_id}@ornek.com'.translate(_ASCII).lower(),
+                    'password_hash': password_hash,
+                    'role': 'student',
+                    'is_active': rng.random() < 0.9,
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                })
+                profile = {
+                    'id': profile_id,
+                    'user_id': user_id,
+                    'first_name': first_name,
+                    'last_name': last_name,
+                    'birth_date': (self.now - timedelta(days=rng.randrange(7 * 365, 40 * 365))).date(),
+                    'gender': rng.choice(('male', 'female')),
+                    'phone': f'05{rng.randrange(10 ** 9):09d}',
+                    'address': f'{rng.choice(CITIES)}, Örnek Mah. {rng.randrange(1, 200)}. Sok. No: {rng.randrange(1, 80)}',
+                    'created_at': created_at,
+                    'updated_at': created_at,
+                }
+                # Toplu INSERT model doğrulayıcısını çalıştırmaz
+                profile['phone_digits'] = normalize_phone(profile['phone'])
+                profiles.append(profile)
+                profile_id += 1
+            _insert(User, users)
+            _insert(StudentProfile, profiles)
+            db.session.commit()
+            self.progress(f'öğrenciler: {ids.stop - start_id}/{count}')
+        return range(start_id, start_id + count)
+
+    def seed_courses(self, count):
+        """Kursları ve ders programlarını üret, ``{kurs id: ücret}`` döndür"""
+        rng = self.rng
+        start_id = _next_id(Course)
+        prices = {}
+        schedules = []
+
+        courses = []
+        for course_id in range(start_id, start_id + count):
+            created_at = self._past(730)
+            price = Decimal(rng.randrange(30, 121) * 100)
+            prices[course_id] = price
+            courses.append({
+                'id': course_id,
+                'name': f'{rng.choice(SUBJECTS)} - {rng.choice(LEVELS)} {course_id}',
+                'instructor_name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                'price': price,
+                'description': 'Haftalık grup dersi.',
+                'is_active': rng.random() < 0.95,
+                'is_deleted': False,
+                'created_at': created_at,
+                'updated_at': created_at,
+            })
+            for day in rng.sample(DAYS, rng.randint(1, 3)):
+                hour = rng.randrange(9, 20)
+                schedules.append({
+                    'course_id': course_id,
+                    'day_of_week': day,
+                    'start_time': time(hour),
+                    'end_time': time(hour + 1),
+                    'created_at': created_at,
+                })
+        _insert(Course, courses)
+        _insert(CourseSchedule, schedules)
+        db.session.commit()
+        self.progress(f'kurslar: {count}')
+        return prices
+
+    def seed_enrollments(self, student_ids, prices, per_student):
+        """Her öğrenciyi ortalama ``per_student`` kursa kaydet
+
+        ``[(kayıt id, öğrenci id)]`` listesi ve ``{kurs id: [öğrenci id]}``
+        döndürür (ödemeler ve tepkiler için).
+        """
+        rng = self.rng
+        course_ids = list(prices)
+        enrollment_id = _next_id(CourseEnrollment)
+        enrollments, course_students, rows = [], {}, []
+
+        for student_id in student_ids:
+            count = min(rng.randint(0, 2 * per_student), len(course_ids))
+            for course_id in rng.sample(course_ids, count):
+                rows.append({
+                    'id': enrollment_id,
+                    'course_id': course_id,
+                    'student_id': student_id,
+                    'enrolled_at': self._past(365),
+                    'enrolled_by': self.admin.id,
+                    'is_active': rng.random() < 0.95,
+                    'paid_total': 0,
+                    'remaining': prices[course_id],
+                })
+                enrollments.append((enrollment_id, student_id))
+                course_students.setdefault(course_id, []).append(student_id)
+                enrollment_id += 1
+            if len(rows) >= self.batch_size:
+                _insert(CourseEnrollment, rows)
+                db.session.commit()
+                rows = []
+                self.progress(f'kayıtlar: {len(enrollments)}')
+        _insert(CourseEnrollment, rows)
+        db.session.commit()
+        self.progress(f'kayıtlar: {len(enrollments)}')
+        return enrollments, course_students
+
+    def seed_payments(self, count, enrollments, assigned_ratio):
+        """Banka ekstresi ödemeleri üret; bir kısmını kurs kayıtlarına ata"""
+        rng = self.rng
+        start_id = _next_id(Payment)
+        course_payment_id = _next_id(CoursePayment)
+
+        for ids in self._batches(start_id, count):
+            payments, course_payments = [], []
+            for payment_id in ids:
+                transaction_date = self._past(730).date()
+                amount = Decimal(rng.randrange(10, 301) * 10)
+                enrollment = rng.choice(enrollments) if enrollments and rng.random() < assigned_ratio else None
+                payments.append({
+                    'id': payment_id,
+                    'transaction_date': transaction_date,
+                    # REF numarası (tarih, açıklama, tutar) tekilliğini sağlar
+                    'description': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} kurs ödemesi REF{payment_id}',
+                    'amount': amount,
+                    'payment_type': rng.choice(PAYMENT_TYPES),
+                    'student_id': enrollment[1] if enrollment else None,
+                    'created_by': self.admin.id,
+                    'is_active': True,
+                })
+                if enrollment:
+                    course_payments.append({
+                        'id': course_payment_id,
+                        'enrollment_id': enrollment[0],
+                        'payment_id': payment_id,
+                        'amount': amount,
+                        'payment_date': transaction_date,
+                        'payment_method': 'havale',
+                        'created_at': self.now,
+                        'created_by': self.admin.id,
+                    })
+                    course_payment_id += 1
+            _insert(Payment, payments)
+            _insert(CoursePayment, course_payments)
+            db.session.commit()
+            self.progress(f'ödemeler: {ids.stop - start_id}/{count}')
+
+    def seed_announcements(self, course_students, per_course, reaction_ratio=0.3):
+        """Kurslara duyurular, kayıtlı öğrencilerden emoji tepkileri üret"""
+        rng = self.rng
+        announcement_id = _next_id(CourseAnnouncement)
+        announcements, reactions = [], []
+        total = 0
+
+        for course_id, students in course_students.items():
+            for _ in range(rng.randint(0, 2 * per_course)):
+                announcements.append({
+                    'id': announcement_id,
+                    'course_id': course_id,
+                    'title': rng.choice(('Ders saati değişikliği', 'Tatil duyurusu', 'Yeni materyaller', 'Gösteri günü')),
+                    'content': 'Detaylar için eğitmeninizle iletişime geçebilirsiniz.',
+                    'is_active': True,
+                    'created_at': self._past(180),
+                    'created_by': self.admin.id,
+                })
+                # Öğrenci başına duyuru başına tek tepki
+                for student_id in rng.sample(students, int(len(students) * reaction_ratio)):
+                    reactions.append({
+                        'announcement_id': announcement_id,
+                        'student_id': student_id,
+                        'emoji': rng.choice(EMOJIS),
+                        'created_at': self.now,
+                    })
+                announcement_id += 1
+            if len(reactions) >= self.batch_size:
+                total += len(announcements)
+                _insert(CourseAnnouncement, announcements)
+                _insert(AnnouncementReaction, reactions)
+                db.session.commit()
+                announcements, reactions = [], []
+                self.progress(f'duyurular: {total}')
+        total += len(announcements)
+        _insert(CourseAnnouncement, announcements)
+        _insert(AnnouncementReaction, reactions)
+        db.session.commit()
+        self.progress(f'duyurular: {total}')
+
+    def run(self, students, courses, payments, enrollments_per_student=3,
+            announcements_per_course=3, assigned_ratio=0.7):
+        from app.search import rebuild_search_index
+
+        student_ids = self.seed_students(students)
+        prices = self.seed_courses(courses)
+        enrollments, course_students = self.seed_enrollments(student_ids, prices, enrollments_per_student)
+        self.seed_payments(payments, enrollments, assigned_ratio)
+        self.seed_announcements(course_students, announcements_per_course)
+
+        CourseEnrollment.rebuild_balances()
+        CourseAnnouncement.rebuild_reaction_counts()
+        db.session.commit()
+        self.progress('bakiyeler ve emoji sayaçları yeniden hesaplandı')
+        rebuild_search_index()
+        self.progress('arama indeksi yeniden oluşturuldu')
@@ -1,13 +1,14 @@
-from flask import render_template, redirect, url_for, flash, request, session
+from flask import render_template, redirect, url_for, flash, request, current_app
 from flask_login import login_required, current_user
 from app.student import student
 from app.student.forms import ProfileUpdateForm, ChangePasswordForm
 from app.models.student_profile import StudentProfile
-from app import db, mail
-from flask_mail import Message
+from app import db
+from app.mailer import queue_email
+from app.ratelimit import limit_request
+from app.conditional import conditional_get, watermark
 from functools import wraps
-from sqlalchemy.orm import joinedload
-import time
+from sqlalchemy.orm import contains_eager
 
 def student_required(f):
     """Student yetkisi gerektiren decorator"""
@@ -17,20 +18,8 @@ def student_required(f):
             flash('Bu sayfaya erişim yetkiniz yok.', 'error')
             return redirect(url_for('auth.login'))
         
-        # Rate limiting for student actions
-        current_time = time.time()
-        student_actions = session.get('student_actions', [])
-        
-        # Remove actions older than 1 minute
-        student_actions = [action for action in student_actions if current_time - action < 60]
-        
-        # Limit to 20 actions per minute
-        if len(student_actions) >= 20:
-            flash('Çok fazla işlem yapıyorsunuz. Lütfen bekleyin.', 'error')
-            return redirect(url_for('student.dashboard'))
-        
-        student_actions.append(current_time)
-        session['student_actions'] = student_actions
+        # Rate limiting for student actions (kullanıcı ve IP başına, tüm worker'larda ortak)
+        limit_request('student', current_app.config['STUDENT_RATE_LIMIT'], current_app.config['RATELIMIT_PERIOD'])
         
         return f(*args, **kwargs)
     return decorated_function
@@ -78,30 +67,50 @@ def change_password():
     
     return render_template('student/change_password.html', form=form)
 
+def _courses_watermarks():
+    """Kurs programı sayfasının bağlı olduğu kayıt, ödeme, kurs ve duyuru satırları"""
+    from app.models.course import Course, CourseEnrollment, CourseAnnouncement, CoursePayment
+    course_ids = db.select(CourseEnrollment.course_id).where(CourseEnrollment.student_id == current_user.id)
+    enrollment_ids = db.select(CourseEnrollment.id).where(CourseEnrollment.student_id == current_user.id)
+    return [
+        watermark(CourseEnrollment, CourseEnrollment.student_id == current_user.id),
+        watermark(CoursePayment, CoursePayment.enrollment_id.in_(enrollment_ids)),
+        watermark(Course, Course.id.in_(course_ids)),
+        watermark(CourseAnnouncement, CourseAnnouncement.course_id.in_(course_ids)),
+    ]
+
 @student.route('/courses')
 @login_required
 @student_required
+@conditional_get('course_enrollments', 'course_payments', 'courses', 'course_schedules',
+                 'course_announcements', 'announcement_reactions', 'announcement_reaction_counts',
+                 'users', 'admin_profiles', watermarks=_courses_watermarks)
 def courses():
     """Öğrenci kurs programı sayfası"""
     # Öğrencinin aktif kurs kayıtlarını al
-    from app.models.course import CourseEnrollment, CourseAnnouncement
+    from app.models.course import Course, CourseEnrollment, CourseAnnouncement
     
-    enrollments = CourseEnrollment.query.filter_by(
-        student_id=current_user.id,
-        is_active=True
-    ).join(CourseEnrollment.course).filter(
-        CourseEnrollment.course.has(is_active=True, is_deleted=False)
+    # Kayıt sayısından bağımsız sabit sayıda sorgu: kayıtlar + kurslar,
+    # ders programları, duyurular + yazarlar ve emoji sayıları
+    enrollments = CourseEnrollment.query.join(CourseEnrollment.course).options(
+        contains_eager(CourseEnrollment.course).selectinload(Course.schedules)
+    ).filter(
+        CourseEnrollment.student_id == current_user.id,
+        CourseEnrollment.is_active == True,
+        Course.is_active == True,
+        Course.is_deleted == False
     ).all()
     
-    # Her kurs için duyuruları al (creator ile birlikte)
-    for enrollment in enrollments:
-        enrollment.course.announcements = CourseAnnouncement.query.options(
-            joinedload(CourseAnnouncement.creator)
-        ).filter_by(
-            course_id=enrollment.course.id
-        ).order_by(CourseAnnouncement.created_at.desc()).all()
+    # Her kurs için duyurular (creator ile birlikte) ve emoji tepki sayıları
+    announcements = CourseAnnouncement.for_courses(enrollment.course_id for enrollment in enrollments)
+    reaction_counts = CourseAnnouncement.reaction_counts(
+        announcement.id for course_announcements in announcements.values() for announcement in course_announcements
+    )
     
-    return render_template('student/courses.html', enrollments=enrollments)
+    return render_template('student/courses.html',
+                         enrollments=enrollments,
+                         announcements=announcements,
+                         reaction_counts=reaction_counts)
 
 @student.route('/announcements/<int:announcement_id>/react', methods=['POST'])
 @login_required
@@ -139,25 +148,13 @@ def react_to_announcement(announcement_id):
         flash('Emoji seçmelisiniz.', 'error')
         return redirect(url_for('student.courses'))
     
+    if len(emoji) > 10:
+        flash('Geçersiz emoji.', 'error')
+        return redirect(url_for('student.courses'))
+    
     try:
-        # Önceki tepkiyi kontrol et
-        existing_reaction = AnnouncementReaction.query.filter_by(
-            announcement_id=announcement_id,
-            student_id=current_user.id
-        ).first()
-        
-        if existing_reaction:
-            # Mevcut tepkiyi güncelle
-            existing_reaction.emoji = emoji
-        else:
-            # Yeni tepki oluştur
-            reaction = AnnouncementReaction(
-                announcement_id=announcement_id,
-                student_id=current_user.id,
-                emoji=emoji
-            )
-            db.session.add(reaction)
-        
+        # Tepkiyi tek ifadede ekle/güncelle, emoji sayaçlarını aynı transaction'da güncelle
+        AnnouncementReaction.react(announcement_id, current_user.id, emoji)
         db.session.commit()
         flash('Emoji tepkiniz kaydedildi.', 'success')
         
@@ -171,16 +168,11 @@ def react_to_announcement(announcement_id):
 def send_profile_update_email(user, profile):
     """Profil güncelleme email bildirimi gönder"""
     try:
-        msg = Message(
-            subject='Profil Güncelleme Bildirimi',
-            recipients=[user.email]
-        )
-        
         # HTML email template'ini kullan
-        msg.html = render_template('emails/profile_update.html', profile=profile)
+        html = render_template('emails/profile_update.html', profile=profile)
         
         # Plain text alternatifi
-        msg.body = f"""
+        body = f"""
 Merhaba {profile.first_name} {profile.last_name},
 
 Profil bilgileriniz başarıyla güncellendi.
@@ -197,8 +189,11 @@ Saygılarımızla,
 Dil Kursu Yönetimi
         """.strip()
         
-        mail.send(msg)
-        print(f"Profile update email sent to {user.email}")
+        # Email kuyruğa alınır, arka plan göndericisi iletir
+        queue_email('Profil Güncelleme Bildirimi', [user.email], body=body, html=html)
+        db.session.commit()
+        print(f"Profile update email queued for {user.email}")
     except Exception as e:
+        db.session.rollback()
         print(f"Email sending error: {e}")
         # Email gönderilemese bile işlemi durdurma 
\ No newline at end of file
@@ -37,6 +37,60 @@ class Config:
     # Uygulama ayarları
     COURSES_PER_PAGE = int(os.environ.get('COURSES_PER_PAGE', 10))
     STUDENTS_PER_PAGE = int(os.environ.get('STUDENTS_PER_PAGE', 20))
+    PAYMENTS_PER_PAGE = int(os.environ.get('PAYMENTS_PER_PAGE', 20))
+    PAYMENT_IMPORT_CHUNK_SIZE = int(os.environ.get('PAYMENT_IMPORT_CHUNK_SIZE', 1000))
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    # Toplu silmelerde tek transaction'da silinecek en fazla satır; daha büyük
+    # silmeler parça parça commit edilir ki kilitler uzun süre tutulmasın
+    DELETE_CHUNK_SIZE = int(os.environ.get('DELETE_CHUNK_SIZE', 5000))
+
+    # Cache ayarları (tüm worker'lar arasında paylaşılan SQLite dosyası)
+    SHARED_CACHE_PATH = os.environ.get('SHARED_CACHE_PATH')
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 60))
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+
+    # İstek sınırları (sayaçlar paylaşılan cache dosyasında tutulur)
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'true').lower() in ['true', 'on', '1']
+    RATELIMIT_PERIOD = int(os.environ.get('RATELIMIT_PERIOD', 60))
+    ADMIN_RATE_LIMIT = int(os.environ.get('ADMIN_RATE_LIMIT', 30))
+    STUDENT_RATE_LIMIT = int(os.environ.get('STUDENT_RATE_LIMIT', 20))
+    # Admin arama kutuları (typeahead) her tuş vuruşunda istek atar; ayrı kota
+    ADMIN_SEARCH_RATE_LIMIT = int(os.environ.get('ADMIN_SEARCH_RATE_LIMIT', 120))
+    # Giriş yapmış kullanıcılar ayrıca IP başına bu sınıra tabidir (hesap değiştirerek aşılamasın);
+    # 0 verilirse giriş yapmış kullanıcılar için IP kotası uygulanmaz
+    IP_RATE_LIMIT = int(os.environ.get('IP_RATE_LIMIT', 120))
+    # Uygulamanın önündeki güvenilen ters vekil (nginx, yük dengeleyici) sayısı.
+    # 0 iken X-Forwarded-For/-Proto yok sayılır ve IP kotaları doğrudan bağlanan
+    # adrese uygulanır; vekil arkasında 0 bırakılırsa tüm kullanıcılar vekilin
+    # IP'sini, yani tek bir IP kotasını paylaşır. Vekil yokken 0'dan büyük bir
+    # değer verilirse istemciler başlığı yazarak IP'lerini seçebilir.
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
+    LOGIN_FAILURE_LIMIT = int(os.environ.get('LOGIN_FAILURE_LIMIT', 5))
+    LOGIN_FAILURE_PERIOD = int(os.environ.get('LOGIN_FAILURE_PERIOD', 300))
+
+    # Form taraması: bu uzunluktan büyük alanlar taranmadan reddedilir
+    SECURITY_SCREEN_MAX_VALUE = int(os.environ.get('SECURITY_SCREEN_MAX_VALUE', 256 * 1024))
+
+    # Şifre hash yöntemi ve maliyeti (ör. scrypt:16384:8:1, pbkdf2:sha256:600000).
+    # Farklı parametrelerle saklanmış hash'ler başarılı girişte yenilenir;
+    # değerleri seçmek için: flask benchmark-passwords
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    
+    # İstek başına SQL ölçümü (Server-Timing başlığı ve yavaş sorgu logu)
+    SQL_INSTRUMENTATION = os.environ.get('SQL_INSTRUMENTATION', 'true').lower() in ['true', 'on', '1']
+    SQL_SLOW_QUERY_MS = int(os.environ.get('SQL_SLOW_QUERY_MS', 100))
+    SQL_SLOWEST_STATEMENTS = int(os.environ.get('SQL_SLOWEST_STATEMENTS', 3))
+    # N+1 dedektörü: aynı sorgu bir istekte bu kadar tekrarlanırsa tetikleyen
+    # şablon satırıyla loglanır (geliştirme ortamı için)
+    SQL_NPLUS1_DETECTION = os.environ.get('SQL_NPLUS1_DETECTION', 'false').lower() in ['true', 'on', '1']
+    SQL_NPLUS1_THRESHOLD = int(os.environ.get('SQL_NPLUS1_THRESHOLD', 5))
+    
+    # Koşullu GET (ETag/Last-Modified): değişmeyen sayfalar 304 ile döner.
+    # Sayfa en fazla bu kadar saniye doğrulanır, sonra yeniden üretilir
+    # (WTF_CSRF_TIME_LIMIT'ten küçük olmalı)
+    CONDITIONAL_GET_ENABLED = os.environ.get('CONDITIONAL_GET_ENABLED', 'true').lower() in ['true', 'on', '1']
+    CONDITIONAL_GET_MAX_AGE = int(os.environ.get('CONDITIONAL_GET_MAX_AGE', 300))
     
     # Email ayarları
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
@@ -46,6 +100,14 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', 'noreply@gmail.com')
+    MAIL_TIMEOUT = int(os.environ.get('MAIL_TIMEOUT', 10))
+    
+    # Email kuyruğu (outbox) gönderici ayarları
+    MAIL_OUTBOX_THREAD = os.environ.get('MAIL_OUTBOX_THREAD', 'true').lower() in ['true', 'on', '1']
+    MAIL_OUTBOX_BATCH_SIZE = int(os.environ.get('MAIL_OUTBOX_BATCH_SIZE', 50))
+    MAIL_OUTBOX_INTERVAL = int(os.environ.get('MAIL_OUTBOX_INTERVAL', 5))
+    MAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('MAIL_OUTBOX_MAX_ATTEMPTS', 5))
+    MAIL_OUTBOX_RETRY_DELAY = int(os.environ.get('MAIL_OUTBOX_RETRY_DELAY', 30))
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -78,8 +140,17 @@ class ProductionConfig(Config):
         'pool_size': 10
     }
 
+class TestingConfig(Config):
+    TESTING = True
+    WTF_CSRF_ENABLED = False
+    MAIL_OUTBOX_THREAD = False
+    # Testlerde şifre hash'i hızlı olsun
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite:///test.db')
+
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 } 
\ No newline at end of file
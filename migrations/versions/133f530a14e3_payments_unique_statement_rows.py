@@ -0,0 +1,32 @@
+"""payments unique statement rows
+
+Aynı banka ekstresi satırının (tarih, açıklama, tutar) iki kez
+kaydedilmesini engelleyen tekil index; toplu ekstre kaydı
+``ON CONFLICT DO NOTHING`` ile bu index'e dayanır.
+
+Revision ID: 133f530a14e3
+Revises: 39c81b2c47ec
+Create Date: 2026-10-17 21:06:25.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '133f530a14e3'
+down_revision = '39c81b2c47ec'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    # Tekrarlanan ekstre satırları varsa bu adım başarısız olur; önce temizlenmeleri gerekir
+    if 'uq_payments_date_description_amount' not in {index['name'] for index in inspector.get_indexes('payments')}:
+        op.create_index('uq_payments_date_description_amount', 'payments',
+                        ['transaction_date', 'description', 'amount'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_payments_date_description_amount', table_name='payments')
@@ -0,0 +1,36 @@
+"""payments import batch
+
+Ekstre yüklemesini geri almak için ödemelere yükleme kimliği kolonu ve
+index'i. ``db.create_all()`` ile oluşturulmuş veritabanlarında bunlar zaten
+bulunabilir; yalnızca eksik olanlar eklenir.
+
+Revision ID: 1bf4c3ff69ef
+Revises: 989a6562ffeb
+Create Date: 2026-10-17 21:06:40.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1bf4c3ff69ef'
+down_revision = '989a6562ffeb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if 'import_batch' not in {column['name'] for column in inspector.get_columns('payments')}:
+        with op.batch_alter_table('payments') as batch_op:
+            batch_op.add_column(sa.Column('import_batch', sa.String(length=32), nullable=True))
+    if 'ix_payments_import_batch' not in {index['name'] for index in inspector.get_indexes('payments')}:
+        op.create_index('ix_payments_import_batch', 'payments', ['import_batch'])
+
+
+def downgrade():
+    op.drop_index('ix_payments_import_batch', table_name='payments')
+    with op.batch_alter_table('payments') as batch_op:
+        batch_op.drop_column('import_batch')
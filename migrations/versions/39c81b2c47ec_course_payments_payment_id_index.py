@@ -0,0 +1,29 @@
+"""course_payments.payment_id index
+
+Bekleyen (kursa atanmamış) ödemeleri bulan anti-join için kurs
+ödemelerinin genel ödeme bağlantısına index.
+
+Revision ID: 39c81b2c47ec
+Revises: 469f00b12fbb
+Create Date: 2026-10-17 21:06:20.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '39c81b2c47ec'
+down_revision = '469f00b12fbb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'ix_course_payments_payment_id' not in {index['name'] for index in inspector.get_indexes('course_payments')}:
+        op.create_index('ix_course_payments_payment_id', 'course_payments', ['payment_id'])
+
+
+def downgrade():
+    op.drop_index('ix_course_payments_payment_id', table_name='course_payments')
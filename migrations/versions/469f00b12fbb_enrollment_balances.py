@@ -0,0 +1,48 @@
+"""enrollment balances
+
+Kurs kayıtlarına ödenen toplam ve kalan tutar kolonları eklenir ve mevcut
+kurs ödemelerinden doldurulur. ``db.create_all()`` ile oluşturulmuş
+veritabanlarında kolonlar zaten bulunabilir; o durumda atlanır.
+
+Revision ID: 469f00b12fbb
+Revises: e78f4465ee22
+Create Date: 2026-10-17 21:06:10.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '469f00b12fbb'
+down_revision = 'e78f4465ee22'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    enrollment_columns = {column['name'] for column in inspector.get_columns('course_enrollments')}
+    if 'paid_total' in enrollment_columns:
+        return
+
+    with op.batch_alter_table('course_enrollments') as batch_op:
+        batch_op.add_column(sa.Column('paid_total', sa.Numeric(precision=10, scale=2),
+                                      server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('remaining', sa.Numeric(precision=10, scale=2),
+                                      server_default='0', nullable=False))
+    # flask rebuild-balances ile aynı hesap
+    op.execute(
+        'UPDATE course_enrollments SET '
+        'paid_total = (SELECT COALESCE(SUM(amount), 0) FROM course_payments '
+        'WHERE course_payments.enrollment_id = course_enrollments.id), '
+        'remaining = (SELECT price FROM courses WHERE courses.id = course_enrollments.course_id) - '
+        '(SELECT COALESCE(SUM(amount), 0) FROM course_payments '
+        'WHERE course_payments.enrollment_id = course_enrollments.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('course_enrollments') as batch_op:
+        batch_op.drop_column('remaining')
+        batch_op.drop_column('paid_total')
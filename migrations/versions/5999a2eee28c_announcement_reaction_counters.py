@@ -0,0 +1,55 @@
+"""announcement reaction counters
+
+Öğrenci başına tek tepkiyi garanti eden tekil kısıt ve duyuru başına emoji
+sayaçları tablosu. ``db.create_all()`` ile oluşturulmuş veritabanlarında
+bunlar zaten bulunabilir; yalnızca eksik olanlar eklenir. Yeni eklenen sayaç
+tablosu mevcut tepkilerden doldurulur.
+
+Revision ID: 5999a2eee28c
+Revises: 133f530a14e3
+Create Date: 2026-10-17 21:06:30.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5999a2eee28c'
+down_revision = '133f530a14e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    # Tekrarlanan tepkiler varsa bu adım başarısız olur; önce temizlenmeleri gerekir
+    constraints = {constraint['name'] for constraint in inspector.get_unique_constraints('announcement_reactions')}
+    constraints.update(index['name'] for index in inspector.get_indexes('announcement_reactions'))
+    if 'uq_announcement_reactions_announcement_student' not in constraints:
+        with op.batch_alter_table('announcement_reactions') as batch_op:
+            batch_op.create_unique_constraint('uq_announcement_reactions_announcement_student',
+                                              ['announcement_id', 'student_id'])
+
+    if 'announcement_reaction_counts' not in inspector.get_table_names():
+        op.create_table(
+            'announcement_reaction_counts',
+            sa.Column('announcement_id', sa.Integer(), nullable=False),
+            sa.Column('emoji', sa.String(length=10), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['announcement_id'], ['course_announcements.id']),
+            sa.PrimaryKeyConstraint('announcement_id', 'emoji')
+        )
+        # flask rebuild-reaction-counts ile aynı hesap
+        op.execute(
+            'INSERT INTO announcement_reaction_counts (announcement_id, emoji, count) '
+            'SELECT announcement_id, emoji, COUNT(id) FROM announcement_reactions '
+            'GROUP BY announcement_id, emoji'
+        )
+
+
+def downgrade():
+    op.drop_table('announcement_reaction_counts')
+    with op.batch_alter_table('announcement_reactions') as batch_op:
+        batch_op.drop_constraint('uq_announcement_reactions_announcement_student', type_='unique')
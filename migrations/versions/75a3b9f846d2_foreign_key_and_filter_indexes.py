@@ -0,0 +1,51 @@
+"""foreign key and filter indexes
+
+Yabancı anahtarlar ve sık kullanılan filtre/sıralama kolonları için
+index'ler: öğrenci listesi (rol + kayıt tarihi, rol + durum + email),
+ödeme listesi (aktif + tarih), kurs kayıtları (kurs/öğrenci + aktif),
+duyurular (kurs + tarih) ve alt tabloların yabancı anahtarları. Planlar
+``flask check-query-plans`` ile kontrol edilir.
+
+Revision ID: 75a3b9f846d2
+Revises: 1bf4c3ff69ef
+Create Date: 2026-10-17 21:09:05.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '75a3b9f846d2'
+down_revision = '1bf4c3ff69ef'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_users_role_created_at', 'users', ['role', 'created_at', 'id']),
+    ('ix_users_role_active_email', 'users', ['role', 'is_active', 'email']),
+    ('ix_student_profiles_user_id', 'student_profiles', ['user_id']),
+    ('ix_courses_created_at', 'courses', ['created_at']),
+    ('ix_courses_is_active', 'courses', ['is_active']),
+    ('ix_course_schedules_course_id', 'course_schedules', ['course_id']),
+    ('ix_course_enrollments_course_active_student', 'course_enrollments', ['course_id', 'is_active', 'student_id']),
+    ('ix_course_enrollments_student_active_course', 'course_enrollments', ['student_id', 'is_active', 'course_id']),
+    ('ix_course_payments_enrollment_id', 'course_payments', ['enrollment_id']),
+    ('ix_payments_active_date', 'payments', ['is_active', 'transaction_date', 'id']),
+    ('ix_payments_student_id', 'payments', ['student_id']),
+    ('ix_course_announcements_course_created', 'course_announcements', ['course_id', 'created_at']),
+    ('ix_announcement_reactions_student_id', 'announcement_reactions', ['student_id']),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
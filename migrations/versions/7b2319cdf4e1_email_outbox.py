@@ -0,0 +1,47 @@
+"""email outbox
+
+Arka plan göndericisinin işlediği email kuyruğu tablosu. ``db.create_all()``
+ile oluşturulmuş veritabanlarında tablo zaten bulunabilir; o durumda
+atlanır.
+
+Revision ID: 7b2319cdf4e1
+Revises: 5999a2eee28c
+Create Date: 2026-10-17 21:06:35.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2319cdf4e1'
+down_revision = '5999a2eee28c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'email_outbox' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'email_outbox',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('recipients', sa.Text(), nullable=False),
+            sa.Column('subject', sa.String(length=255), nullable=False),
+            sa.Column('body', sa.Text(), nullable=True),
+            sa.Column('html', sa.Text(), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('claim_token', sa.String(length=32), nullable=True),
+            sa.Column('claimed_at', sa.DateTime(), nullable=True),
+            sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('sent_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_email_outbox_status_next_attempt', 'email_outbox', ['status', 'next_attempt_at'])
+
+
+def downgrade():
+    op.drop_index('ix_email_outbox_status_next_attempt', table_name='email_outbox')
+    op.drop_table('email_outbox')
@@ -0,0 +1,34 @@
+"""users password_hash length
+
+Parametreleriyle birlikte saklanan scrypt hash'leri 162 karakterdir ve
+PostgreSQL'de 128 karakterlik kolona sığmaz; kolon 255 karaktere genişletilir.
+
+Revision ID: 989a6562ffeb
+Revises: 7b2319cdf4e1
+Create Date: 2026-10-17 21:06:38.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '989a6562ffeb'
+down_revision = '7b2319cdf4e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = sa.inspect(op.get_bind()).get_columns('users')
+    password_hash = next(column for column in columns if column['name'] == 'password_hash')
+    if (getattr(password_hash['type'], 'length', None) or 255) < 255:
+        with op.batch_alter_table('users') as batch_op:
+            batch_op.alter_column('password_hash', existing_type=sa.String(length=128),
+                                  type_=sa.String(length=255), existing_nullable=True)
+
+
+def downgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('password_hash', existing_type=sa.String(length=255),
+                              type_=sa.String(length=128), existing_nullable=True)
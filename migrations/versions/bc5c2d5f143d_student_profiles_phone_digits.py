@@ -0,0 +1,58 @@
+"""student_profiles phone_digits
+
+Telefonun son 10 hanesini tutan index'li kolon; öğrenci listesi içe
+aktarılırken telefonlar bu kolon üzerinden ``IN (...)`` ile eşleştirilir.
+Mevcut profiller serbest formatlı ``phone`` kolonundan doldurulur.
+
+Revision ID: bc5c2d5f143d
+Revises: 75a3b9f846d2
+Create Date: 2026-10-17 21:12:30.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bc5c2d5f143d'
+down_revision = '75a3b9f846d2'
+branch_labels = None
+depends_on = None
+
+
+def _normalize_phone(value):
+    # app.models.student_profile.normalize_phone ile aynı kural
+    digits = re.sub(r'\D', '', value or '')
+    return digits[-10:] if len(digits) >= 10 else None
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if 'phone_digits' not in {column['name'] for column in inspector.get_columns('student_profiles')}:
+        with op.batch_alter_table('student_profiles') as batch_op:
+            batch_op.add_column(sa.Column('phone_digits', sa.String(length=10), nullable=True))
+    if 'ix_student_profiles_phone_digits' not in {index['name'] for index in inspector.get_indexes('student_profiles')}:
+        op.create_index('ix_student_profiles_phone_digits', 'student_profiles', ['phone_digits'])
+
+    profiles = sa.table('student_profiles', sa.column('id'), sa.column('phone'), sa.column('phone_digits'))
+    rows = bind.execute(sa.select(profiles.c.id, profiles.c.phone).where(
+        profiles.c.phone.isnot(None), profiles.c.phone_digits.is_(None)
+    )).all()
+    updates = [{'profile_id': profile_id, 'digits': _normalize_phone(phone)} for profile_id, phone in rows]
+    updates = [update for update in updates if update['digits']]
+    if updates:
+        bind.execute(
+            profiles.update().where(profiles.c.id == sa.bindparam('profile_id'))
+            .values(phone_digits=sa.bindparam('digits')),
+            updates
+        )
+
+
+def downgrade():
+    op.drop_index('ix_student_profiles_phone_digits', table_name='student_profiles')
+    with op.batch_alter_table('student_profiles') as batch_op:
+        batch_op.drop_column('phone_digits')
@@ -0,0 +1,191 @@
+"""baseline schema
+
+İlk sürümün tabloları. Bu sürümler eklenmeden önce şema ``db.create_all()``
+ile oluşturuluyordu; mevcut veritabanlarında tablolar zaten bulunduğu için
+yalnızca eksik olanlar oluşturulur.
+
+Revision ID: e78f4465ee22
+Revises:
+Create Date: 2026-10-17 21:04:12.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e78f4465ee22'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('password_hash', sa.String(length=128), nullable=True),
+            sa.Column('role', sa.String(length=20), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('reset_token', sa.String(length=100), nullable=True),
+            sa.Column('reset_token_expires', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email'),
+            sa.UniqueConstraint('reset_token')
+        )
+
+    if 'admin_profiles' not in existing:
+        op.create_table(
+            'admin_profiles',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('first_name', sa.String(length=50), nullable=True),
+            sa.Column('last_name', sa.String(length=50), nullable=True),
+            sa.Column('phone', sa.String(length=20), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id')
+        )
+
+    if 'student_profiles' not in existing:
+        op.create_table(
+            'student_profiles',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('first_name', sa.String(length=64), nullable=False),
+            sa.Column('last_name', sa.String(length=64), nullable=False),
+            sa.Column('birth_date', sa.Date(), nullable=True),
+            sa.Column('gender', sa.String(length=10), nullable=True),
+            sa.Column('phone', sa.String(length=20), nullable=True),
+            sa.Column('address', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'courses' not in existing:
+        op.create_table(
+            'courses',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('instructor_name', sa.String(length=100), nullable=False),
+            sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('is_deleted', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'course_schedules' not in existing:
+        op.create_table(
+            'course_schedules',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('course_id', sa.Integer(), nullable=False),
+            sa.Column('day_of_week', sa.String(length=20), nullable=False),
+            sa.Column('start_time', sa.Time(), nullable=False),
+            sa.Column('end_time', sa.Time(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'course_enrollments' not in existing:
+        op.create_table(
+            'course_enrollments',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('course_id', sa.Integer(), nullable=False),
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('enrolled_at', sa.DateTime(), nullable=True),
+            sa.Column('enrolled_by', sa.Integer(), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+            sa.ForeignKeyConstraint(['enrolled_by'], ['users.id']),
+            sa.ForeignKeyConstraint(['student_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'payments' not in existing:
+        op.create_table(
+            'payments',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('transaction_date', sa.Date(), nullable=False),
+            sa.Column('description', sa.String(length=200), nullable=False),
+            sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column('payment_type', sa.String(length=50), nullable=True),
+            sa.Column('student_id', sa.Integer(), nullable=True),
+            sa.Column('created_by', sa.Integer(), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+            sa.ForeignKeyConstraint(['student_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'course_payments' not in existing:
+        op.create_table(
+            'course_payments',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('enrollment_id', sa.Integer(), nullable=False),
+            sa.Column('payment_id', sa.Integer(), nullable=True),
+            sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+            sa.Column('payment_date', sa.Date(), nullable=False),
+            sa.Column('payment_method', sa.String(length=50), nullable=True),
+            sa.Column('notes', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('created_by', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+            sa.ForeignKeyConstraint(['enrollment_id'], ['course_enrollments.id']),
+            sa.ForeignKeyConstraint(['payment_id'], ['payments.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'course_announcements' not in existing:
+        op.create_table(
+            'course_announcements',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('course_id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=200), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('created_by', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+            sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'announcement_reactions' not in existing:
+        op.create_table(
+            'announcement_reactions',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('announcement_id', sa.Integer(), nullable=False),
+            sa.Column('student_id', sa.Integer(), nullable=False),
+            sa.Column('emoji', sa.String(length=10), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['announcement_id'], ['course_announcements.id']),
+            sa.ForeignKeyConstraint(['student_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('announcement_reactions')
+    op.drop_table('course_announcements')
+    op.drop_table('course_payments')
+    op.drop_table('payments')
+    op.drop_table('course_enrollments')
+    op.drop_table('course_schedules')
+    op.drop_table('courses')
+    op.drop_table('student_profiles')
+    op.drop_table('admin_profiles')
+    op.drop_table('users')
@@ -0,0 +1,73 @@
+import os
+import tempfile
+
+import pytest
+
+# Config ortam değişkenleri import sırasında okunur; uygulama import
+# edilmeden önce geçici veritabanı ve cache dosyaları ayarlanır
+_TMP = tempfile.mkdtemp(prefix='student-registration-tests-')
+DB_PATH = os.path.join(_TMP, 'test.db')
+CACHE_PATH = os.path.join(_TMP, 'cache.sqlite3')
+os.environ.setdefault('SECRET_KEY', 'test-secret-key')
+os.environ['TEST_DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+os.environ['SHARED_CACHE_PATH'] = CACHE_PATH
+
+from app import cache, create_app, create_default_admin, db, user_cache  # noqa: E402
+
+
+def _remove_files():
+    for path in (DB_PATH, CACHE_PATH):
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+@pytest.fixture
+def bare_app():
+    """Şeması oluşturulmamış boş veritabanına bağlı uygulama"""
+    _remove_files()
+    app = create_app('testing')
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+    # Cache nesneleri modül seviyesinde; sonraki test silinen dosyaya yazmasın
+    conn = getattr(cache._local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        cache._local.conn = None
+    user_cache._entries.clear()
+    _remove_files()
+
+
+@pytest.fixture
+def app(bare_app):
+    """Şeması, varsayılan admin'i ve arama indeksi hazır uygulama"""
+    from app.search import create_search_index
+
+    db.create_all()
+    create_default_admin()
+    create_search_index(bare_app)
+    return bare_app
+
+
+@pytest.fixture
+def seed(app):
+    """Küçük ölçekli sentetik veri üretir: ``seed(students=..., courses=..., ...)``"""
+    from app.seeding import DataSeeder
+
+    def run(students=30, courses=4, payments=100, **options):
+        DataSeeder(seed=1, batch_size=500).run(students, courses, payments, **options)
+
+    return run
+
+
+@pytest.fixture
+def get(app):
+    """Rol adına GET isteği: ``get('admin', url)`` veya ``get(öğrenci_id, url)``"""
+    from app.query_plans import logged_in_requests
+
+    with logged_in_requests() as get:
+        yield get
+
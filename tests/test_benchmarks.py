@@ -0,0 +1,50 @@
+from app import db
+from app.admin.deletes import find_orphans
+from app.benchmarks import benchmark_routes, compare_to_baseline, load_baseline, save_baseline, table_counts
+from app.models.course import CourseEnrollment
+from app.query_plans import hot_requests
+from app.search import student_search
+
+
+def test_seeder_generates_consistent_data(seed):
+    seed(students=20, courses=3, payments=50)
+
+    counts = table_counts()
+    assert (counts['users'], counts['student_profiles'], counts['courses'], counts['payments']) == (21, 20, 3, 50)
+    assert counts['course_enrollments'] and counts['course_payments'] and counts['announcement_reactions']
+    # Toplu INSERT'ten sonra bakiyeler, sayaçlar ve arama indeksi yeniden oluşturulur
+    assert find_orphans() == []
+    assert CourseEnrollment.find_balance_mismatches() == []
+    assert db.session.scalar(db.select(db.func.count()).select_from(student_search)) == 20
+
+
+def test_benchmark_routes_and_baseline(seed, tmp_path):
+    seed(students=20, courses=3, payments=50)
+
+    results = benchmark_routes(hot_requests(), iterations=2)
+    assert all(result['status'] == 200 for result in results.values())
+    # Route adları id içermez; farklı veriyle ölçülen baseline'la karşılaştırılabilir
+    assert results['admin.manage_course']['queries'] > 0
+
+    path = tmp_path / 'route-benchmark.json'
+    save_baseline(path, results, table_counts(), 2)
+    baseline = load_baseline(path)
+    assert baseline['routes'] == results
+    assert compare_to_baseline(results, baseline, tolerance=0.5) == []
+
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = {'routes': {
+        'admin.students': {'p50_ms': 20.0, 'queries': 4},
+        'admin.payments': {'p50_ms': 1.0, 'queries': 3},
+    }}
+    results = {
+        'admin.students': {'p50_ms': 31.0, 'queries': 5},
+        # Gürültü payı içindeki artış gerileme sayılmaz
+        'admin.payments': {'p50_ms': 5.0, 'queries': 3},
+        'admin.courses': {'p50_ms': 500.0, 'queries': 50},
+    }
+    assert compare_to_baseline(results, baseline, tolerance=0.5) == [
+        'admin.students: sorgu sayısı 4 -> 5',
+        'admin.students: p50 20.0ms -> 31.0ms',
+    ]
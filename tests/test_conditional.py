@@ -0,0 +1,154 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app import db
+from app.conditional import table_versions
+from app.models.course import Course, CourseAnnouncement, CourseEnrollment, CoursePayment
+from app.models.payment import Payment
+from app.models.student_profile import StudentProfile
+from app.models.user import User
+
+
+@pytest.fixture
+def data(app):
+    """Tek kurs, kayıtlı bir öğrenci, atanmış bir ve bekleyen bir ödeme"""
+    # Testler zaman dilimi sınırına denk gelip ETag'i değiştirmesin
+    app.config.update(CONDITIONAL_GET_MAX_AGE=10 ** 9)
+    admin_id = db.session.scalar(db.select(User.id).where(User.role == 'admin'))
+    course = Course(name='Piyano', instructor_name='Eğitmen', price=1000)
+    student = User(email='ogrenci@ornek.com', role='student')
+    student.set_password('ogrenci123')
+    db.session.add_all([course, student])
+    db.session.flush()
+    profile = StudentProfile(user_id=student.id, first_name='Ali', last_name='Yılmaz')
+    enrollment = CourseEnrollment(course_id=course.id, student_id=student.id, enrolled_by=admin_id)
+    payments = [
+        Payment(transaction_date=date(2024, 1, day), description=f'Ödeme {day}', amount=100, created_by=admin_id)
+        for day in (1, 2)
+    ]
+    db.session.add_all([profile, enrollment, *payments])
+    db.session.flush()
+    course_payment = CoursePayment(enrollment_id=enrollment.id, payment_id=payments[0].id, amount=100,
+                                   payment_date=payments[0].transaction_date, created_by=admin_id)
+    db.session.add(course_payment)
+    db.session.commit()
+    return SimpleNamespace(admin_id=admin_id, course_id=course.id, student_id=student.id, profile_id=profile.id,
+                           enrollment_id=enrollment.id, course_payment_id=course_payment.id,
+                           pending_payment_id=payments[1].id)
+
+
+def _pages(data):
+    return {
+        'student.courses': (data.student_id, '/student/courses'),
+        'admin.manage_course': ('admin', f'/admin/courses/{data.course_id}/manage'),
+        'admin.payments': ('admin', '/admin/payments'),
+    }
+
+
+def rename_course(data):
+    db.session.get(Course, data.course_id).name = 'Keman'
+
+
+def change_price(data):
+    db.session.get(Course, data.course_id).price = 1500
+
+
+def add_announcement(data):
+    db.session.add(CourseAnnouncement(course_id=data.course_id, title='Duyuru', content='İçerik',
+                                      created_by=data.admin_id))
+
+
+def rename_student(data):
+    db.session.get(StudentProfile, data.profile_id).first_name = 'Veli'
+
+
+def assign_payment(data):
+    payment = db.session.get(Payment, data.pending_payment_id)
+    db.session.add(CoursePayment(enrollment_id=data.enrollment_id, payment_id=payment.id, amount=payment.amount,
+                                 payment_date=payment.transaction_date, created_by=data.admin_id))
+
+
+def delete_payment(data):
+    db.session.delete(db.session.get(CoursePayment, data.course_payment_id))
+
+
+def add_payment(data):
+    db.session.add(Payment(transaction_date=date(2024, 2, 1), description='Yeni ödeme', amount=250,
+                           created_by=data.admin_id))
+
+
+@pytest.mark.parametrize('page', ['student.courses', 'admin.manage_course', 'admin.payments'])
+def test_unchanged_page_is_not_modified(data, get, page):
+    role, url = _pages(data)[page]
+    response = get(role, url)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    response = get(role, url, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+    assert response.headers['ETag'] == etag
+
+
+@pytest.mark.parametrize('page, write', [
+    ('student.courses', rename_course),
+    ('student.courses', change_price),
+    ('student.courses', add_announcement),
+    ('student.courses', assign_payment),
+    ('student.courses', delete_payment),
+    ('admin.manage_course', rename_course),
+    ('admin.manage_course', rename_student),
+    ('admin.manage_course', add_announcement),
+    ('admin.manage_course', assign_payment),
+    ('admin.manage_course', delete_payment),
+    ('admin.payments', add_payment),
+    ('admin.payments', rename_student),
+    ('admin.payments', assign_payment),
+    ('admin.payments', delete_payment),
+])
+def test_write_changes_etag(data, get, page, write):
+    role, url = _pages(data)[page]
+    etag = get(role, url).headers['ETag']
+
+    write(data)
+    db.session.commit()
+
+    response = get(role, url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+@pytest.mark.parametrize('write', [assign_payment, delete_payment, change_price])
+def test_balance_writes_bump_enrollments(data, write):
+    # Bakiye mapper olaylarında connection.execute ile yazılır; flush'ta görünmez
+    before = table_versions('course_enrollments')
+    write(data)
+    db.session.commit()
+    assert table_versions('course_enrollments') != before
+
+
+def test_balance_shown_after_payment(data, get):
+    url = '/student/courses'
+    etag = get(data.student_id, url).headers['ETag']
+    assert '900.00 TL' in get(data.student_id, url).get_data(as_text=True)
+
+    assign_payment(data)
+    db.session.commit()
+
+    response = get(data.student_id, url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert '800.00 TL' in response.get_data(as_text=True)
+
+
+@pytest.mark.parametrize('page', ['student.courses', 'admin.manage_course', 'admin.payments'])
+def test_pending_flash_skips_validation(data, get, page):
+    role, url = _pages(data)[page]
+    etag = get(role, url).headers['ETag']
+
+    # Bekleyen flash mesajı gösterilmeli; sayfa 304 ile atlanmaz
+    response = get(role, url, headers={'If-None-Match': etag},
+                   session_data={'_flashes': [('success', 'Kayıt başarıyla güncellendi')]})
+    assert response.status_code == 200
+    assert 'Kayıt başarıyla güncellendi' in response.get_data(as_text=True)
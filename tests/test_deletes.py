@@ -0,0 +1,115 @@
+import pytest
+
+from app import db
+from app.admin.deletes import delete_courses, delete_payments, delete_students, find_orphans
+from app.models.course import (
+    AnnouncementReaction, AnnouncementReactionCount, Course, CourseAnnouncement, CourseEnrollment, CoursePayment
+)
+from app.models.payment import Payment
+from app.models.user import User
+
+
+@pytest.fixture
+def seeded(app, seed):
+    # Küçük parça boyutu parçalı silmeleri ve ara commit'leri de çalıştırır
+    app.config['DELETE_CHUNK_SIZE'] = 7
+    seed()
+    assert find_orphans() == []
+    return app
+
+
+def _reaction_totals():
+    """Tepki tablosundan ve sayaç tablosundan hesaplanan toplam tepki sayıları"""
+    reactions = db.session.scalar(db.select(db.func.count(AnnouncementReaction.id)))
+    counters = db.session.scalar(db.select(db.func.coalesce(db.func.sum(AnnouncementReactionCount.count), 0)))
+    return reactions, counters
+
+
+def _assert_consistent():
+    db.session.expire_all()
+    assert find_orphans() == []
+    assert CourseEnrollment.find_balance_mismatches() == []
+    reactions, counters = _reaction_totals()
+    assert reactions == counters
+
+
+def test_delete_students(seeded):
+    student_ids = db.session.scalars(
+        db.select(AnnouncementReaction.student_id).distinct().order_by(AnnouncementReaction.student_id).limit(5)
+    ).all()
+    reactions_before, _ = _reaction_totals()
+
+    counts = delete_students(student_ids)
+    db.session.commit()
+
+    assert counts['users'] == len(student_ids)
+    assert counts['announcement_reactions'] > 0
+    assert _reaction_totals()[0] == reactions_before - counts['announcement_reactions']
+    assert db.session.scalar(db.select(db.func.count(User.id)).where(User.id.in_(student_ids))) == 0
+    assert db.session.scalar(db.select(db.func.count(Payment.id)).where(Payment.student_id.in_(student_ids))) == 0
+    _assert_consistent()
+
+
+def test_delete_courses(seeded):
+    course_ids = db.session.scalars(db.select(Course.id).order_by(Course.id).limit(2)).all()
+    announcement_ids = db.session.scalars(
+        db.select(CourseAnnouncement.id).where(CourseAnnouncement.course_id.in_(course_ids))
+    ).all()
+
+    counts = delete_courses(course_ids)
+    db.session.commit()
+
+    assert counts['courses'] == 2
+    assert counts['course_enrollments'] > 0
+    assert db.session.scalar(
+        db.select(db.func.count()).select_from(AnnouncementReactionCount).where(
+            AnnouncementReactionCount.announcement_id.in_(announcement_ids)
+        )
+    ) == 0
+    _assert_consistent()
+
+
+def test_delete_payments_rebuilds_balances(seeded):
+    rows = db.session.execute(
+        db.select(CoursePayment.payment_id, CoursePayment.enrollment_id).where(CoursePayment.payment_id.isnot(None))
+        .order_by(CoursePayment.payment_id).limit(20)
+    ).all()
+    payment_ids = [payment_id for payment_id, _ in rows]
+    enrollment_ids = {enrollment_id for _, enrollment_id in rows}
+    paid_before = dict(db.session.execute(
+        db.select(CourseEnrollment.id, CourseEnrollment.paid_total).where(CourseEnrollment.id.in_(enrollment_ids))
+    ).all())
+
+    progress = delete_payments(payment_ids)
+
+    assert sum(chunk['payments'] for chunk in progress) == len(payment_ids)
+    assert len(progress) == 3
+    paid_after = dict(db.session.execute(
+        db.select(CourseEnrollment.id, CourseEnrollment.paid_total).where(CourseEnrollment.id.in_(enrollment_ids))
+    ).all())
+    assert all(paid_after[enrollment_id] < paid_before[enrollment_id] for enrollment_id in enrollment_ids)
+    _assert_consistent()
+
+
+def test_delete_payments_by_criteria(seeded):
+    progress = delete_payments(criteria=(Payment.id <= 30,))
+
+    assert sum(chunk['payments'] for chunk in progress) == 30
+    assert db.session.scalar(db.select(db.func.count(Payment.id)).where(Payment.id <= 30)) == 0
+    _assert_consistent()
+
+
+def test_delete_payments_by_import_batch(seeded):
+    db.session.execute(db.update(Payment).where(Payment.id.between(41, 60)).values(import_batch='ekstre-1'))
+    db.session.commit()
+
+    progress = delete_payments(criteria=(Payment.import_batch == 'ekstre-1',))
+
+    assert [chunk['payments'] for chunk in progress] == [7, 7, 6]
+    assert db.session.scalar(db.select(db.func.count(Payment.id)).where(Payment.id.between(41, 60))) == 0
+    _assert_consistent()
+
+
+def test_delete_payments_requires_selection(seeded):
+    with pytest.raises(ValueError):
+        delete_payments()
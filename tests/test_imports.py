@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.admin.imports import match_roster
+from app.models.student_profile import StudentProfile
+from app.models.user import User
+
+
+def _add_student(email, phone):
+    user = User(email=email, role='student')
+    user.set_password('ogrenci123')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(StudentProfile(user_id=user.id, first_name='Ali', last_name='Yılmaz', phone=phone))
+    return user.id
+
+
+@pytest.fixture
+def students(app):
+    ids = {
+        'ali': _add_student('ali@ornek.com', '0555 123 45 67'),
+        'ayse': _add_student('ayse@ornek.com', '+90 (532) 111-22-33'),
+        # Aynı telefonu paylaşan kardeşler telefonla eşleştirilemez
+        'can': _add_student('can@ornek.com', '05440000000'),
+        'cem': _add_student('cem@ornek.com', '544 000 00 00'),
+    }
+    db.session.commit()
+    return ids
+
+
+def test_phone_digits_follow_phone(students):
+    profile = StudentProfile.query.filter_by(user_id=students['ali']).one()
+    assert profile.phone_digits == '5551234567'
+    profile.phone = '123'
+    assert profile.phone_digits is None
+
+
+def test_match_roster_by_email_and_phone(students):
+    matched, unknown = match_roster(['AYSE@ornek.com', '+905551234567', '5440000000', '0500 000 00 00', 'x@ornek.com'])
+    assert matched == {'AYSE@ornek.com': students['ayse'], '+905551234567': students['ali']}
+    assert unknown == ['5440000000', '0500 000 00 00', 'x@ornek.com']
+
+
+def test_match_roster_filters_phones_in_sql(students):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        match_roster(['5321112233'])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    (statement, parameters), = statements
+    assert 'phone_digits IN' in statement
+    assert '5321112233' in parameters
@@ -0,0 +1,181 @@
+import smtplib
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.mailer import claim_batch, deliver_batch, deliver_pending, delivery_stats, queue_email
+from app.models.outbox import OutboxEmail
+
+
+class FakeSMTP:
+    """``smtplib.SMTP`` yerine geçen, gönderilenleri kaydeden sahte sunucu"""
+
+    connections = []
+    refused = set()
+    unreachable = False
+
+    def __init__(self, host, port, timeout=None):
+        if FakeSMTP.unreachable:
+            raise ConnectionRefusedError('SMTP sunucusuna bağlanılamadı')
+        self.timeout = timeout
+        self.sent = []
+        self.closed = False
+        FakeSMTP.connections.append(self)
+
+    def set_debuglevel(self, level):
+        pass
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def sendmail(self, sender, recipients, message, mail_options=(), rcpt_options=()):
+        refused = {address: (550, b'Mailbox unavailable') for address in recipients if address in FakeSMTP.refused}
+        if refused:
+            raise smtplib.SMTPRecipientsRefused(refused)
+        self.sent.extend(recipients)
+
+    def quit(self):
+        self.closed = True
+
+
+def _queue(count):
+    for index in range(count):
+        queue_email(f'Konu {index}', [f'ogrenci{index}@ornek.com'], body='İçerik')
+    db.session.commit()
+
+
+def _emails():
+    db.session.expire_all()
+    return OutboxEmail.query.order_by(OutboxEmail.id).all()
+
+
+def _make_due():
+    db.session.execute(db.update(OutboxEmail).values(next_attempt_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.session.commit()
+
+
+@pytest.fixture
+def smtp(app, monkeypatch):
+    """Gönderimi bastırmadan SMTP yerine ``FakeSMTP`` kullan"""
+    monkeypatch.setattr(app.extensions['mail'], 'suppress', False)
+    monkeypatch.setattr(smtplib, 'SMTP', FakeSMTP)
+    monkeypatch.setattr(FakeSMTP, 'connections', [])
+    monkeypatch.setattr(FakeSMTP, 'refused', set())
+    monkeypatch.setattr(FakeSMTP, 'unreachable', False)
+    return FakeSMTP
+
+
+def test_delivery_stats_accumulate_across_runs(app):
+    # TESTING açıkken Flask-Mail gönderimi bastırır; SMTP'ye bağlanılmaz
+    assert delivery_stats() is None
+
+    _queue(3)
+    totals = deliver_pending(batch_size=2)
+    assert (totals['claimed'], totals['sent'], totals['failed']) == (3, 3, 0)
+
+    _queue(2)
+    deliver_pending(batch_size=2)
+
+    stats = delivery_stats()
+    assert (stats['batches'], stats['claimed'], stats['sent'], stats['retried'], stats['failed']) == (3, 5, 5, 0, 0)
+    assert stats['per_second'] > 0
+    assert stats['avg_latency'] >= 0
+    assert stats['last_batch']['sent'] == 2
+    assert OutboxEmail.query.filter_by(status='sent').count() == 5
+
+
+def test_empty_queue_records_nothing(app):
+    assert deliver_pending()['claimed'] == 0
+    assert delivery_stats() is None
+
+
+def test_one_connection_per_batch(app, smtp):
+    _queue(5)
+    totals = deliver_pending(batch_size=2)
+
+    assert (totals['claimed'], totals['sent']) == (5, 5)
+    assert [connection.sent for connection in smtp.connections] == [
+        ['ogrenci0@ornek.com', 'ogrenci1@ornek.com'],
+        ['ogrenci2@ornek.com', 'ogrenci3@ornek.com'],
+        ['ogrenci4@ornek.com'],
+    ]
+    assert all(connection.closed for connection in smtp.connections)
+    assert all(connection.timeout == app.config['MAIL_TIMEOUT'] for connection in smtp.connections)
+    assert delivery_stats()['batches'] == 3
+
+
+def test_refused_recipient_retries_with_backoff(app, smtp):
+    app.config.update(MAIL_OUTBOX_RETRY_DELAY=30)
+    smtp.refused.add('ogrenci1@ornek.com')
+    _queue(3)
+
+    before = datetime.utcnow()
+    stats = deliver_batch()
+    # Reddedilen alıcı diğerlerini durdurmaz; aynı bağlantıyla devam edilir
+    assert (stats['claimed'], stats['sent'], stats['retried'], stats['failed']) == (3, 2, 1, 0)
+    assert [connection.sent for connection in smtp.connections] == [['ogrenci0@ornek.com', 'ogrenci2@ornek.com']]
+
+    refused = _emails()[1]
+    assert (refused.status, refused.attempts, refused.claim_token) == ('pending', 1, None)
+    assert 'Mailbox unavailable' in refused.last_error
+    assert 30 <= (refused.next_attempt_at - before).total_seconds() < 35
+
+    # Süresi gelmeden tekrar denenmez
+    assert deliver_batch()['claimed'] == 0
+
+    _make_due()
+    before = datetime.utcnow()
+    stats = deliver_batch()
+    assert (stats['claimed'], stats['retried']) == (1, 1)
+    refused = _emails()[1]
+    assert refused.attempts == 2
+    assert 60 <= (refused.next_attempt_at - before).total_seconds() < 65
+
+    totals = delivery_stats()
+    assert (totals['batches'], totals['claimed'], totals['sent'], totals['retried'], totals['failed']) == (2, 4, 2, 2, 0)
+
+
+def test_connection_error_retries_whole_batch(app, smtp):
+    app.config.update(MAIL_OUTBOX_MAX_ATTEMPTS=2, MAIL_OUTBOX_RETRY_DELAY=30)
+    smtp.unreachable = True
+    _queue(3)
+
+    # Sunucuya ulaşılamıyorsa deliver_pending sonraki grupları denemez
+    totals = deliver_pending(batch_size=2)
+    assert (totals['claimed'], totals['sent'], totals['retried']) == (2, 0, 2)
+    emails = _emails()
+    assert [(email.status, email.attempts) for email in emails] == [('pending', 1), ('pending', 1), ('pending', 0)]
+    assert all('bağlanılamadı' in email.last_error for email in emails[:2])
+
+    # Son denemede de bağlanılamazsa email kalıcı olarak başarısız olur
+    _make_due()
+    stats = deliver_batch(batch_size=2)
+    assert (stats['retried'], stats['failed']) == (0, 2)
+    assert [(email.status, email.attempts) for email in _emails()] == [('failed', 2), ('failed', 2), ('pending', 0)]
+
+    totals = delivery_stats()
+    assert (totals['batches'], totals['claimed'], totals['sent'], totals['retried'], totals['failed']) == (2, 4, 0, 2, 2)
+    assert totals['per_second'] == 0.0
+
+
+def test_claim_batch_does_not_double_claim(app):
+    _queue(3)
+
+    first = claim_batch(2)
+    second = claim_batch(2)
+    assert [email.recipients for email in first] == ['ogrenci0@ornek.com', 'ogrenci1@ornek.com']
+    assert [email.recipients for email in second] == ['ogrenci2@ornek.com']
+    assert first[0].claim_token != second[0].claim_token
+    assert claim_batch(2) == []
+
+    # Çöken göndericinin bıraktığı eski işaretler tekrar alınır
+    db.session.execute(
+        db.update(OutboxEmail).where(OutboxEmail.id == first[0].id)
+        .values(claimed_at=datetime.utcnow() - timedelta(minutes=11))
+    )
+    db.session.commit()
+    assert [email.id for email in claim_batch(2)] == [first[0].id]
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+from flask_migrate import check, downgrade, upgrade
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
+
+
+def test_upgrade_matches_models(bare_app):
+    upgrade(directory=MIGRATIONS)
+    # Modellerle migration'lar arasında fark varsa check() çıkış koduyla biter
+    check(directory=MIGRATIONS)
+
+
+def test_downgrade_to_base(bare_app):
+    from app import db
+
+    upgrade(directory=MIGRATIONS)
+    downgrade(directory=MIGRATIONS, revision='base')
+    tables = set(db.inspect(db.engine).get_table_names()) - {'alembic_version'}
+    assert tables == set()
+
+
+def test_upgrade_existing_create_all_database(bare_app):
+    """``db.create_all()`` ile oluşturulmuş veritabanı migration'larla hatasız güncellenir"""
+    from app import db
+
+    db.create_all()
+    upgrade(directory=MIGRATIONS)
+    check(directory=MIGRATIONS)
+
+
+def _execute(*statements):
+    from app import db
+
+    with db.engine.begin() as conn:
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+
+
+def test_balances_backfilled_from_course_payments(bare_app):
+    from app import db
+
+    upgrade(directory=MIGRATIONS, revision='e78f4465ee22')
+    _execute(
+        "INSERT INTO users (id, email, role) VALUES (1, 'admin@x.com', 'admin'), (2, 'ogrenci@x.com', 'student')",
+        "INSERT INTO courses (id, name, instructor_name, price) VALUES (1, 'Piyano', 'Hoca', 1000)",
+        "INSERT INTO course_enrollments (id, course_id, student_id, enrolled_by) VALUES (1, 1, 2, 1)",
+        "INSERT INTO course_payments (enrollment_id, amount, payment_date, created_by) "
+        "VALUES (1, 300, '2026-01-01', 1), (1, 100, '2026-02-01', 1)",
+    )
+    upgrade(directory=MIGRATIONS)
+
+    with db.engine.connect() as conn:
+        paid_total, remaining = conn.exec_driver_sql(
+            'SELECT paid_total, remaining FROM course_enrollments WHERE id = 1'
+        ).one()
+    assert (float(paid_total), float(remaining)) == (400, 600)
+
+
+def test_reaction_counts_backfilled_from_reactions(bare_app):
+    from app import db
+
+    upgrade(directory=MIGRATIONS, revision='133f530a14e3')
+    _execute(
+        "INSERT INTO users (id, email, role) VALUES (1, 'admin@x.com', 'admin'), "
+        "(2, 'a@x.com', 'student'), (3, 'b@x.com', 'student')",
+        "INSERT INTO courses (id, name, instructor_name, price) VALUES (1, 'Piyano', 'Hoca', 1000)",
+        "INSERT INTO course_announcements (id, course_id, title, content, created_by) "
+        "VALUES (1, 1, 'Duyuru', 'İçerik', 1)",
+        "INSERT INTO announcement_reactions (announcement_id, student_id, emoji) "
+        "VALUES (1, 2, '👍'), (1, 3, '👍')",
+    )
+    upgrade(directory=MIGRATIONS)
+
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql('SELECT emoji, count FROM announcement_reaction_counts').all()
+    assert [tuple(row) for row in rows] == [('👍', 2)]
+
+
+def test_payment_bulk_insert_after_upgrade(bare_app):
+    """Ekstre kaydının ON CONFLICT'i migration'la oluşturulan tekil index'e dayanır"""
+    from datetime import date
+    from app import db
+    from app.models.payment import Payment
+
+    upgrade(directory=MIGRATIONS)
+    _execute("INSERT INTO users (id, email, role) VALUES (1, 'admin@x.com', 'admin')")
+    row = {'transaction_date': date(2026, 1, 1), 'description': 'EFT', 'amount': 100, 'created_by': 1}
+    Payment.bulk_insert([row])
+    Payment.bulk_insert([row])
+    db.session.commit()
+    assert db.session.scalar(db.select(db.func.count(Payment.id))) == 1
+
+
+def test_phone_digits_backfilled_from_phone(bare_app):
+    from app import db
+
+    upgrade(directory=MIGRATIONS, revision='75a3b9f846d2')
+    _execute(
+        "INSERT INTO users (id, email, role) VALUES (1, 'a@x.com', 'student'), (2, 'b@x.com', 'student')",
+        "INSERT INTO student_profiles (user_id, first_name, last_name, phone) "
+        "VALUES (1, 'Ali', 'Yılmaz', '+90 (555) 123-45-67'), (2, 'Ayşe', 'Kaya', '123')",
+    )
+    upgrade(directory=MIGRATIONS)
+
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql('SELECT user_id, phone_digits FROM student_profiles ORDER BY user_id').all()
+    assert [tuple(row) for row in rows] == [(1, '5551234567'), (2, None)]
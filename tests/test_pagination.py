@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import pytest
+
+from app import db
+from app.models.user import User
+from app.pagination import encode_cursor, keyset_paginate, nullable
+
+
+@pytest.fixture
+def students(app):
+    # Eski kayıtlarda created_at boş olabilir
+    dates = [datetime(2026, 1, 3), None, datetime(2026, 1, 1), None, datetime(2026, 1, 2), datetime(2026, 1, 2)]
+    users = [User(email=f'ogrenci{i}@ornek.com', role='student', created_at=date) for i, date in enumerate(dates)]
+    db.session.add_all(users)
+    db.session.commit()
+    # created_at varsayılanı boş değerleri doldurmasın
+    db.session.execute(db.update(User).where(User.id.in_([users[1].id, users[3].id])).values(created_at=None))
+    db.session.commit()
+    return users
+
+
+def _walk(descending):
+    query = User.query.filter(User.role == 'student')
+    columns = [User.created_at, User.id]
+    key = lambda user: (user.created_at, user.id)
+    parse = lambda values: [nullable(datetime.fromisoformat)(values[0]), int(values[1])]
+
+    pages = [keyset_paginate(query, columns, key, per_page=2, descending=descending, parse=parse)]
+    while pages[-1].has_next:
+        pages.append(keyset_paginate(query, columns, key, per_page=2, cursor=pages[-1].next_cursor,
+                                     descending=descending, parse=parse))
+    forward = [user.id for page in pages for user in page.items]
+
+    # Son sayfadan önceki sayfalara geri dönülebilmeli
+    backward = [user.id for user in pages[-1].items]
+    page = pages[-1]
+    while page.has_prev:
+        page = keyset_paginate(query, columns, key, per_page=2, cursor=page.prev_cursor,
+                               descending=descending, parse=parse)
+        backward = [user.id for user in page.items] + backward
+    return forward, backward
+
+
+@pytest.mark.parametrize('descending', [True, False])
+def test_paging_continues_past_null_sort_keys(students, descending):
+    expected = [user.id for user in User.query.filter(User.role == 'student').order_by(
+        *((User.created_at.desc(), User.id.desc()) if descending else (User.created_at, User.id))
+    )]
+    forward, backward = _walk(descending)
+    assert forward == expected
+    assert backward == expected
+    assert len(forward) == 6
+
+
+def test_students_page_accepts_null_key_cursor(students, get):
+    cursor = encode_cursor('next', None, students[3].id)
+    assert get('admin', f'/admin/students?cursor={cursor}').status_code == 200
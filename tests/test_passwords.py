@@ -0,0 +1,45 @@
+import pytest
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash
+
+from app import db
+from app.models.user import User
+from app.passwords import normalize_method
+
+
+@pytest.fixture
+def student(app):
+    user = User(email='ogrenci@ornek.com', role='student')
+    # Yapılandırılandan farklı (eski) bir maliyetle üretilmiş hash
+    user.password_hash = generate_password_hash('ogrenci123', method='pbkdf2:sha256:2000')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _login(app, password):
+    return app.test_client().post('/auth/login', data={'email': 'ogrenci@ornek.com', 'password': password})
+
+
+def test_login_rehashes_with_configured_method(app, student):
+    assert student.password_needs_rehash()
+
+    response = _login(app, 'ogrenci123')
+    assert response.status_code == 302
+
+    db.session.expire_all()
+    assert student.password_hash.startswith(app.config['PASSWORD_HASH_METHOD'] + '$')
+    assert not student.password_needs_rehash()
+    assert student.check_password('ogrenci123')
+
+
+def test_failed_login_keeps_hash(app, student):
+    old_hash = student.password_hash
+    _login(app, 'yanlis-sifre')
+    db.session.expire_all()
+    assert student.password_hash == old_hash
+
+
+def test_normalize_method_fills_werkzeug_defaults():
+    assert normalize_method('scrypt') == 'scrypt:32768:8:1'
+    assert normalize_method('scrypt:16384') == 'scrypt:16384:8:1'
+    assert normalize_method('pbkdf2') == f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}'
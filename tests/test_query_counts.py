@@ -0,0 +1,99 @@
+from datetime import date, time
+
+from sqlalchemy import event
+
+from app import db
+from app.models.course import (
+    AnnouncementReaction, Course, CourseAnnouncement, CourseEnrollment, CoursePayment, CourseSchedule
+)
+from app.models.student_profile import StudentProfile
+from app.models.user import User
+
+
+def _admin_id():
+    return db.session.scalar(db.select(User.id).where(User.role == 'admin'))
+
+
+def _add_student(number):
+    user = User(email=f'ogrenci{number}@ornek.com', role='student')
+    user.set_password('ogrenci123')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(StudentProfile(user_id=user.id, first_name='Ali', last_name=f'Çelik {number}'))
+    return user
+
+
+def _add_course(number):
+    course = Course(name=f'Kurs {number}', instructor_name='Eğitmen', price=1000)
+    db.session.add(course)
+    db.session.flush()
+    db.session.add(CourseSchedule(course_id=course.id, day_of_week='monday', start_time=time(9), end_time=time(10)))
+    return course
+
+
+def _add_announcement(course, student):
+    announcement = CourseAnnouncement(course_id=course.id, title='Duyuru', content='İçerik', created_by=_admin_id())
+    db.session.add(announcement)
+    db.session.flush()
+    AnnouncementReaction.react(announcement.id, student.id, '👍')
+
+
+def _count_queries(get, role, url):
+    """Isınmadan sonraki isteğin çalıştırdığı SQL ifadesi sayısı"""
+    get(role, url)  # kullanıcı cache'i ve derlenmiş sorgular dolsun
+    # İstekler testle aynı oturumu kullanır; önceden yüklenmiş ilişkiler
+    # tembel yüklemeleri gizlemesin
+    db.session.expire_all()
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        response = get(role, url)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_student_courses_query_count_is_constant(app, get):
+    student = _add_student(0)
+    db.session.commit()
+
+    counts = []
+    courses = 0
+    for total in (2, 10):
+        while courses < total:
+            course = _add_course(courses)
+            db.session.add(CourseEnrollment(course_id=course.id, student_id=student.id, enrolled_by=_admin_id()))
+            _add_announcement(course, student)
+            _add_announcement(course, student)
+            courses += 1
+        db.session.commit()
+        counts.append(_count_queries(get, student.id, '/student/courses'))
+
+    assert counts[0] == counts[1]
+
+
+def test_manage_course_query_count_is_constant(app, get):
+    course = _add_course(0)
+    db.session.commit()
+
+    counts = []
+    students = 0
+    for total in (2, 10):
+        while students < total:
+            student = _add_student(students)
+            enrollment = CourseEnrollment(course_id=course.id, student_id=student.id, enrolled_by=_admin_id())
+            db.session.add(enrollment)
+            db.session.flush()
+            db.session.add(CoursePayment(enrollment_id=enrollment.id, amount=100, payment_date=date(2026, 1, 1),
+                                         created_by=_admin_id()))
+            _add_announcement(course, student)
+            students += 1
+        db.session.commit()
+        counts.append(_count_queries(get, 'admin', f'/admin/courses/{course.id}/manage'))
+
+    assert counts[0] == counts[1]
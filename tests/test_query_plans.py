@@ -0,0 +1,14 @@
+from app.query_plans import capture_queries, find_full_scans, hot_requests
+
+
+def test_hot_routes_use_indexes(app, seed):
+    seed()
+    # Yeni bir process gibi: arama yöntemi ilk istekte belirlenir
+    app.extensions.pop('student_search', None)
+    requests = hot_requests()
+    captured = capture_queries(requests)
+
+    # Her sayfa (arama sayfaları dahil) en az bir sorgu çalıştırmış olmalı
+    assert {url for _, url in requests} == {url for url, _, _ in captured}
+    problems = find_full_scans(captured)
+    assert [(url, scans) for url, _, scans, _ in problems] == []
@@ -0,0 +1,89 @@
+from app import db
+from app.models.course import Course
+from app.models.user import User
+
+
+def _students(count):
+    return db.session.scalars(
+        db.select(User.id).where(User.role == 'student', User.is_active == True).order_by(User.id).limit(count)
+    ).all()
+
+
+def test_user_quota(app, seed, get):
+    seed(students=2, courses=1, payments=0)
+    app.config.update(STUDENT_RATE_LIMIT=2, IP_RATE_LIMIT=100)
+    app.extensions['rate_limiter'].enabled = True
+    student = _students(1)[0]
+
+    statuses = [get(student, '/student/dashboard').status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+
+def test_ip_quota_applies_across_accounts(app, seed, get):
+    seed(students=10, courses=1, payments=0)
+    app.config.update(STUDENT_RATE_LIMIT=100, IP_RATE_LIMIT=3)
+    app.extensions['rate_limiter'].enabled = True
+
+    # Her hesap kendi kotasının çok altında; aynı IP'den toplam 3 istek geçer
+    statuses = [get(student, '/student/dashboard').status_code for student in _students(4)]
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_admin_typeahead_has_its_own_quota(app, seed, get):
+    seed(students=5, courses=1, payments=0)
+    app.config.update(ADMIN_RATE_LIMIT=2, ADMIN_SEARCH_RATE_LIMIT=5, IP_RATE_LIMIT=100)
+    app.extensions['rate_limiter'].enabled = True
+    course_id = db.session.scalar(db.select(Course.id))
+
+    # Arama kutusu kendi kotasını kullanır; admin sayfalarının kotası dolmaz
+    searches = [get('admin', '/admin/students/search?q=ali').status_code for _ in range(4)]
+    searches += [get('admin', f'/admin/courses/{course_id}/enrollable-students?q=ali').status_code for _ in range(2)]
+    assert searches == [200, 200, 200, 200, 200, 429]
+
+    pages = [get('admin', '/admin/students').status_code for _ in range(3)]
+    assert pages == [200, 200, 429]
+
+
+def test_ip_quota_can_be_disabled_for_signed_in_users(app, seed, get):
+    seed(students=5, courses=1, payments=0)
+    app.config.update(STUDENT_RATE_LIMIT=100, IP_RATE_LIMIT=0)
+    app.extensions['rate_limiter'].enabled = True
+
+    statuses = [get(student, '/student/dashboard').status_code for student in _students(4)]
+    assert statuses == [200, 200, 200, 200]
+
+
+def _failed_logins(client, attempts):
+    return [
+        client.post('/auth/login', data={'email': email, 'password': 'yanlis'},
+                    headers={'X-Forwarded-For': ip}).status_code
+        for ip, email in attempts
+    ]
+
+
+def test_forwarded_ip_ignored_without_proxy_fix(app):
+    app.config.update(LOGIN_FAILURE_LIMIT=2)
+    app.extensions['rate_limiter'].enabled = True
+
+    # Başlık istemcinin elinde; güvenilen vekil yokken IP kotasını değiştirmez
+    statuses = _failed_logins(app.test_client(), [
+        ('10.0.0.1', 'a@ornek.com'), ('10.0.0.2', 'b@ornek.com'), ('10.0.0.3', 'c@ornek.com'),
+    ])
+    assert statuses == [200, 200, 429]
+
+
+def test_proxy_fix_uses_forwarded_ip(app, monkeypatch):
+    from app import create_app, limiter
+    from config import TestingConfig
+
+    monkeypatch.setattr(TestingConfig, 'PROXY_FIX_X_FOR', 1)
+    proxied = create_app('testing')
+    proxied.config.update(LOGIN_FAILURE_LIMIT=2)
+    limiter.enabled = True
+
+    # Vekilin arkasındaki her istemci kendi IP kotasını kullanır
+    statuses = _failed_logins(proxied.test_client(), [
+        ('10.0.0.1', 'a@ornek.com'), ('10.0.0.1', 'b@ornek.com'),
+        ('10.0.0.1', 'c@ornek.com'), ('10.0.0.2', 'd@ornek.com'),
+    ])
+    assert statuses == [200, 200, 429, 200]
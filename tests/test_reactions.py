@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models.course import AnnouncementReaction, Course, CourseAnnouncement
+from app.models.user import User
+
+
+@pytest.fixture
+def announcement(app):
+    admin_id = db.session.scalar(db.select(User.id).where(User.role == 'admin'))
+    course = Course(name='Piyano', instructor_name='Eğitmen', price=1000)
+    db.session.add(course)
+    db.session.flush()
+    announcement = CourseAnnouncement(course_id=course.id, title='Duyuru', content='İçerik', created_by=admin_id)
+    student = User(email='ogrenci@ornek.com', role='student')
+    student.set_password('ogrenci123')
+    db.session.add_all([announcement, student])
+    db.session.commit()
+    return announcement.id, student.id
+
+
+def _counts(announcement_id):
+    db.session.expire_all()
+    return dict(CourseAnnouncement.reaction_counts([announcement_id])[announcement_id])
+
+
+def test_same_reaction_twice_counts_once(announcement):
+    announcement_id, student_id = announcement
+    for _ in range(2):
+        AnnouncementReaction.react(announcement_id, student_id, '👍')
+        db.session.commit()
+    assert _counts(announcement_id) == {'👍': 1}
+
+
+def test_changing_reaction_moves_the_count(announcement):
+    announcement_id, student_id = announcement
+    for emoji in ('👍', '❤️'):
+        AnnouncementReaction.react(announcement_id, student_id, emoji)
+        db.session.commit()
+    assert _counts(announcement_id) == {'❤️': 1}
+
+
+def test_concurrent_same_reaction_counts_once(app, announcement):
+    """Aynı öğrencinin eşzamanlı iki tıklaması sayacı bir kez artırır"""
+    announcement_id, student_id = announcement
+    first_read = threading.Event()
+    errors = []
+
+    def pause_after_read(conn, cursor, statement, parameters, context, executemany):
+        # İlk istek önceki tepkiyi okuduktan sonra bekler; ikinci istek bu
+        # arada aynı tepkiyi yazmaya çalışır
+        if threading.current_thread().name == 'first' and 'FROM announcement_reactions' in statement:
+            first_read.set()
+            time.sleep(0.3)
+
+    def react():
+        try:
+            with app.app_context():
+                AnnouncementReaction.react(announcement_id, student_id, '👍')
+                db.session.commit()
+                db.session.remove()
+        except Exception as e:
+            errors.append(e)
+
+    event.listen(db.engine, 'after_cursor_execute', pause_after_read)
+    try:
+        first = threading.Thread(target=react, name='first')
+        first.start()
+        assert first_read.wait(5)
+        second = threading.Thread(target=react, name='second')
+        second.start()
+        first.join()
+        second.join()
+    finally:
+        event.remove(db.engine, 'after_cursor_execute', pause_after_read)
+
+    assert errors == []
+    assert _counts(announcement_id) == {'👍': 1}
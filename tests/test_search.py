@@ -0,0 +1,105 @@
+import pytest
+
+from app import db
+from app.models.student_profile import StudentProfile
+from app.models.user import User
+from app.search import match_subquery, search_tokens
+
+
+@pytest.fixture
+def student(app):
+    user = User(email='ali.celik@ornek.com', role='student')
+    user.set_password('ogrenci123')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add(StudentProfile(user_id=user.id, first_name='Ali', last_name='Çelik', phone='0555 123 45 67'))
+    db.session.commit()
+    return user
+
+
+def _search(term):
+    matches = match_subquery(term)
+    if matches is None:
+        return []
+    return db.session.scalars(db.select(matches.c.user_id)).all()
+
+
+def test_digit_groups_are_joined():
+    assert search_tokens('0555 123') == ['0555123']
+    assert search_tokens('Ali 0555 123') == ['ali', '0555123']
+
+
+@pytest.mark.parametrize('term', ['0555 123', '0555 123 45 67', '05551234567', '123 45', '4567', '555-123'])
+def test_partial_and_spaced_phone_search(student, term):
+    assert _search(term) == [student.id]
+
+
+@pytest.mark.parametrize('term', ['ÇELİK', 'celik', 'Ali Çel', 'ali.celik@'])
+def test_name_and_email_search(student, term):
+    assert _search(term) == [student.id]
+
+
+def test_non_matching_search(student):
+    assert _search('0555 999') == []
+    assert _search('Veli') == []
+
+
+def test_backend_read_from_shared_cache(app, student):
+    from sqlalchemy import event
+    from app.search import search_backend
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    # Yeni bir worker gibi: yöntem init-db'nin kaydettiği cache'ten okunur
+    app.extensions.pop('student_search')
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        assert search_backend() == 'fts5'
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    assert statements == []
+
+
+@pytest.fixture
+def unindexed(bare_app):
+    """``flask init-db`` çalıştırılmamış (arama indeksi olmayan) veritabanı"""
+    from app import create_default_admin
+    from app.models.course import Course
+
+    db.create_all()
+    create_default_admin()
+    user = User(email='ali.celik@ornek.com', role='student')
+    user.set_password('ogrenci123')
+    course = Course(name='Piyano', instructor_name='Eğitmen', price=1000)
+    db.session.add_all([user, course])
+    db.session.flush()
+    db.session.add(StudentProfile(user_id=user.id, first_name='Ali', last_name='Çelik', phone='0555 123 45 67'))
+    db.session.commit()
+    return user.id, course.id
+
+
+def test_search_without_index_uses_plain_filter(unindexed):
+    from app.query_plans import logged_in_requests
+    from app.search import search_backend
+
+    student_id, course_id = unindexed
+    assert search_backend() is None
+    assert match_subquery('ali') is None
+
+    with logged_in_requests() as get:
+        response = get('admin', '/admin/students?search=Ali')
+        assert response.status_code == 200
+        assert b'ali.celik@ornek.com' in response.data
+
+        response = get('admin', '/admin/students?search=Veli')
+        assert response.status_code == 200
+        assert b'ali.celik@ornek.com' not in response.data
+
+        response = get('admin', '/admin/students/search?q=555%20123')
+        assert [student['id'] for student in response.get_json()['students']] == [student_id]
+
+        response = get('admin', f'/admin/courses/{course_id}/enrollable-students?q=ali.celik')
+        assert [student['id'] for student in response.get_json()['students']] == [student_id]